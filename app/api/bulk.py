@@ -0,0 +1,43 @@
+"""
+Общие помощники для эндпоинтов массовой загрузки
+"""
+
+from typing import Optional, Dict, Any, List
+from flask import jsonify
+
+from ..config import config
+
+def parse_bulk_payload(data: Any, key: str) -> Optional[List[Any]]:
+    """Достать список строк из тела запроса: массив или объект вида {key: [...]}"""
+    if isinstance(data, dict):
+        data = data.get(key)
+    return data if isinstance(data, list) else None
+
+def bulk_error(message: str):
+    """Ответ 400 для некорректного тела массовой загрузки"""
+    return jsonify({
+        'success': False,
+        'message': message
+    }), 400
+
+def check_bulk_rows(rows: Optional[List[Any]], key: str):
+    """Проверить тело запроса; вернуть готовый ответ с ошибкой или None"""
+    if rows is None:
+        return bulk_error(f'Передайте массив строк или объект с полем "{key}"')
+    if not rows:
+        return bulk_error('Список строк пуст')
+    if len(rows) > config.BULK_MAX_ROWS:
+        return bulk_error(f'Слишком много строк в одном запросе (максимум {config.BULK_MAX_ROWS})')
+    return None
+
+def bulk_response(results: List[Dict[str, Any]]):
+    """Сводный ответ массовой загрузки с результатом по каждой строке"""
+    created = sum(1 for result in results if result['success'])
+    failed = len(results) - created
+
+    return jsonify({
+        'success': failed == 0,
+        'created': created,
+        'failed': failed,
+        'results': results
+    }), 201 if created and not failed else (207 if created else 400)
@@ -2,14 +2,47 @@
 API роуты для кандидатов
 """
 
+import io
 import logging
-from flask import Blueprint, request, jsonify
+from typing import Any
+from flask import Blueprint, request, jsonify, current_app
 
 from ..models.candidate import Candidate
+from ..models.base import ConflictError
+from .transaction import transactional
+from ..pagination import parse_limit, parse_offset, decode_cursor, split_page, rendered_page_cursor, \
+    InvalidCursor, InvalidPageSize
+from .bulk import parse_bulk_payload, check_bulk_rows, bulk_response
+from ..candidate_import import import_candidates, iter_records, detect_format
+from ..models.job import Job
+from ..config import config
+from ..conditional import make_etag, page_etag, page_last_modified, conditional_response, \
+    conditional_body_response, set_validators
+from ..json_provider import raw_json_response
 
 logger = logging.getLogger(__name__)
 candidates_bp = Blueprint('candidates', __name__)
 
+class InvalidSearchParams(ValueError):
+    """Параметр поиска кандидатов неверного типа"""
+
+def _check_search_params(data: Any):
+    """Проверить типы параметров POST /search; InvalidSearchParams, если тип неверный"""
+    if not isinstance(data, dict):
+        raise InvalidSearchParams("Тело запроса должно быть JSON-объектом")
+    for field in ('skills', 'skills_all', 'skills_not'):
+        value = data.get(field)
+        if value is not None and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+            raise InvalidSearchParams(f"Параметр {field} должен быть списком строк")
+    for field in ('location', 'desired_position'):
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            raise InvalidSearchParams(f"Параметр {field} должен быть строкой")
+    for field in ('experience_min', 'salary_max'):
+        value = data.get(field)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+            raise InvalidSearchParams(f"Параметр {field} должен быть неотрицательным целым числом")
+
 @candidates_bp.route('', methods=['GET'])
 def get_candidates():
     """Получение списка кандидатов"""
@@ -17,28 +50,56 @@ def get_candidates():
         # Параметры фильтрации
         available_only = request.args.get('available_only', 'true').lower() == 'true'
         skills = request.args.getlist('skills')
+        skills_all = request.args.getlist('skills_all')
+        skills_not = request.args.getlist('skills_not')
         experience_min = request.args.get('experience_min')
-        limit = int(request.args.get('limit', 50))
-        offset = int(request.args.get('offset', 0))
+        limit = parse_limit(request.args.get('limit'))
+        offset = parse_offset(request.args.get('offset'))
+        cursor = decode_cursor('candidates', request.args.get('cursor'))
         
         # Преобразование параметров
         experience_min = int(experience_min) if experience_min and experience_min.isdigit() else None
         
-        # Получение кандидатов
-        candidates = Candidate.get_all(
+        filters = dict(
             available_only=available_only,
             skills=skills if skills else None,
+            skills_all=skills_all if skills_all else None,
+            skills_not=skills_not if skills_not else None,
             experience_min=experience_min,
-            limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
         
-        return jsonify({
-            'success': True,
-            'candidates': [candidate.to_dict() for candidate in candidates],
-            'count': len(candidates)
-        })
+        if 'candidates' in config.SQL_JSON_ENDPOINTS:
+            # JSON страницы собирает Postgres, объекты строк не создаются
+            page = Candidate.render_page(limit=limit, sort_keys=current_app.json.sort_keys, **filters)
+            response = raw_json_response(
+                {'success': True, 'count': page.count, 'next_cursor': rendered_page_cursor('candidates', page)},
+                {'candidates': page.items}
+            )
+            set_validators(response, None, page.last_modified)
+            return conditional_body_response(response)
+        
+        # Получение кандидатов
+        candidates = Candidate.get_all(limit=limit + 1, **filters)
+        candidates, next_cursor = split_page('candidates', candidates, limit, Candidate.cursor_key)
         
+        return conditional_response(
+            page_etag('candidates', candidates, next_cursor),
+            page_last_modified(candidates),
+            lambda: jsonify({
+                'success': True,
+                'candidates': [candidate.to_dict() for candidate in candidates],
+                'count': len(candidates),
+                'next_cursor': next_cursor
+            })
+        )
+        
+    except (InvalidCursor, InvalidPageSize) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Ошибка получения кандидатов: {e}")
         return jsonify({
@@ -58,19 +119,65 @@ def get_candidate(candidate_id):
                 'message': 'Кандидат не найден'
             }), 404
         
+        return conditional_response(
+            make_etag('candidate', candidate.id, candidate.updated_at),
+            candidate.updated_at,
+            lambda: jsonify({
+                'success': True,
+                'candidate': candidate.to_dict()
+            })
+        )
+        
+    except Exception as e:
+        logger.error(f"Ошибка получения кандидата {candidate_id}: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Ошибка получения кандидата'
+        }), 500
+
+@candidates_bp.route('/<int:candidate_id>/recommended-jobs', methods=['GET'])
+def get_recommended_jobs(candidate_id):
+    """Лучшие вакансии для кандидата"""
+    try:
+        limit = parse_limit(request.args.get('limit'), default=config.MATCHING_TOP_K)
+        
+        candidate = Candidate.get_by_id(candidate_id)
+        if not candidate:
+            return jsonify({
+                'success': False,
+                'message': 'Кандидат не найден'
+            }), 404
+        
+        # Подбор (и numpy) загружается при первом запросе подбора, а не при старте
+        from ..matching import matching_service
+        matches = matching_service.recommend_jobs(candidate, limit)
+        jobs = {job.id: job for job in Job.get_by_ids([match['id'] for match in matches])}
+        results = [
+            {'job': jobs[match['id']].to_dict(), 'score': match['score'], 'breakdown': match['breakdown']}
+            for match in matches if match['id'] in jobs
+        ]
+        
         return jsonify({
             'success': True,
-            'candidate': candidate.to_dict()
+            'candidate_id': candidate_id,
+            'jobs': results,
+            'count': len(results)
         })
         
+    except InvalidPageSize as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
-        logger.error(f"Ошибка получения кандидата {candidate_id}: {e}")
+        logger.error(f"Ошибка подбора вакансий для кандидата {candidate_id}: {e}")
         return jsonify({
             'success': False,
-            'message': 'Ошибка получения кандидата'
+            'message': 'Ошибка подбора вакансий'
         }), 500
 
 @candidates_bp.route('', methods=['POST'])
+@transactional
 def create_candidate():
     """Создание нового кандидата"""
     try:
@@ -84,15 +191,7 @@ def create_candidate():
                 'message': 'Заполните все обязательные поля: имя и email'
             }), 400
         
-        # Проверка уникальности email
-        existing_candidate = Candidate.get_by_email(data['email'])
-        if existing_candidate:
-            return jsonify({
-                'success': False,
-                'message': 'Кандидат с таким email уже существует'
-            }), 400
-        
-        # Создание кандидата
+        # Создание кандидата; занятый email проверяется тем же запросом
         candidate = Candidate.create(data)
         
         logger.info(f"Создан новый кандидат: {candidate.full_name}")
@@ -103,6 +202,11 @@ def create_candidate():
             'candidate': candidate.to_dict()
         }), 201
         
+    except ConflictError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Ошибка создания кандидата: {e}")
         return jsonify({
@@ -110,52 +214,114 @@ def create_candidate():
             'message': 'Ошибка создания профиля кандидата'
         }), 500
 
+@candidates_bp.route('/bulk', methods=['POST'])
+def bulk_create_candidates():
+    """Массовое создание кандидатов"""
+    try:
+        rows = parse_bulk_payload(request.get_json(silent=True), 'candidates')
+        error_response = check_bulk_rows(rows, 'candidates')
+        if error_response:
+            return error_response
+        
+        results = Candidate.bulk_create(rows)
+        
+        return bulk_response(results)
+        
+    except Exception as e:
+        logger.error(f"Ошибка массового создания кандидатов: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Ошибка массового создания кандидатов'
+        }), 500
+
+@candidates_bp.route('/import', methods=['POST'])
+def import_candidates_file():
+    """Потоковый импорт кандидатов из CSV/NDJSON (multipart-поле file или тело запроса)"""
+    try:
+        upload = request.files.get('file')
+        if upload:
+            binary = upload.stream
+            file_format = request.args.get('format') or detect_format(upload.filename, upload.mimetype)
+        else:
+            binary = request.stream
+            file_format = request.args.get('format') or detect_format(None, request.content_type)
+        
+        if file_format not in ('csv', 'ndjson'):
+            return jsonify({
+                'success': False,
+                'message': 'Поддерживаются форматы csv и ndjson'
+            }), 400
+        
+        stream = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+        report = import_candidates(iter_records(stream, file_format))
+        
+        return jsonify({
+            'success': True,
+            'message': f'Импортировано кандидатов: {report.inserted}',
+            'report': report.to_dict()
+        })
+        
+    except UnicodeDecodeError:
+        return jsonify({
+            'success': False,
+            'message': 'Файл должен быть в кодировке UTF-8'
+        }), 400
+    except Exception as e:
+        logger.error(f"Ошибка импорта кандидатов: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Ошибка импорта кандидатов'
+        }), 500
+
 @candidates_bp.route('/search', methods=['POST'])
 def search_candidates():
     """Поиск кандидатов по критериям"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        _check_search_params(data)
         
         # Параметры поиска
         skills = data.get('skills', [])
+        skills_all = data.get('skills_all', [])
+        skills_not = data.get('skills_not', [])
         experience_min = data.get('experience_min')
         location = data.get('location')
         desired_position = data.get('desired_position')
         salary_max = data.get('salary_max')
         
-        # Получение кандидатов с фильтрами
+        limit = parse_limit(data.get('limit'))
+        offset = parse_offset(data.get('offset'))
+        cursor = decode_cursor('candidates', data.get('cursor'))
+        
+        # Получение кандидатов: все фильтры применяются в SQL, страница точная
         candidates = Candidate.get_all(
             available_only=True,
             skills=skills if skills else None,
+            skills_all=skills_all if skills_all else None,
+            skills_not=skills_not if skills_not else None,
             experience_min=experience_min,
-            limit=data.get('limit', 50),
-            offset=data.get('offset', 0)
+            location=location,
+            desired_position=desired_position,
+            salary_max=salary_max,
+            limit=limit + 1,
+            offset=offset,
+            cursor=cursor
         )
-        
-        # Дополнительная фильтрация (можно перенести в базовый метод)
-        filtered_candidates = []
-        for candidate in candidates:
-            match = True
-            
-            if location and candidate.location and location.lower() not in candidate.location.lower():
-                match = False
-            
-            if desired_position and candidate.desired_position and desired_position.lower() not in candidate.desired_position.lower():
-                match = False
-            
-            if salary_max and candidate.desired_salary and candidate.desired_salary > salary_max:
-                match = False
-            
-            if match:
-                filtered_candidates.append(candidate)
+        candidates, next_cursor = split_page('candidates', candidates, limit, Candidate.cursor_key)
         
         return jsonify({
             'success': True,
-            'candidates': [candidate.to_dict() for candidate in filtered_candidates],
-            'count': len(filtered_candidates),
+            'candidates': [candidate.to_dict() for candidate in candidates],
+            'count': len(candidates),
+            'next_cursor': next_cursor,
             'search_params': data
         })
         
+    except (InvalidSearchParams, InvalidCursor, InvalidPageSize) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Ошибка поиска кандидатов: {e}")
         return jsonify({
@@ -3,9 +3,16 @@ API роуты для контактных сообщений
 """
 
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 
 from ..models.contact import ContactMessage
+from ..contact_queue import contact_queue, check_message, InvalidContactMessage
+from ..config import config
+from ..pagination import parse_limit, parse_offset, decode_cursor, split_page, rendered_page_cursor, \
+    InvalidCursor, InvalidPageSize
+from ..conditional import make_etag, page_etag, page_last_modified, conditional_response, \
+    conditional_body_response, set_validators
+from ..json_provider import raw_json_response
 
 logger = logging.getLogger(__name__)
 contact_bp = Blueprint('contact', __name__)
@@ -18,23 +25,32 @@ def submit_contact():
         
         # Валидация обязательных полей
         required_fields = ['name', 'email', 'message']
-        if not data or not all(field in data and data[field] for field in required_fields):
+        if not isinstance(data, dict) or not all(field in data and data[field] for field in required_fields):
             return jsonify({
                 'success': False,
                 'message': 'Заполните все обязательные поля: имя, email, сообщение'
             }), 400
         
-        # Создание сообщения
-        message = ContactMessage.create(data)
+        # Создание сообщения: сразу в базу или через очередь с фоновой записью
+        check_message(data)
+        if config.CONTACT_WRITE_BEHIND:
+            message_id = contact_queue.submit(data)
+        else:
+            message_id = ContactMessage.create(data).id
         
         logger.info(f"Новое контактное сообщение от {data['name']} ({data['email']})")
         
         return jsonify({
             'success': True,
             'message': 'Сообщение успешно отправлено! Мы свяжемся с вами в ближайшее время.',
-            'id': message.id
+            'id': message_id
         })
         
+    except InvalidContactMessage as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Ошибка отправки сообщения: {e}")
         return jsonify({
@@ -47,18 +63,41 @@ def get_contact_messages():
     """Получение всех контактных сообщений"""
     try:
         # Параметры пагинации
-        limit = int(request.args.get('limit', 50))
-        offset = int(request.args.get('offset', 0))
+        limit = parse_limit(request.args.get('limit'))
+        offset = parse_offset(request.args.get('offset'))
+        cursor = decode_cursor('contact_messages', request.args.get('cursor'))
+        
+        if 'contact_messages' in config.SQL_JSON_ENDPOINTS:
+            # JSON страницы собирает Postgres, объекты строк не создаются
+            page = ContactMessage.render_page(limit=limit, offset=offset, cursor=cursor,
+                                              sort_keys=current_app.json.sort_keys)
+            response = raw_json_response(
+                {'success': True, 'count': page.count, 'next_cursor': rendered_page_cursor('contact_messages', page)},
+                {'messages': page.items}
+            )
+            set_validators(response, None, page.last_modified)
+            return conditional_body_response(response)
         
         # Получение сообщений
-        messages = ContactMessage.get_all(limit=limit, offset=offset)
+        messages = ContactMessage.get_all(limit=limit + 1, offset=offset, cursor=cursor)
+        messages, next_cursor = split_page('contact_messages', messages, limit, ContactMessage.cursor_key)
         
-        return jsonify({
-            'success': True,
-            'messages': [msg.to_dict() for msg in messages],
-            'count': len(messages)
-        })
+        return conditional_response(
+            page_etag('contact_messages', messages, next_cursor),
+            page_last_modified(messages),
+            lambda: jsonify({
+                'success': True,
+                'messages': [msg.to_dict() for msg in messages],
+                'count': len(messages),
+                'next_cursor': next_cursor
+            })
+        )
         
+    except (InvalidCursor, InvalidPageSize) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Ошибка получения сообщений: {e}")
         return jsonify({
@@ -78,10 +117,14 @@ def get_contact_message(message_id):
                 'message': 'Сообщение не найдено'
             }), 404
         
-        return jsonify({
-            'success': True,
-            'message': message.to_dict()
-        })
+        return conditional_response(
+            make_etag('contact_message', message.id, message.updated_at),
+            message.updated_at,
+            lambda: jsonify({
+                'success': True,
+                'message': message.to_dict()
+            })
+        )
         
     except Exception as e:
         logger.error(f"Ошибка получения сообщения {message_id}: {e}")
@@ -3,13 +3,45 @@ API роуты для вакансий
 """
 
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 
 from ..models.job import Job, JobApplication
+from ..models.base import ConflictError
+from .transaction import transactional
+from ..pagination import parse_limit, parse_offset, decode_cursor, split_page, rendered_page_cursor, \
+    InvalidCursor, InvalidPageSize
+from .bulk import parse_bulk_payload, check_bulk_rows, bulk_response
+from ..models.candidate import Candidate
+from ..config import config
+from ..cache import job_listing_cache, cached_response
+from ..conditional import make_etag, page_last_modified, conditional_response, set_validators
+from ..json_provider import raw_json_response
 
 logger = logging.getLogger(__name__)
 jobs_bp = Blueprint('jobs', __name__)
 
+def _listing_response(jobs, next_cursor):
+    """Ответ со страницей вакансий и признак, можно ли его кэшировать"""
+    response = jsonify({
+        'success': True,
+        'jobs': [job.to_dict() for job in jobs],
+        'count': len(jobs),
+        'next_cursor': next_cursor
+    })
+    set_validators(response, None, page_last_modified(jobs))
+    # Job.get_all возвращает пустой список и при ошибке базы — такие ответы не кэшируем
+    return response, bool(jobs)
+
+def _rendered_listing_response(**filters):
+    """Ответ со страницей вакансий, JSON которой собрал Postgres (SQL_JSON_ENDPOINTS)"""
+    page = Job.render_page(sort_keys=current_app.json.sort_keys, **filters)
+    response = raw_json_response(
+        {'success': True, 'count': page.count, 'next_cursor': rendered_page_cursor('jobs', page)},
+        {'jobs': page.items}
+    )
+    set_validators(response, None, page.last_modified)
+    return response, True
+
 @jobs_bp.route('', methods=['GET'])
 def get_jobs():
     """Получение списка вакансий"""
@@ -18,24 +50,37 @@ def get_jobs():
         active_only = request.args.get('active_only', 'true').lower() == 'true'
         featured_only = request.args.get('featured_only', 'false').lower() == 'true'
         industry = request.args.get('industry')
-        limit = int(request.args.get('limit', 50))
-        offset = int(request.args.get('offset', 0))
-        
-        # Получение вакансий
-        jobs = Job.get_all(
-            active_only=active_only,
-            featured_only=featured_only,
-            industry=industry,
-            limit=limit,
-            offset=offset
-        )
+        limit = parse_limit(request.args.get('limit'))
+        offset = parse_offset(request.args.get('offset'))
+        cursor = decode_cursor('jobs', request.args.get('cursor'))
         
-        return jsonify({
-            'success': True,
-            'jobs': [job.to_dict() for job in jobs],
-            'count': len(jobs)
-        })
+        def build():
+            if 'jobs' in config.SQL_JSON_ENDPOINTS:
+                return _rendered_listing_response(
+                    active_only=active_only, featured_only=featured_only, industry=industry,
+                    limit=limit, offset=offset, cursor=cursor
+                )
+            
+            # Получение вакансий (на одну больше, чтобы узнать, есть ли следующая страница)
+            jobs = Job.get_all(
+                active_only=active_only,
+                featured_only=featured_only,
+                industry=industry,
+                limit=limit + 1,
+                offset=offset,
+                cursor=cursor
+            )
+            jobs, next_cursor = split_page('jobs', jobs, limit, Job.cursor_key)
+            return _listing_response(jobs, next_cursor)
         
+        key = ('jobs', active_only, featured_only, industry or None, limit, offset, cursor)
+        return cached_response(job_listing_cache, key, build)
+        
+    except (InvalidCursor, InvalidPageSize) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Ошибка получения вакансий: {e}")
         return jsonify({
@@ -55,16 +100,61 @@ def get_job(job_id):
                 'message': 'Вакансия не найдена'
             }), 404
         
+        return conditional_response(
+            make_etag('job', job.id, job.updated_at),
+            job.updated_at,
+            lambda: jsonify({
+                'success': True,
+                'job': job.to_dict()
+            })
+        )
+        
+    except Exception as e:
+        logger.error(f"Ошибка получения вакансии {job_id}: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Ошибка получения вакансии'
+        }), 500
+
+@jobs_bp.route('/<int:job_id>/matches', methods=['GET'])
+def get_job_matches(job_id):
+    """Лучшие кандидаты для вакансии"""
+    try:
+        limit = parse_limit(request.args.get('limit'), default=config.MATCHING_TOP_K)
+        
+        job = Job.get_by_id(job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'message': 'Вакансия не найдена'
+            }), 404
+        
+        # Подбор (и numpy) загружается при первом запросе подбора, а не при старте
+        from ..matching import matching_service
+        matches = matching_service.match_candidates(job, limit)
+        candidates = {candidate.id: candidate for candidate in Candidate.get_by_ids([match['id'] for match in matches])}
+        results = [
+            {'candidate': candidates[match['id']].to_dict(), 'score': match['score'], 'breakdown': match['breakdown']}
+            for match in matches if match['id'] in candidates
+        ]
+        
         return jsonify({
             'success': True,
-            'job': job.to_dict()
+            'job_id': job_id,
+            'matches': results,
+            'count': len(results)
         })
         
+    except InvalidPageSize as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
-        logger.error(f"Ошибка получения вакансии {job_id}: {e}")
+        logger.error(f"Ошибка подбора кандидатов для вакансии {job_id}: {e}")
         return jsonify({
             'success': False,
-            'message': 'Ошибка получения вакансии'
+            'message': 'Ошибка подбора кандидатов'
         }), 500
 
 @jobs_bp.route('', methods=['POST'])
@@ -99,26 +189,33 @@ def create_job():
             'message': 'Ошибка создания вакансии'
         }), 500
 
+@jobs_bp.route('/bulk', methods=['POST'])
+def bulk_create_jobs():
+    """Массовое создание вакансий"""
+    try:
+        rows = parse_bulk_payload(request.get_json(silent=True), 'jobs')
+        error_response = check_bulk_rows(rows, 'jobs')
+        if error_response:
+            return error_response
+        
+        results = Job.bulk_create(rows)
+        
+        return bulk_response(results)
+        
+    except Exception as e:
+        logger.error(f"Ошибка массового создания вакансий: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Ошибка массового создания вакансий'
+        }), 500
+
 @jobs_bp.route('/<int:job_id>/apply', methods=['POST'])
+@transactional
 def apply_to_job(job_id):
     """Подача заявки на вакансию"""
     try:
         data = request.get_json()
         
-        # Проверка существования вакансии
-        job = Job.get_by_id(job_id)
-        if not job:
-            return jsonify({
-                'success': False,
-                'message': 'Вакансия не найдена'
-            }), 404
-        
-        if not job.is_active:
-            return jsonify({
-                'success': False,
-                'message': 'Вакансия неактивна'
-            }), 400
-        
         # Валидация данных заявки
         if not data or not data.get('candidate_id'):
             return jsonify({
@@ -126,7 +223,7 @@ def apply_to_job(job_id):
                 'message': 'Укажите ID кандидата'
             }), 400
         
-        # Создание заявки
+        # Создание заявки; вакансия, кандидат и повтор проверяются тем же запросом
         application_data = {
             'job_id': job_id,
             'candidate_id': data['candidate_id'],
@@ -144,6 +241,11 @@ def apply_to_job(job_id):
             'application': application.to_dict()
         }), 201
         
+    except ConflictError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 404 if e.reason in ('job_not_found', 'candidate_not_found') else 400
     except Exception as e:
         logger.error(f"Ошибка подачи заявки на вакансию {job_id}: {e}")
         return jsonify({
@@ -155,21 +257,31 @@ def apply_to_job(job_id):
 def get_featured_jobs():
     """Получение рекомендуемых вакансий"""
     try:
-        limit = int(request.args.get('limit', 10))
+        limit = parse_limit(request.args.get('limit'), default=10)
+        cursor = decode_cursor('jobs', request.args.get('cursor'))
         
-        jobs = Job.get_all(
-            active_only=True,
-            featured_only=True,
-            limit=limit,
-            offset=0
-        )
+        def build():
+            if 'jobs' in config.SQL_JSON_ENDPOINTS:
+                return _rendered_listing_response(active_only=True, featured_only=True, limit=limit, cursor=cursor)
+            
+            jobs = Job.get_all(
+                active_only=True,
+                featured_only=True,
+                limit=limit + 1,
+                offset=0,
+                cursor=cursor
+            )
+            jobs, next_cursor = split_page('jobs', jobs, limit, Job.cursor_key)
+            return _listing_response(jobs, next_cursor)
         
-        return jsonify({
-            'success': True,
-            'jobs': [job.to_dict() for job in jobs],
-            'count': len(jobs)
-        })
+        key = ('featured', limit, cursor)
+        return cached_response(job_listing_cache, key, build)
         
+    except (InvalidCursor, InvalidPageSize) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Ошибка получения рекомендуемых вакансий: {e}")
         return jsonify({
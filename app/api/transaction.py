@@ -0,0 +1,22 @@
+"""
+Транзакция на запрос для Flask-обработчиков
+"""
+
+from functools import wraps
+from flask import make_response
+
+from ..database import db_manager
+
+def transactional(view):
+    """
+    Декоратор Flask-обработчика: весь запрос выполняется в одной транзакции.
+    Ответ со статусом 5xx приводит к откату.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with db_manager.transaction():
+            response = make_response(view(*args, **kwargs))
+            if response.status_code >= 500:
+                db_manager.rollback_current()
+            return response
+    return wrapper
@@ -6,11 +6,49 @@ import logging
 from flask import Blueprint, request, jsonify, session
 
 from ..models.user import User
+from ..models.base import ConflictError
+from .transaction import transactional
+from ..throttling import throttled
+from ..user_cache import user_cache, make_snapshot, read_snapshot
+from ..password_hashing import PasswordHasherBusy, PasswordHasherUnavailable
 
 logger = logging.getLogger(__name__)
 users_bp = Blueprint('users', __name__)
 
+def _hasher_unavailable_response(e: PasswordHasherUnavailable):
+    """429 при заполненной очереди хеширования, 503 при таймауте или сбое пула"""
+    logger.warning(f"⚠️ Хеширование пароля недоступно: {e}")
+    if isinstance(e, PasswordHasherBusy):
+        response = jsonify({
+            'success': False,
+            'message': 'Слишком много запросов, повторите попытку позже'
+        })
+        response.status_code = 429
+        response.headers['Retry-After'] = '1'
+        return response
+    return jsonify({
+        'success': False,
+        'message': 'Сервис временно недоступен, повторите попытку позже'
+    }), 503
+
+def _session_profile():
+    """Профиль из снимка в сессии, если снимок действителен, иначе None"""
+    snapshot = read_snapshot(session.get('profile'))
+    if snapshot is None:
+        return None
+    issued_at, profile = snapshot
+    if profile['id'] != session.get('user_id') or not user_cache.snapshot_valid(profile['username'], issued_at):
+        return None
+    return profile
+
+def _remember_profile(user: User):
+    """Обновить снимок профиля в сессии"""
+    session['role'] = user.role
+    session['profile'] = make_snapshot(user.to_dict())
+
 @users_bp.route('/register', methods=['POST'])
+@throttled('register')
+@transactional
 def register():
     """Регистрация нового пользователя"""
     try:
@@ -31,22 +69,7 @@ def register():
                 'message': 'Пароль должен содержать минимум 6 символов'
             }), 400
         
-        # Проверка уникальности username и email
-        existing_user = User.get_by_username(data['username'])
-        if existing_user:
-            return jsonify({
-                'success': False,
-                'message': 'Пользователь с таким username уже существует'
-            }), 400
-        
-        existing_user = User.get_by_email(data['email'])
-        if existing_user:
-            return jsonify({
-                'success': False,
-                'message': 'Пользователь с таким email уже существует'
-            }), 400
-        
-        # Создание пользователя
+        # Создание пользователя; занятые username/email проверяются тем же запросом
         user = User.create(data)
         
         logger.info(f"Зарегистрирован новый пользователь: {user.username}")
@@ -57,6 +80,13 @@ def register():
             'user': user.to_dict()
         }), 201
         
+    except ConflictError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except PasswordHasherUnavailable as e:
+        return _hasher_unavailable_response(e)
     except Exception as e:
         logger.error(f"Ошибка регистрации пользователя: {e}")
         return jsonify({
@@ -65,6 +95,7 @@ def register():
         }), 500
 
 @users_bp.route('/login', methods=['POST'])
+@throttled('login')
 def login():
     """Авторизация пользователя"""
     try:
@@ -95,7 +126,8 @@ def login():
         # Создание сессии
         session['user_id'] = user.id
         session['username'] = user.username
-        session['role'] = user.role
+        _remember_profile(user)
+        user_cache.put(user)
         
         logger.info(f"Пользователь {user.username} успешно авторизован")
         
@@ -105,6 +137,8 @@ def login():
             'user': user.to_dict()
         })
         
+    except PasswordHasherUnavailable as e:
+        return _hasher_unavailable_response(e)
     except Exception as e:
         logger.error(f"Ошибка авторизации: {e}")
         return jsonify({
@@ -146,16 +180,21 @@ def get_profile():
                 'message': 'Необходима авторизация'
             }), 401
         
-        user = User.get_by_username(session.get('username'))
-        if not user:
-            return jsonify({
-                'success': False,
-                'message': 'Пользователь не найден'
-            }), 404
+        # Обычно профиль берется из снимка в сессии, без обращения к базе
+        profile = _session_profile()
+        if profile is None:
+            user = User.get_cached(session.get('username'))
+            if not user:
+                return jsonify({
+                    'success': False,
+                    'message': 'Пользователь не найден'
+                }), 404
+            _remember_profile(user)
+            profile = user.to_dict()
         
         return jsonify({
             'success': True,
-            'user': user.to_dict()
+            'user': profile
         })
         
     except Exception as e:
@@ -169,6 +208,22 @@ def get_profile():
 def check_auth():
     """Проверка авторизации"""
     user_id = session.get('user_id')
+    
+    # Устаревший снимок сверяется с кэшем/базой: удаленный или
+    # отключенный пользователь теряет сессию
+    if user_id and _session_profile() is None:
+        try:
+            user = User.get_cached(session.get('username'))
+            if user is None or user.id != user_id:
+                logger.info(f"Сессия пользователя {session.get('username')} больше не действительна")
+                session.clear()
+                user_id = None
+            else:
+                _remember_profile(user)
+        except Exception as e:
+            # База недоступна: отвечаем по данным сессии
+            logger.error(f"Ошибка проверки пользователя сессии: {e}")
+    
     username = session.get('username')
     role = session.get('role')
     
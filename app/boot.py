@@ -0,0 +1,205 @@
+"""
+Быстрый холодный старт и время до первого запроса
+
+При FAST_BOOT=true main.py сначала открывает порт, а проверку схемы,
+подключения пула, процессы хеширования паролей и фоновые потоки запускает
+после этого в отдельном потоке (WarmUp). Пока схема не проверена, запросы к
+/api ждут ее не дольше FAST_BOOT_SCHEMA_WAIT секунд, затем получают 503;
+/health/live, главная страница и статика отвечают сразу. /health/ready
+возвращает 503, пока прогрев не завершен.
+
+BootTimer в любом режиме замеряет этапы старта процесса и пишет в лог
+разбивку времени до первого ответа; она же отдается в /health ('boot').
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Подписи этапов для строки в логе
+PHASE_LABELS = {
+    'interpreter': 'интерпретатор',
+    'config': 'конфигурация',
+    'imports': 'импорт',
+    'schema': 'схема',
+    'create_app': 'приложение',
+    'listen': 'порт',
+    'pool': 'пул БД',
+    'password_hasher': 'хеширование',
+    'background': 'фоновые потоки',
+    'first_request': 'первый запрос',
+}
+
+def _process_age() -> Optional[float]:
+    """Сколько секунд назад запущен процесс (по /proc, только Linux)"""
+    try:
+        with open('/proc/self/stat') as stat:
+            # Поля после имени процесса (оно в скобках и может содержать пробелы)
+            fields = stat.read().rsplit(')', 1)[1].split()
+        started = int(fields[19]) / os.sysconf('SC_CLK_TCK')
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - started
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class BootTimer:
+    """Длительности этапов старта процесса и время до первого ответа"""
+
+    def __init__(self):
+        age = _process_age()
+        self._origin = time.monotonic() - (age or 0.0)
+        self._lock = threading.Lock()
+        # Последовательные этапы до открытия порта и этапы прогрева (идут параллельно с запросами)
+        self.phases: Dict[str, float] = {}
+        self.warmup: Dict[str, float] = {}
+        if age is not None:
+            self.phases['interpreter'] = round(age * 1000, 1)
+        self.listening_ms: Optional[float] = None
+        self.first_response_ms: Optional[float] = None
+
+    def _since_origin(self) -> float:
+        return round((time.monotonic() - self._origin) * 1000, 1)
+
+    @contextmanager
+    def phase(self, name: str, warmup: bool = False):
+        """Замерить этап старта (warmup=True — этап фонового прогрева)"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = round((time.monotonic() - started) * 1000, 1)
+            with self._lock:
+                (self.warmup if warmup else self.phases)[name] = elapsed
+
+    def listening(self):
+        """Порт открыт: с этого момента запросы принимаются"""
+        with self._lock:
+            self.listening_ms = self._since_origin()
+        logger.info(f"⏱️ Порт открыт через {self.listening_ms:.0f} мс после старта процесса")
+
+    def init_app(self, app):
+        """Зарегистрировать замер первого запроса в приложении"""
+        # Flask импортируется здесь: модуль загружается до него, чтобы замерить импорт
+        from flask import request
+
+        @app.before_request
+        def boot_first_request():
+            if self.first_response_ms is None:
+                request.environ['hirehand.boot_started'] = time.monotonic()
+
+        @app.after_request
+        def boot_first_response(response):
+            started = request.environ.get('hirehand.boot_started')
+            with self._lock:
+                if self.first_response_ms is not None or started is None:
+                    return response
+                self.phases['first_request'] = round((time.monotonic() - started) * 1000, 1)
+                self.first_response_ms = self._since_origin()
+            logger.info(f"⏱️ Первый ответ через {self.first_response_ms:.0f} мс после старта процесса: "
+                        f"{self.describe()}")
+            return response
+
+    def describe(self) -> str:
+        """Этапы одной строкой для лога"""
+        with self._lock:
+            parts = [f"{PHASE_LABELS.get(name, name)} {ms:.0f}" for name, ms in self.phases.items()]
+            if self.warmup:
+                parts.append('прогрев (' + ', '.join(
+                    f"{PHASE_LABELS.get(name, name)} {ms:.0f}" for name, ms in self.warmup.items()) + ')')
+        return ', '.join(parts) + ' мс'
+
+    def stats(self) -> Dict[str, Any]:
+        """Разбивка старта для /health"""
+        with self._lock:
+            return {
+                'phases_ms': dict(self.phases),
+                'warmup_ms': dict(self.warmup),
+                'listening_ms': self.listening_ms,
+                'first_response_ms': self.first_response_ms,
+                'uptime_seconds': round(time.monotonic() - self._origin, 1)
+            }
+
+class WarmUp:
+    """Отложенный прогрев после открытия порта (FAST_BOOT)"""
+
+    IDLE, RUNNING, DONE, FAILED = 'idle', 'running', 'done', 'failed'
+
+    def __init__(self, timer: BootTimer):
+        self.timer = timer
+        self.state = self.IDLE
+        self.error: Optional[str] = None
+        self.schema_ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        """Прогрев не запускался (обычный старт) или завершен"""
+        return self.state in (self.IDLE, self.DONE)
+
+    def start(self, on_failure: Callable[[], None]):
+        """Запустить прогрев в фоне; on_failure вызывается, если схема не готова"""
+        self.state = self.RUNNING
+        self._thread = threading.Thread(target=self._run, args=(on_failure,), name='boot-warmup', daemon=True)
+        self._thread.start()
+
+    def _run(self, on_failure: Callable[[], None]):
+        from .migrations import ensure_schema
+
+        try:
+            with self.timer.phase('schema', warmup=True):
+                ensure_schema()
+        except Exception as e:
+            logger.error(f"❌ Критическая ошибка: {e}")
+            self.error = str(e)
+            self.state = self.FAILED
+            # Запросы к /api, ждущие схему, получат 503 сразу
+            self.schema_ready.set()
+            on_failure()
+            return
+        self.schema_ready.set()
+
+        from .database import db_manager
+        from .password_hashing import password_hasher
+        from .server import start_background_tasks
+
+        steps = (
+            ('pool', db_manager.pool.warm),
+            ('password_hasher', password_hasher.warm),
+            ('background', start_background_tasks),
+        )
+        for name, step in steps:
+            try:
+                with self.timer.phase(name, warmup=True):
+                    step()
+            except Exception as e:
+                # Не критично: подключения и процессы будут открыты при первых запросах
+                logger.warning(f"⚠️ Ошибка прогрева ({name}): {e}")
+                self.error = str(e)
+        self.state = self.DONE
+        logger.info(f"🔥 Прогрев завершен: {self.timer.describe()}")
+
+    def init_app(self, app, schema_wait: float):
+        """Запросы к /api ждут проверки схемы не дольше schema_wait секунд"""
+        from flask import request, jsonify
+
+        @app.before_request
+        def wait_for_schema():
+            if not request.path.startswith('/api'):
+                return None
+            if self.schema_ready.wait(schema_wait) and self.state != self.FAILED:
+                return None
+            response = jsonify({
+                'success': False,
+                'error': 'Сервер запускается, повторите запрос позже',
+                'status_code': 503
+            })
+            response.headers['Retry-After'] = '1'
+            return response, 503
+
+# Глобальные замер старта и прогрев процесса
+boot_timer = BootTimer()
+warm_up = WarmUp(boot_timer)
@@ -0,0 +1,151 @@
+"""
+Кэш готовых JSON-ответов для часто запрашиваемых списков
+
+Хранит тело ответа в байтах с TTL и вытеснением давно не использованных
+записей (LRU). Инвалидация локальна для процесса: в других воркерах запись
+устареет не позже чем через TTL.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple, Hashable, Callable
+
+from flask import Response
+
+from .config import config
+from .conditional import body_etag, is_fresh, not_modified, set_validators
+from .compression import add_vary, apply_encoding, encode_body
+
+logger = logging.getLogger(__name__)
+
+class CachedBody:
+    """Тело ответа с заголовками-валидаторами"""
+
+    __slots__ = ('body', 'mimetype', 'etag', 'last_modified', 'encoded')
+
+    def __init__(self, body: bytes, mimetype: str, etag: str, last_modified: Optional[datetime] = None):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = etag
+        self.last_modified = last_modified
+        # Сжатые варианты тела по кодировке: сжимаем один раз на запись кэша
+        self.encoded: Dict[str, bytes] = {}
+
+class ResponseCache:
+    """Кэш тел ответов с TTL, LRU и счетчиками попаданий"""
+
+    def __init__(self, name: str, ttl: float = 30.0, max_entries: int = 256):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple[float, CachedBody]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Номер поколения растет при каждой инвалидации: ответ, собранный
+        # до нее, в кэш уже не попадет
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        """Сохраненный ответ или None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, cached = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+    def set(self, key: Hashable, cached: CachedBody, generation: Optional[int] = None):
+        """Сохранить ответ; generation — поколение на момент чтения данных"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Сбросить все записи"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики кэша"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'bytes': sum(
+                    len(cached.body) + sum(len(data) for data in cached.encoded.values())
+                    for _, cached in self._entries.values()
+                )
+            }
+
+def cached_response(cache: ResponseCache, key: Hashable,
+                    build: Callable[[], Tuple[Response, bool]]) -> Response:
+    """
+    Отдать ответ из кэша или собрать его через build(), который возвращает
+    (ответ, можно ли его кэшировать). В кэш попадают только ответы со статусом 200.
+    ETag ответа — хэш тела; при совпадении с If-None-Match отдается 304 без тела.
+    Сжатые варианты тела сохраняются вместе с записью.
+    """
+    cached = cache.get(key) if cache.ttl > 0 else None
+    if cached is None:
+        generation = cache.generation
+        response, cacheable = build()
+        if response.status_code != 200:
+            return response
+        cached = CachedBody(response.get_data(), response.mimetype, body_etag(response.get_data()),
+                            response.last_modified)
+        if cacheable and cache.ttl > 0:
+            cache.set(key, cached, generation)
+
+    response = set_validators(Response(cached.body, mimetype=cached.mimetype), cached.etag, cached.last_modified)
+    if is_fresh(cached.etag, cached.last_modified):
+        return not_modified(cached.etag, cached.last_modified, full=response)
+    if config.COMPRESSION_ENABLED and len(cached.body) >= config.COMPRESSION_MIN_SIZE:
+        add_vary(response)
+        apply_encoding(response, *encode_body(cached.body, cached.encoded))
+    return response
+
+# Кэш списков вакансий (/api/jobs, /api/jobs/featured)
+job_listing_cache = ResponseCache(
+    'jobs',
+    ttl=config.RESPONSE_CACHE_TTL,
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES
+)
+
+def caches_stats() -> Dict[str, Any]:
+    """Счетчики всех кэшей ответов"""
+    return {job_listing_cache.name: job_listing_cache.stats()}
@@ -0,0 +1,349 @@
+"""
+Потоковый импорт кандидатов из CSV/NDJSON через COPY FROM STDIN
+
+Файл читается построчно, в памяти держится только текущая пачка строк.
+Строки загружаются во временную staging-таблицу, дубликаты по email
+отбрасываются уже в базе, а итоговая вставка выполняется одним запросом.
+
+Запуск из командной строки:
+    python -m app.candidate_import candidates.csv --rejects rejects.csv
+"""
+
+import io
+import re
+import csv
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Tuple, Callable, TextIO
+
+from .config import config
+from .database import db_manager
+
+logger = logging.getLogger(__name__)
+
+# Колонки, которые принимает импорт (совпадают с полями Candidate)
+IMPORT_FIELDS = (
+    'full_name', 'email', 'phone', 'resume_url', 'skills', 'experience_years',
+    'current_position', 'desired_position', 'desired_salary', 'location', 'language'
+)
+_INT_FIELDS = ('experience_years', 'desired_salary')
+_SKILL_SEPARATORS = re.compile(r'[,;|]')
+
+_CREATE_STAGING = """
+    CREATE TEMP TABLE candidate_import_staging (
+        line_no BIGINT NOT NULL,
+        full_name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        phone TEXT,
+        resume_url TEXT,
+        skills TEXT[],
+        experience_years INTEGER,
+        current_position TEXT,
+        desired_position TEXT,
+        desired_salary INTEGER,
+        location TEXT,
+        language TEXT,
+        reject_reason TEXT
+    ) ON COMMIT DROP
+"""
+
+_COPY_STAGING = f"""
+    COPY candidate_import_staging (line_no, {', '.join(IMPORT_FIELDS)})
+    FROM STDIN WITH (FORMAT csv)
+"""
+
+# Помечаем строки, чей email уже есть в базе или встречался выше в файле
+_MARK_DUPLICATES = """
+    UPDATE candidate_import_staging s
+    SET reject_reason = CASE
+        WHEN EXISTS (SELECT 1 FROM candidates c WHERE lower(c.email) = s.email) THEN 'Кандидат с таким email уже существует'
+        ELSE 'Повторный email в файле'
+    END
+    FROM (
+        SELECT line_no, row_number() OVER (PARTITION BY email ORDER BY line_no) AS rn
+        FROM candidate_import_staging
+    ) ranked
+    WHERE ranked.line_no = s.line_no
+      AND (ranked.rn > 1 OR EXISTS (SELECT 1 FROM candidates c WHERE lower(c.email) = s.email))
+"""
+
+# Вставка из staging; email, занятый уже после разметки дубликатов
+# (параллельной вставкой), пропускается и помечается в staging
+_INSERT_FROM_STAGING = f"""
+    WITH inserted AS (
+        INSERT INTO candidates ({', '.join(IMPORT_FIELDS)})
+        SELECT {', '.join(IMPORT_FIELDS)}
+        FROM candidate_import_staging
+        WHERE reject_reason IS NULL
+        ORDER BY line_no
+        ON CONFLICT ((lower(email))) DO NOTHING
+        RETURNING email
+    ), late_duplicates AS (
+        UPDATE candidate_import_staging s
+        SET reject_reason = 'Кандидат с таким email уже существует'
+        WHERE s.reject_reason IS NULL
+          AND NOT EXISTS (SELECT 1 FROM inserted i WHERE i.email = s.email)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM inserted), (SELECT COUNT(*) FROM late_duplicates)
+"""
+
+_SELECT_STAGING_REJECTS = """
+    SELECT line_no, email, reject_reason
+    FROM candidate_import_staging
+    WHERE reject_reason IS NOT NULL
+    ORDER BY line_no
+"""
+
+class ImportReport:
+    """Итоги импорта"""
+
+    def __init__(self, max_rejects: int = 100):
+        self.max_rejects = max_rejects
+        self.rows_read = 0
+        self.rows_staged = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.rejects: List[Dict[str, Any]] = []
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    def reject(self, line_no: int, reason: str, email: Optional[str] = None):
+        """Учесть отклоненную строку (в отчете хранятся только первые max_rejects)"""
+        self.rejected += 1
+        if len(self.rejects) < self.max_rejects:
+            self.rejects.append({'line': line_no, 'email': email, 'reason': reason})
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразовать в словарь"""
+        return {
+            'rows_read': self.rows_read,
+            'inserted': self.inserted,
+            'rejected': self.rejected,
+            'rejects': self.rejects,
+            'rejects_truncated': self.rejected > len(self.rejects),
+            'elapsed_seconds': round(self.elapsed, 3)
+        }
+
+def iter_csv_records(stream: TextIO) -> Iterator[Tuple[int, Any]]:
+    """Построчно читать CSV с заголовком; возвращает (номер строки файла, запись)"""
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield reader.line_num, record
+
+def iter_ndjson_records(stream: TextIO) -> Iterator[Tuple[int, Any]]:
+    """Построчно читать NDJSON; невалидный JSON возвращается как строка с ошибкой"""
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError:
+            yield line_no, 'Некорректный JSON'
+
+def normalize_skills(value: Any) -> List[str]:
+    """Привести навыки к списку уникальных строк в нижнем регистре"""
+    if value is None:
+        return []
+    items = value if isinstance(value, list) else _SKILL_SEPARATORS.split(str(value))
+
+    skills = []
+    seen = set()
+    for item in items:
+        skill = ' '.join(str(item).split()).lower()
+        if skill and skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+    return skills
+
+def normalize_record(record: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Нормализовать запись кандидата; вернуть (данные, None) или (None, ошибка)"""
+    if isinstance(record, str):
+        return None, record
+    if not isinstance(record, dict):
+        return None, 'Строка должна быть объектом'
+
+    data: Dict[str, Any] = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.strip() or None
+        data[field] = value
+
+    if not data['full_name'] or not data['email']:
+        return None, 'Не заполнены обязательные поля: full_name, email'
+
+    data['email'] = str(data['email']).lower()
+    if '@' not in data['email']:
+        return None, 'Некорректный email'
+
+    for field in _INT_FIELDS:
+        value = data[field]
+        if value is None:
+            continue
+        try:
+            data[field] = int(value)
+        except (TypeError, ValueError):
+            return None, f"Поле {field} должно быть целым числом"
+
+    data['skills'] = normalize_skills(data['skills'])
+    data['language'] = data['language'] or 'ru'
+    return data, None
+
+def _pg_array(values: List[str]) -> str:
+    """Литерал массива PostgreSQL для COPY"""
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"') for value in values)
+    return '{' + ','.join(f'"{value}"' for value in escaped) + '}'
+
+def _copy_chunk(cursor, rows: List[Tuple]):
+    """Отправить пачку строк в staging-таблицу через COPY"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(_COPY_STAGING, buffer)
+
+def import_candidates(records: Iterable[Tuple[int, Any]], chunk_size: Optional[int] = None,
+                      progress: Optional[Callable[[ImportReport], None]] = None,
+                      on_reject: Optional[Callable[[int, Optional[str], str], None]] = None,
+                      max_rejects: int = 100) -> ImportReport:
+    """
+    Импортировать кандидатов из потока записей (номер строки, запись).
+
+    Весь импорт идет в одной транзакции: при ошибке базы ничего не записывается.
+    on_reject вызывается для каждой отклоненной строки, progress — после каждой пачки.
+    """
+    chunk_size = chunk_size or config.IMPORT_CHUNK_SIZE
+    report = ImportReport(max_rejects=max_rejects)
+
+    def reject(line_no: int, reason: str, email: Optional[str] = None):
+        report.reject(line_no, reason, email)
+        if on_reject:
+            on_reject(line_no, email, reason)
+
+    with db_manager.transaction(), db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(_CREATE_STAGING)
+
+            batch: List[Tuple] = []
+            for line_no, record in records:
+                report.rows_read += 1
+                data, error = normalize_record(record)
+                if error:
+                    reject(line_no, error, record.get('email') if isinstance(record, dict) else None)
+                    continue
+
+                batch.append((
+                    line_no, data['full_name'], data['email'], data['phone'], data['resume_url'],
+                    _pg_array(data['skills']), data['experience_years'], data['current_position'],
+                    data['desired_position'], data['desired_salary'], data['location'], data['language']
+                ))
+                if len(batch) >= chunk_size:
+                    _copy_chunk(cursor, batch)
+                    report.rows_staged += len(batch)
+                    batch = []
+                    if progress:
+                        progress(report)
+
+            if batch:
+                _copy_chunk(cursor, batch)
+                report.rows_staged += len(batch)
+
+            cursor.execute("CREATE INDEX ON candidate_import_staging (email, line_no)")
+            cursor.execute("ANALYZE candidate_import_staging")
+            cursor.execute(_MARK_DUPLICATES)
+            cursor.execute(_INSERT_FROM_STAGING)
+            report.inserted = cursor.fetchone()[0]
+
+            # Отклоненные на этапе дедупликации строки читаем серверным курсором
+            rejects = conn.cursor(name='candidate_import_rejects')
+            rejects.itersize = chunk_size
+            rejects.execute(_SELECT_STAGING_REJECTS)
+            for line_no, email, reason in rejects:
+                reject(line_no, reason, email)
+            rejects.close()
+        finally:
+            cursor.close()
+
+    # Импортированные кандидаты попадают в индекс навыков сразу, не дожидаясь фоновой догрузки
+    from .skill_index import skill_index
+    skill_index.catch_up()
+
+    report.finished_at = time.monotonic()
+    if progress:
+        progress(report)
+    logger.info(
+        f"Импорт кандидатов завершен: прочитано {report.rows_read}, добавлено {report.inserted}, "
+        f"отклонено {report.rejected} за {report.elapsed:.1f} с"
+    )
+    return report
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """Определить формат файла по имени или Content-Type"""
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in (content_type or ''):
+        return 'ndjson'
+    return 'csv'
+
+def iter_records(stream: TextIO, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """Итератор записей для выбранного формата"""
+    if file_format == 'ndjson':
+        return iter_ndjson_records(stream)
+    return iter_csv_records(stream)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа CLI"""
+    parser = argparse.ArgumentParser(description='Импорт кандидатов из CSV/NDJSON')
+    parser.add_argument('path', help='Путь к файлу или "-" для stdin')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='Формат файла (по умолчанию по расширению)')
+    parser.add_argument('--rejects', help='Записать отклоненные строки в CSV-файл')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Размер пачки для COPY')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    file_format = args.format or detect_format(args.path)
+    rejects_file = open(args.rejects, 'w', newline='', encoding='utf-8') if args.rejects else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+    if rejects_writer:
+        rejects_writer.writerow(['line', 'email', 'reason'])
+
+    def on_reject(line_no: int, email: Optional[str], reason: str):
+        if rejects_writer:
+            rejects_writer.writerow([line_no, email or '', reason])
+
+    def progress(report: ImportReport):
+        rate = report.rows_read / report.elapsed if report.elapsed else 0
+        print(f"\rПрочитано {report.rows_read} строк, отклонено {report.rejected} ({rate:.0f} строк/с)",
+              end='', file=sys.stderr, flush=True)
+
+    stream = sys.stdin if args.path == '-' else open(args.path, newline='', encoding='utf-8-sig')
+    try:
+        report = import_candidates(iter_records(stream, file_format), chunk_size=args.chunk_size,
+                                   progress=progress, on_reject=on_reject, max_rejects=0)
+    except Exception as e:
+        logger.error(f"❌ Ошибка импорта кандидатов: {e}")
+        return 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if rejects_file:
+            rejects_file.close()
+
+    print(file=sys.stderr)
+    print(json.dumps(report.to_dict(), ensure_ascii=False))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
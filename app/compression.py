@@ -0,0 +1,206 @@
+"""
+Сжатие ответов gzip/brotli и отдача предварительно сжатой статики
+
+JSON и текстовые ответы сжимаются в after_request, если клиент это принимает
+(Accept-Encoding) и тело не меньше COMPRESSION_MIN_SIZE. Для статических
+файлов заранее собираются соседние .gz/.br, которые отдаются без сжатия на лету:
+
+    python -m app.compression build
+"""
+
+import os
+import sys
+import gzip
+import logging
+import argparse
+import mimetypes
+from typing import Optional, List, Sequence, Dict, Tuple
+
+from flask import Flask, Response, request, send_from_directory, abort
+from werkzeug.security import safe_join
+
+from .config import config
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен: без него сжимаем только gzip
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+    'text/css', 'text/html', 'text/javascript', 'text/plain', 'text/xml',
+}
+
+STATIC_EXTENSIONS = ('.css', '.html', '.js', '.json', '.map', '.svg', '.txt', '.xml')
+
+# Расширения предварительно сжатых файлов в порядке предпочтения
+PRECOMPRESSED_SUFFIXES = (('br', '.br'), ('gzip', '.gz'))
+
+def available_encodings() -> List[str]:
+    """Кодировки, которыми умеем сжимать на лету, в порядке предпочтения"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def negotiate_encoding(offered: Sequence[str]) -> Optional[str]:
+    """Лучшая из offered по Accept-Encoding клиента (при равном q — первая в offered)"""
+    accept = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in offered:
+        quality = accept[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Сжать тело с уровнем из настроек"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=config.COMPRESSION_LEVEL, mtime=0)
+
+def add_vary(response: Response):
+    """Ответ зависит от Accept-Encoding"""
+    response.vary.add('Accept-Encoding')
+
+def varies_by_encoding(mimetype: Optional[str], size: int) -> bool:
+    """Тело такого типа и размера сжимается, то есть ответ зависит от Accept-Encoding"""
+    return (config.COMPRESSION_ENABLED and mimetype in COMPRESSIBLE_MIMETYPES
+            and size >= config.COMPRESSION_MIN_SIZE)
+
+def encode_body(data: bytes, encoded: Optional[Dict[str, bytes]] = None) -> Tuple[bytes, Optional[str]]:
+    """
+    Тело в лучшей принимаемой клиентом кодировке: (данные, кодировка или None).
+    encoded — уже сжатые варианты этого тела (например, из кэша ответов),
+    дополняется новыми.
+    """
+    if not config.COMPRESSION_ENABLED or len(data) < config.COMPRESSION_MIN_SIZE:
+        return data, None
+    encoding = negotiate_encoding(available_encodings())
+    if encoding is None:
+        return data, None
+
+    compressed = encoded.get(encoding) if encoded is not None else None
+    if compressed is None:
+        compressed = compress(data, encoding)
+        if encoded is not None:
+            encoded[encoding] = compressed
+    if len(compressed) >= len(data):
+        return data, None
+    return compressed, encoding
+
+def apply_encoding(response: Response, data: bytes, encoding: Optional[str]) -> Response:
+    """Проставить сжатое тело, Content-Encoding и ETag сжатого представления"""
+    if encoding is None:
+        return response
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    # У сжатого представления свой ETag (суффикс учитывается в conditional.is_fresh)
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+def compress_response(response: Response) -> Response:
+    """after_request: сжать ответ, если это выгодно и клиент это принимает"""
+    if (request.method == 'HEAD'
+            or response.direct_passthrough
+            or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    data = response.get_data()
+    if len(data) < config.COMPRESSION_MIN_SIZE:
+        return response
+    add_vary(response)
+    return apply_encoding(response, *encode_body(data))
+
+def send_static(directory: str, filename: str) -> Response:
+    """Отдать статический файл, по возможности его заранее сжатую копию"""
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    if filename.endswith(STATIC_EXTENSIONS):
+        mtime = os.path.getmtime(path)
+        fresh = [
+            encoding for encoding, suffix in PRECOMPRESSED_SUFFIXES
+            if os.path.isfile(path + suffix) and os.path.getmtime(path + suffix) >= mtime
+        ]
+        encoding = negotiate_encoding(fresh) if fresh else None
+        if encoding is not None:
+            suffix = dict(PRECOMPRESSED_SUFFIXES)[encoding]
+            mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            response = send_from_directory(directory, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            add_vary(response)
+            return response
+        if fresh:
+            response = send_from_directory(directory, filename)
+            add_vary(response)
+            return response
+
+    return send_from_directory(directory, filename)
+
+def init_compression(app: Flask):
+    """Подключить сжатие ответов к приложению"""
+    if config.COMPRESSION_ENABLED:
+        app.after_request(compress_response)
+
+def build_precompressed(directory: str, force: bool = False) -> int:
+    """Собрать .gz/.br рядом со статическими файлами; вернуть число записанных файлов"""
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(STATIC_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as source:
+                data = source.read()
+            if len(data) < config.COMPRESSION_MIN_SIZE:
+                continue
+
+            variants = [('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.append(('.br', lambda: brotli.compress(data, quality=11)))
+            else:
+                logger.warning(f"⚠️  brotli не установлен, {name}.br не собран")
+
+            mtime = os.path.getmtime(path)
+            for suffix, build in variants:
+                target = path + suffix
+                if not force and os.path.isfile(target) and os.path.getmtime(target) >= mtime:
+                    continue
+                compressed = build()
+                if len(compressed) >= len(data):
+                    continue
+                with open(target, 'wb') as output:
+                    output.write(compressed)
+                written += 1
+                logger.info(f"📦 {os.path.relpath(target, directory)}: {len(data)} -> {len(compressed)} байт")
+    return written
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа CLI"""
+    parser = argparse.ArgumentParser(description='Предварительное сжатие статических файлов')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Собрать .gz/.br для статических файлов')
+    build.add_argument('--dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'),
+                       help='Каталог статических файлов')
+    build.add_argument('--force', action='store_true', help='Пересобрать даже актуальные файлы')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    written = build_precompressed(args.dir, force=args.force)
+    logger.info(f"✅ Записано сжатых файлов: {written}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
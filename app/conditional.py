@@ -0,0 +1,108 @@
+"""
+Условные GET-запросы: ETag / If-None-Match и Last-Modified / If-Modified-Since
+
+ETag ресурсов строится из id и updated_at (тело для сравнения не нужно),
+ETag кэшированных ответов — из хэша тела. Даты без часового пояса
+считаются UTC, как и в werkzeug.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Optional, Any, Iterable, Callable
+
+from flask import request, Response
+from werkzeug.http import is_resource_modified
+
+from .config import config
+from .compression import add_vary, varies_by_encoding
+
+# Версия JSON-представления ресурсов. Увеличивать при любом изменении формата
+# ответов, иначе клиенты получат 304 на тело в старом формате
+REPRESENTATION_VERSION = 2
+
+# Суффиксы ETag сжатых представлений (см. compression.py)
+ETAG_ENCODING_SUFFIXES = ('-br', '-gzip')
+
+# Заголовки полного ответа, которые повторяются в 304: иначе кэши между
+# клиентом и сервером обновят сохраненный ответ без них
+NOT_MODIFIED_HEADERS = ('Vary', 'Cache-Control')
+
+def make_etag(*parts: Any) -> str:
+    """Сильный ETag из значений, однозначно определяющих представление"""
+    data = repr((REPRESENTATION_VERSION,) + parts).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def body_etag(body: bytes) -> str:
+    """Сильный ETag из тела ответа"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def page_etag(kind: str, rows: Iterable[Any], next_cursor: Optional[str]) -> str:
+    """ETag страницы списка: id и updated_at строк и курсор следующей страницы"""
+    return make_etag(kind, [(row.id, row.updated_at) for row in rows], next_cursor)
+
+def page_last_modified(rows: Iterable[Any]) -> Optional[datetime]:
+    """Last-Modified страницы списка: самое позднее updated_at среди строк"""
+    return max((row.updated_at for row in rows if row.updated_at), default=None)
+
+def client_etag(etag: Optional[str]) -> Optional[str]:
+    """
+    Вариант etag из If-None-Match: сам etag или его сжатое представление
+    (compression.py добавляет к ETag суффикс кодировки)
+    """
+    if not etag or not request.if_none_match:
+        return None
+    for variant in (etag,) + tuple(etag + suffix for suffix in ETAG_ENCODING_SUFFIXES):
+        if request.if_none_match.contains_weak(variant):
+            return variant
+    return None
+
+def is_fresh(etag: Optional[str] = None, last_modified: Optional[datetime] = None) -> bool:
+    """Копия клиента актуальна (If-None-Match приоритетнее If-Modified-Since)"""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.if_none_match:
+        return client_etag(etag) is not None
+    if not request.if_modified_since:
+        return False
+    return not is_resource_modified(request.environ, last_modified=last_modified)
+
+def set_validators(response: Response, etag: Optional[str], last_modified: Optional[datetime] = None) -> Response:
+    """Проставить ETag и Last-Modified"""
+    if etag:
+        response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
+def not_modified(etag: Optional[str], last_modified: Optional[datetime] = None,
+                 full: Optional[Response] = None) -> Response:
+    """
+    Ответ 304 без тела; ETag — тот вариант, который прислал клиент.
+    Vary и Cache-Control — как у полного ответа full; без него (тело не
+    собиралось) ответ считается зависящим от Accept-Encoding, если сжатие включено.
+    """
+    response = set_validators(Response(status=304), client_etag(etag) or etag, last_modified)
+    if full is None:
+        if config.COMPRESSION_ENABLED:
+            add_vary(response)
+        return response
+    for header in NOT_MODIFIED_HEADERS:
+        if header in full.headers:
+            response.headers[header] = full.headers[header]
+    # Vary: Accept-Encoding полному ответу добавит только compress_response (after_request)
+    if varies_by_encoding(full.mimetype, len(full.get_data())):
+        add_vary(response)
+    return response
+
+def conditional_response(etag: str, last_modified: Optional[datetime], build: Callable[[], Response]) -> Response:
+    """304, если копия клиента актуальна; иначе ответ build() с ETag и Last-Modified"""
+    if is_fresh(etag, last_modified):
+        return not_modified(etag, last_modified)
+    return set_validators(build(), etag, last_modified)
+
+def conditional_body_response(response: Response) -> Response:
+    """304 или ответ с ETag из хэша тела (для ответов, собранных без объектов строк)"""
+    etag = body_etag(response.get_data())
+    if is_fresh(etag, response.last_modified):
+        return not_modified(etag, response.last_modified, full=response)
+    return set_validators(response, etag)
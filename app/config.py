@@ -16,6 +16,24 @@ class Config:
         self.DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
         self.PORT = int(os.getenv('PORT', 5000))
         self.SECRET_KEY = os.getenv('SECRET_KEY', 'hirehand-secret-key-2025')
+
+        # Режим запуска main.py: development (встроенный сервер Werkzeug) или
+        # production (gunicorn: воркеры по числу ядер, preload, перезапуск воркеров)
+        self.SERVER_MODE = os.getenv('SERVER_MODE', 'development')
+        # Воркеры gunicorn (0 — 2 × ядра + 1), потоков в воркере, перезапуск
+        # воркера после N запросов (± разброс), таймауты в секундах
+        self.WEB_WORKERS = int(os.getenv('WEB_WORKERS', 0))
+        self.WEB_THREADS = int(os.getenv('WEB_THREADS', 4))
+        self.WEB_MAX_REQUESTS = int(os.getenv('WEB_MAX_REQUESTS', 2000))
+        self.WEB_MAX_REQUESTS_JITTER = int(os.getenv('WEB_MAX_REQUESTS_JITTER', 200))
+        self.WEB_TIMEOUT = int(os.getenv('WEB_TIMEOUT', 30))
+        self.WEB_GRACEFUL_TIMEOUT = int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30))
+        self.WEB_KEEPALIVE = int(os.getenv('WEB_KEEPALIVE', 5))
+        # Быстрый холодный старт встроенного сервера: сначала открыть порт, затем
+        # в фоне проверить схему и прогреть пул; запросы к /api ждут проверки
+        # схемы не дольше FAST_BOOT_SCHEMA_WAIT секунд (иначе 503)
+        self.FAST_BOOT = os.getenv('FAST_BOOT', 'False').lower() == 'true'
+        self.FAST_BOOT_SCHEMA_WAIT = float(os.getenv('FAST_BOOT_SCHEMA_WAIT', 10))
         
         # Настройки базы данных PostgreSQL
         self.DB_HOST = os.getenv('PGHOST')
@@ -23,7 +41,101 @@ class Config:
         self.DB_USER = os.getenv('PGUSER')
         self.DB_PASSWORD = os.getenv('PGPASSWORD')
         self.DB_PORT = int(os.getenv('PGPORT') or 5432)
+
+        # Настройки пула подключений к БД
+        self.DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+        self.DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+        self.DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+        self.DB_POOL_RECYCLE = float(os.getenv('DB_POOL_RECYCLE', 1800))
+        self.DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', 300))
+        self.DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+        self.DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', 30))
+        # Сколько подключений к БД могут открыть все воркеры gunicorn вместе;
+        # пул каждого воркера ограничивается долей от этого числа (0 — без ограничения)
+        self.DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 90))
+        # Подготовленные запросы нужно отключить при работе через PgBouncer в режиме transaction
+        self.DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'True').lower() == 'true'
+        # Применять миграции при старте, если схема отстает (иначе старт завершится ошибкой)
+        self.MIGRATE_ON_BOOT = os.getenv('MIGRATE_ON_BOOT', 'True').lower() == 'true'
+
+        # Статистика для /health: период фонового обновления и режим (estimate | exact)
+        self.STATS_REFRESH_SECONDS = float(os.getenv('STATS_REFRESH_SECONDS', 15))
+        self.STATS_MODE = os.getenv('STATS_MODE', 'estimate')
+
+        # Подбор кандидатов и вакансий: период перестроения снимка и размер выдачи
+        self.MATCHING_REFRESH_SECONDS = float(os.getenv('MATCHING_REFRESH_SECONDS', 300))
+        self.MATCHING_TOP_K = int(os.getenv('MATCHING_TOP_K', 20))
+
+        # Индекс навыков кандидатов в памяти процесса
+        self.SKILL_INDEX_ENABLED = os.getenv('SKILL_INDEX_ENABLED', 'True').lower() == 'true'
+        self.SKILL_INDEX_REFRESH_SECONDS = float(os.getenv('SKILL_INDEX_REFRESH_SECONDS', 5))
+        # Сколько последних id перечитывать при догрузке и период полного перестроения (0 — без него)
+        self.SKILL_INDEX_RECHECK_IDS = int(os.getenv('SKILL_INDEX_RECHECK_IDS', 1000))
+        self.SKILL_INDEX_REBUILD_SECONDS = float(os.getenv('SKILL_INDEX_REBUILD_SECONDS', 600))
+
+        # Кэш ответов списков вакансий (TTL 0 отключает кэш)
+        self.RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 30))
+        self.RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 256))
         
+        # Сжатие ответов: порог размера тела в байтах и уровни gzip (1-9) / brotli (0-11)
+        self.COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+        self.COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+        self.COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))
+        self.COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+
+        # Хеширование паролей: процессов в пуле (0 — в потоке запроса),
+        # максимум принятых задач и таймаут одной задачи в секундах
+        self.PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+        self.PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 16))
+        self.PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 5))
+
+        # Число доверенных прокси перед приложением (балансировщик autoscale,
+        # nginx): адрес клиента берется из X-Forwarded-For на столько звеньев
+        # назад. 0 — заголовок не учитывается (иначе его подделает клиент)
+        self.TRUSTED_PROXIES = int(os.getenv('TRUSTED_PROXIES', 0))
+
+        # Ограничение частоты входа и регистрации (token bucket): хранилище
+        # memory (процесс) или postgres (общее для воркеров), объем корзины и
+        # пополнение в попытках в минуту для IP-адреса и для username
+        self.AUTH_THROTTLE_ENABLED = os.getenv('AUTH_THROTTLE_ENABLED', 'true').lower() == 'true'
+        self.AUTH_THROTTLE_BACKEND = os.getenv('AUTH_THROTTLE_BACKEND', 'memory')
+        self.AUTH_THROTTLE_IP_BURST = int(os.getenv('AUTH_THROTTLE_IP_BURST', 20))
+        self.AUTH_THROTTLE_IP_PER_MINUTE = float(os.getenv('AUTH_THROTTLE_IP_PER_MINUTE', 10))
+        self.AUTH_THROTTLE_USERNAME_BURST = int(os.getenv('AUTH_THROTTLE_USERNAME_BURST', 5))
+        self.AUTH_THROTTLE_USERNAME_PER_MINUTE = float(os.getenv('AUTH_THROTTLE_USERNAME_PER_MINUTE', 2))
+        self.AUTH_THROTTLE_MAX_KEYS = int(os.getenv('AUTH_THROTTLE_MAX_KEYS', 100000))
+
+        # Кэш пользователей процесса (секунды, записи) и срок, в течение
+        # которого снимок профиля в сессии принимается без обращения к базе
+        self.USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', 60))
+        self.USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', 10000))
+        self.PROFILE_SNAPSHOT_TTL = float(os.getenv('PROFILE_SNAPSHOT_TTL', 300))
+
+        # Отложенная запись контактных сообщений: журнал на диске и фоновая
+        # запись пачками (размер пачки, максимальная задержка в секундах,
+        # размер блока id из последовательности, fsync после каждой записи)
+        self.CONTACT_WRITE_BEHIND = os.getenv('CONTACT_WRITE_BEHIND', 'false').lower() == 'true'
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.CONTACT_QUEUE_DIR = os.getenv('CONTACT_QUEUE_DIR', os.path.join(project_dir, 'var', 'contact_queue'))
+        self.CONTACT_BATCH_SIZE = int(os.getenv('CONTACT_BATCH_SIZE', 200))
+        self.CONTACT_FLUSH_INTERVAL = float(os.getenv('CONTACT_FLUSH_INTERVAL', 0.5))
+        self.CONTACT_ID_BLOCK = int(os.getenv('CONTACT_ID_BLOCK', 100))
+        self.CONTACT_QUEUE_FSYNC = os.getenv('CONTACT_QUEUE_FSYNC', 'true').lower() == 'true'
+
+        # Списки, JSON которых собирает Postgres (через запятую: jobs, candidates, contact_messages)
+        self.SQL_JSON_ENDPOINTS = {
+            name.strip() for name in os.getenv('SQL_JSON_ENDPOINTS', '').split(',') if name.strip()
+        }
+
+        # Пагинация списков
+        self.DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 50))
+        self.MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 100))
+
+        # Массовая загрузка данных
+        self.BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 1000))
+        self.BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', 50000))
+        self.IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 5000))
+
         # Настройки CORS
         railway_domain = os.getenv('RAILWAY_PUBLIC_DOMAIN')
         cors_origins = ['http://localhost:3000', 'http://localhost:5000', 'http://0.0.0.0:5000']
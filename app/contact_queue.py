@@ -0,0 +1,369 @@
+"""
+Отложенная пачечная запись контактных сообщений (write-behind)
+
+При CONTACT_WRITE_BEHIND=true POST /api/contact не ждет INSERT: сообщение
+получает id из заранее зарезервированного блока последовательности
+contact_messages, дописывается строкой JSON в журнал на диске и сразу
+подтверждается. Фоновый поток раз в CONTACT_FLUSH_INTERVAL секунд (или как
+только накопится CONTACT_BATCH_SIZE сообщений) переименовывает журнал в
+сегмент и записывает его в базу многострочными INSERT.
+
+Журнал общий для всех процессов приложения: дозапись и ротация идут под
+flock. Процесс, переименовавший журнал в сегмент, держит на нем flock, пока
+не запишет и не удалит его; сегмент без блокировки (процесс-владелец
+завершился) забирает первый живой процесс. Повторная запись безопасна:
+id выданы заранее, а INSERT пропускает уже существующие (ON CONFLICT (id)).
+created_at сообщения — время записи в базу (DEFAULT в таблице), поэтому
+страницы по (created_at, id) не пропускают сообщения, записанные позже.
+Сообщения, которые база отвергает, переносятся в dead-letter.jsonl и не
+задерживают остальные.
+"""
+
+import os
+import json
+import time
+import fcntl
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import psycopg2
+
+from .config import config
+from .models.contact import ContactMessage
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_NAME = 'journal.jsonl'
+DEAD_LETTER_NAME = 'dead-letter.jsonl'
+SEGMENT_PREFIX = 'segment-'
+QUEUED_FIELDS = ('name', 'email', 'message', 'phone', 'company', 'service_type', 'language')
+
+class InvalidContactMessage(ValueError):
+    """Сообщение нельзя поставить в очередь (поле не строка)"""
+
+def check_message(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Поля сообщения; InvalidContactMessage, если какое-то из них не строка"""
+    record = {field: data.get(field) for field in QUEUED_FIELDS}
+    invalid = [field for field, value in record.items() if value is not None and not isinstance(value, str)]
+    if invalid:
+        raise InvalidContactMessage(f"Поля должны быть строками: {', '.join(invalid)}")
+    return record
+
+def _segment_pid(path: Path) -> Optional[int]:
+    """pid процесса, создавшего или забравшего сегмент segment-<время>-<pid>.jsonl"""
+    try:
+        return int(path.stem.rsplit('-', 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+def _lock_segment(path: Path) -> Optional[int]:
+    """Открыть сегмент под flock без ожидания; None, если его держит другой процесс или сегмента уже нет"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        # Владелец мог успеть записать и удалить сегмент
+        if os.fstat(fd).st_ino == os.stat(path).st_ino:
+            return fd
+    except (BlockingIOError, FileNotFoundError):
+        pass
+    except BaseException:
+        os.close(fd)
+        raise
+    os.close(fd)
+    return None
+
+class ContactQueue:
+    """Журнал контактных сообщений на диске и фоновая запись пачками"""
+
+    def __init__(self, directory: str, batch_size: int = 200, flush_interval: float = 0.5,
+                 id_block: int = 100, fsync: bool = True):
+        self.directory = Path(directory)
+        self.journal_path = self.directory / JOURNAL_NAME
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.id_block = max(1, id_block)
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        # Сегменты этого процесса: путь -> дескриптор, на котором держится flock
+        self._segments: Dict[Path, int] = {}
+        self._segments_pid = os.getpid()
+        self._reset_ids()
+
+        self.submitted = 0
+        self.flushed = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.replayed_segments = 0
+        self.torn_lines = 0
+        self.dead_letters = 0
+        self.last_flush_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def _reset_ids(self):
+        self._ids: List[int] = []
+        self._ids_pid = os.getpid()
+
+    def start(self):
+        """Запустить фоновую запись (однократно в каждом процессе, в том числе после fork)"""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid is None:
+                atexit.register(self.flush)
+            self._pid = os.getpid()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name='contact-queue', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self.flush()
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+
+    # --- Выдача id ---
+
+    def _refill_ids(self):
+        ids = ContactMessage.reserve_ids(self.id_block)
+        with self._lock:
+            self._ids.extend(ids)
+
+    def _next_id(self) -> int:
+        with self._lock:
+            # Блок, унаследованный через fork, есть и у родителя
+            if self._ids_pid != os.getpid():
+                self._reset_ids()
+            if self._ids:
+                return self._ids.pop(0)
+        self._refill_ids()
+        with self._lock:
+            return self._ids.pop(0)
+
+    # --- Журнал ---
+
+    def _open_locked(self, flags: int) -> int:
+        """Открыть текущий журнал под flock (с повтором, если его успели переименовать)"""
+        while True:
+            fd = os.open(self.journal_path, flags | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if os.fstat(fd).st_ino == os.stat(self.journal_path).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            except BaseException:
+                os.close(fd)
+                raise
+            os.close(fd)
+
+    def submit(self, data: Dict[str, Any]) -> int:
+        """Поставить проверенное сообщение в очередь; вернуть его id"""
+        # Проверка до подтверждения: запись, которую не примет база, в журнал не попадает
+        record = check_message(data)
+        self.start()
+        message_id = self._next_id()
+        record['language'] = record['language'] or 'ru'
+        record['id'] = message_id
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+        fd = self._open_locked(os.O_RDWR | os.O_APPEND)
+        try:
+            # Процесс, убитый посреди записи, оставляет строку без перевода строки:
+            # новая запись начинается с новой строки, иначе пропадут обе
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b'\n':
+                line = b'\n' + line
+            written = 0
+            while written < len(line):
+                written += os.write(fd, line[written:])
+            if self.fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        with self._lock:
+            self.submitted += 1
+            if self.submitted - self.flushed - self.duplicates >= self.batch_size:
+                self._wakeup.set()
+        return message_id
+
+    def _check_segments_pid(self):
+        # Дескрипторы, унаследованные через fork, закрываются: блокировки
+        # остаются у родителя, пока открыты его дескрипторы
+        if self._segments_pid != os.getpid():
+            for fd in self._segments.values():
+                os.close(fd)
+            self._segments = {}
+            self._segments_pid = os.getpid()
+
+    def _rotate(self):
+        """Переименовать непустой журнал в сегмент этого процесса (flock журнала остается на сегменте)"""
+        fd = self._open_locked(os.O_RDONLY)
+        try:
+            if os.fstat(fd).st_size == 0:
+                os.close(fd)
+                return
+            segment = self.directory / f"{SEGMENT_PREFIX}{time.time_ns()}-{os.getpid()}.jsonl"
+            os.rename(self.journal_path, segment)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._segments[segment] = fd
+
+    def _claim_segments(self) -> List[Path]:
+        """Сегменты этого процесса и перехваченные у завершившихся процессов"""
+        pid = os.getpid()
+        for path in sorted(self.directory.glob(f"{SEGMENT_PREFIX}*.jsonl")):
+            if path in self._segments:
+                continue
+            fd = _lock_segment(path)
+            if fd is None:
+                continue
+            owner = _segment_pid(path)
+            claimed = path.with_name(f"{path.stem.rsplit('-', 1)[0]}-{pid}.jsonl")
+            try:
+                os.rename(path, claimed)
+            except BaseException:
+                os.close(fd)
+                raise
+            self._segments[claimed] = fd
+            logger.info(f"📬 Воспроизведение сегмента очереди сообщений {path.name} (процесс {owner} завершен)")
+            with self._lock:
+                self.replayed_segments += 1
+        return sorted(self._segments)
+
+    def _read_segment(self, path: Path) -> List[Dict[str, Any]]:
+        records = []
+        with open(path, 'rb') as segment:
+            for line in segment:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Оборванная при сбое строка: ответ клиенту по ней не ушел
+                    logger.warning(f"⚠️ Пропущена поврежденная строка в {path.name}")
+                    with self._lock:
+                        self.torn_lines += 1
+        return records
+
+    def _dead_letter(self, record: Dict[str, Any], error: Exception):
+        """Дописать отвергнутое базой сообщение в dead-letter.jsonl"""
+        logger.error(f"Сообщение {record.get('id')} перенесено в {DEAD_LETTER_NAME}: {error}")
+        line = (json.dumps({'record': record, 'error': str(error)}, ensure_ascii=False, default=str) + '\n')
+        fd = os.open(self.directory / DEAD_LETTER_NAME, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, line.encode('utf-8'))
+            if self.fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        with self._lock:
+            self.dead_letters += 1
+
+    def _insert_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Записать пачку; если база ее отвергает, записать по одному сообщению,
+        а отвергнутые перенести в dead-letter. Сбой подключения пробрасывается:
+        сегмент остается на диске до следующей попытки.
+        """
+        try:
+            return ContactMessage.insert_queued(batch)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            raise
+        except (psycopg2.Error, TypeError, ValueError) as e:
+            if len(batch) == 1:
+                self._dead_letter(batch[0], e)
+                return 0
+        inserted = 0
+        for record in batch:
+            inserted += self._insert_batch([record])
+        return inserted
+
+    def _write_segment(self, path: Path):
+        records = self._read_segment(path)
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            inserted = self._insert_batch(batch)
+            with self._lock:
+                self.flushed += inserted
+                self.duplicates += len(batch) - inserted
+                self.batches += 1
+        # Сегмент удаляется до снятия блокировки: другой процесс его уже не заберет
+        path.unlink()
+        os.close(self._segments.pop(path))
+
+    def flush(self):
+        """Записать в базу все, что накопилось в журнале и сегментах"""
+        with self._flush_lock:
+            started = time.monotonic()
+            try:
+                if not self.directory.exists():
+                    return
+                if len(self._ids) < self.id_block // 2 and self._ids_pid == os.getpid():
+                    self._refill_ids()
+                self._check_segments_pid()
+                self._rotate()
+                segments = self._claim_segments()
+                errors = []
+                for segment in segments:
+                    try:
+                        self._write_segment(segment)
+                    except Exception as e:
+                        # Остальные сегменты записываются независимо от этого
+                        logger.error(f"Ошибка записи сегмента {segment.name}: {e}")
+                        errors.append(str(e))
+                if segments:
+                    self.last_flush_ms = round((time.monotonic() - started) * 1000, 3)
+                self.last_error = errors[0] if errors else None
+            except Exception as e:
+                # Сегмент остается на диске и будет записан при следующей попытке
+                logger.error(f"Ошибка записи очереди контактных сообщений: {e}")
+                self.last_error = str(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики очереди и объем еще не записанных данных на диске"""
+        queued_bytes = 0
+        if self.directory.exists():
+            for path in self.directory.glob('*.jsonl'):
+                if path.name == DEAD_LETTER_NAME:
+                    continue
+                try:
+                    queued_bytes += path.stat().st_size
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            return {
+                'batch_size': self.batch_size,
+                'flush_interval_seconds': self.flush_interval,
+                'submitted': self.submitted,
+                'flushed': self.flushed,
+                'duplicates': self.duplicates,
+                'batches': self.batches,
+                'replayed_segments': self.replayed_segments,
+                'torn_lines': self.torn_lines,
+                'dead_letters': self.dead_letters,
+                'queued_bytes': queued_bytes,
+                'reserved_ids': len(self._ids),
+                'last_flush_ms': self.last_flush_ms,
+                'last_error': self.last_error
+            }
+
+# Глобальная очередь контактных сообщений
+contact_queue = ContactQueue(
+    config.CONTACT_QUEUE_DIR,
+    batch_size=config.CONTACT_BATCH_SIZE,
+    flush_interval=config.CONTACT_FLUSH_INTERVAL,
+    id_block=config.CONTACT_ID_BLOCK,
+    fsync=config.CONTACT_QUEUE_FSYNC
+)
@@ -3,16 +3,311 @@
 """
 
 import os
+import re
+import time
 import logging
+import threading
+import itertools
+from enum import Enum
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor, execute_values
 from contextlib import contextmanager
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, Union
 
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+class StatementKind(Enum):
+    """Тип SQL-запроса: определяет, как выполнять запрос и забирать результат"""
+    SELECT = 'select'
+    WRITE = 'write'
+
+@lru_cache(maxsize=512)
+def detect_statement_kind(query: str) -> StatementKind:
+    """Определить тип запроса по тексту (результат кэшируется для каждого текста)"""
+    if query.lstrip().upper().startswith('SELECT'):
+        return StatementKind.SELECT
+    return StatementKind.WRITE
+
+_statement_ids = itertools.count(1)
+_PLACEHOLDER_RE = re.compile(r'%%|%s|%\(')
+
+class Statement:
+    """
+    Фиксированный SQL-запрос модели с явным типом.
+    На каждом подключении один раз выполняется PREPARE, дальше — только EXECUTE.
+    """
+
+    __slots__ = ('sql', 'kind', 'name', 'prepare_sql', 'execute_sql')
+
+    def __init__(self, sql: str, kind: StatementKind = StatementKind.SELECT):
+        self.sql = sql
+        self.kind = kind
+        self.name = f"hh_stmt_{next(_statement_ids)}"
+
+        param_count = 0
+        def replace(match):
+            nonlocal param_count
+            token = match.group(0)
+            if token == '%%':
+                return token
+            if token == '%(':
+                raise ValueError("Именованные параметры не поддерживаются в Statement")
+            param_count += 1
+            return f"${param_count}"
+
+        self.prepare_sql = f"PREPARE {self.name} AS {_PLACEHOLDER_RE.sub(replace, sql)}"
+        if param_count:
+            self.execute_sql = f"EXECUTE {self.name} ({', '.join(['%s'] * param_count)})"
+        else:
+            self.execute_sql = f"EXECUTE {self.name}"
+
+    def __repr__(self) -> str:
+        return f"<Statement {self.name} {self.kind.value}>"
+
+class CachingConnection(extensions.connection):
+    """Подключение psycopg2 с кэшем подготовленных на нем запросов"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+        # После ошибки неизвестно, какие PREPARE успели выполниться
+        self.prepared_dirty = False
+
+class PoolTimeout(Exception):
+    """Не удалось получить подключение из пула за отведенное время"""
+
+class _PooledConnection:
+    """Подключение из пула вместе с его служебными метаданными"""
+
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+class ConnectionPool:
+    """Потокобезопасный ограниченный пул подключений к PostgreSQL"""
+
+    def __init__(self, connect: Callable[[], Any], min_size: int = 1, max_size: int = 10,
+                 timeout: float = 10.0, recycle: float = 1800.0, max_idle: float = 300.0,
+                 pre_ping: bool = True, ping_interval: float = 30.0):
+        if max_size < 1:
+            raise ValueError("Размер пула должен быть не меньше 1")
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.max_idle = max_idle
+        self.pre_ping = pre_ping
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._pid = os.getpid()
+
+        # Статистика
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def _check_pid(self):
+        """Сбросить состояние пула, унаследованное от родительского процесса после fork"""
+        if self._pid != os.getpid():
+            # Подключения родителя не закрываем: их сокеты все еще используются им
+            self._idle.clear()
+            self._size = 0
+            self._in_use = 0
+            self._waiting = 0
+            self._pid = os.getpid()
+
+    def _new_connection(self) -> _PooledConnection:
+        conn = self._connect()
+        conn.autocommit = True
+        self._created += 1
+        return _PooledConnection(conn)
+
+    def _close_entry(self, entry: _PooledConnection):
+        self._discarded += 1
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, entry: _PooledConnection, now: float) -> bool:
+        """Проверить, что подключение живое и не устарело"""
+        if entry.conn.closed:
+            return False
+        if self.recycle and now - entry.created_at > self.recycle:
+            return False
+        if self.pre_ping and now - entry.last_used > self.ping_interval:
+            try:
+                with entry.conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            except Exception:
+                logger.warning("Подключение из пула не прошло проверку, пересоздаем")
+                return False
+        return True
+
+    def acquire(self) -> _PooledConnection:
+        """Получить подключение из пула"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            entry = None
+            create = False
+            with self._cond:
+                self._check_pid()
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"Нет свободных подключений в пуле за {self.timeout} с "
+                            f"(занято {self._in_use} из {self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    entry = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+                self._in_use += 1
+
+            # Сетевые операции выполняем вне блокировки
+            try:
+                if create:
+                    entry = self._new_connection()
+                elif not self._is_usable(entry, time.monotonic()):
+                    self._close_entry(entry)
+                    entry = self._new_connection()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._checkouts += 1
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+            return entry
+
+    def release(self, entry: _PooledConnection, discard: bool = False):
+        """Вернуть подключение в пул"""
+        conn = entry.conn
+        now = time.monotonic()
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if not conn.autocommit:
+                    conn.autocommit = True
+            except Exception:
+                discard = True
+        if conn.closed or (self.recycle and now - entry.created_at > self.recycle):
+            discard = True
+
+        with self._cond:
+            if self._pid != os.getpid():
+                # Подключение получено до fork в другом процессе
+                return
+            self._in_use -= 1
+            if discard:
+                self._size -= 1
+            else:
+                entry.last_used = now
+                self._idle.append(entry)
+            expired = self._collect_idle(now)
+            self._cond.notify()
+
+        if discard:
+            self._close_entry(entry)
+        for stale in expired:
+            self._close_entry(stale)
+
+    def _collect_idle(self, now: float) -> List[_PooledConnection]:
+        """Отобрать простаивающие сверх min_size подключения (вызывается под блокировкой)"""
+        expired = []
+        if not self.max_idle:
+            return expired
+        # Самые старые по использованию подключения находятся в начале очереди
+        while self._idle and self._size > self.min_size and now - self._idle[0].last_used > self.max_idle:
+            expired.append(self._idle.popleft())
+            self._size -= 1
+        return expired
+
+    def warm(self):
+        """Заранее открыть min_size подключений"""
+        entries = []
+        try:
+            for _ in range(self.min_size):
+                entries.append(self.acquire())
+        finally:
+            for entry in entries:
+                self.release(entry)
+
+    def close(self):
+        """Закрыть все простаивающие подключения"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for entry in idle:
+            self._close_entry(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика пула"""
+        with self._cond:
+            return {
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'connections_created': self._created,
+                'connections_discarded': self._discarded,
+                'wait_time_total_ms': round(self._wait_time_total * 1000, 3),
+                'wait_time_avg_ms': round(self._wait_time_total * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+                'wait_time_max_ms': round(self._wait_time_max * 1000, 3)
+            }
+
+class _UnitOfWork:
+    """Состояние текущей транзакции: подключение берется из пула при первом запросе"""
+
+    __slots__ = ('entry', 'failed', 'broken', 'after_commit')
+
+    def __init__(self):
+        self.entry = None
+        self.failed = False
+        self.broken = False
+        self.after_commit: List[Callable[[], None]] = []
+
+# Активная транзакция текущего запроса (у каждого потока свой контекст)
+_current_unit_of_work: ContextVar[Optional[_UnitOfWork]] = ContextVar('current_unit_of_work', default=None)
+
 class DatabaseManager:
     """Менеджер базы данных"""
     
@@ -24,181 +319,310 @@ class DatabaseManager:
             'password': config.DB_PASSWORD,
             'port': config.DB_PORT
         }
+        self.use_prepared_statements = config.DB_PREPARED_STATEMENTS
+        self.pool = ConnectionPool(
+            self._connect,
+            min_size=config.DB_POOL_MIN_SIZE,
+            max_size=config.DB_POOL_MAX_SIZE,
+            timeout=config.DB_POOL_TIMEOUT,
+            recycle=config.DB_POOL_RECYCLE,
+            max_idle=config.DB_POOL_MAX_IDLE,
+            pre_ping=config.DB_POOL_PRE_PING,
+            ping_interval=config.DB_POOL_PING_INTERVAL
+        )
+
+    def _connect(self):
+        """Открыть новое физическое подключение"""
+        return psycopg2.connect(connection_factory=CachingConnection, **self.connection_params)
     
     @contextmanager
     def get_connection(self):
-        """Контекстный менеджер для подключения к БД"""
-        conn = None
+        """Контекстный менеджер для подключения к БД из пула"""
+        uow = _current_unit_of_work.get()
+        if uow is not None:
+            with self._unit_of_work_connection(uow) as conn:
+                yield conn
+            return
+
+        entry = self.pool.acquire()
+        discard = False
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            yield conn
+            yield entry.conn
         except Exception as e:
-            if conn:
-                conn.rollback()
+            # Разорванное подключение не возвращаем в пул
+            discard = entry.conn.closed or isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            if not entry.conn.closed:
+                try:
+                    entry.conn.rollback()
+                except Exception:
+                    discard = True
             logger.error(f"Ошибка подключения к БД: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            self.pool.release(entry, discard=discard)
+
+    @contextmanager
+    def _unit_of_work_connection(self, uow: _UnitOfWork):
+        """Подключение активной транзакции; возвращается в пул только при ее завершении"""
+        if uow.entry is None:
+            uow.entry = self.pool.acquire()
+            try:
+                uow.entry.conn.autocommit = False
+            except Exception:
+                self.pool.release(uow.entry, discard=True)
+                uow.entry = None
+                raise
+        try:
+            yield uow.entry.conn
+        except Exception as e:
+            # Транзакция в PostgreSQL после ошибки прерывается, фиксировать ее нельзя
+            uow.failed = True
+            uow.broken = uow.entry.conn.closed or isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            logger.error(f"Ошибка в транзакции: {e}")
+            raise
+
+    @property
+    def in_transaction(self) -> bool:
+        """Выполняется ли код внутри transaction()"""
+        return _current_unit_of_work.get() is not None
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: все запросы внутри блока выполняются на одном подключении
+        и фиксируются одним COMMIT. Вложенные блоки присоединяются к внешнему.
+        """
+        if _current_unit_of_work.get() is not None:
+            yield
+            return
+
+        uow = _UnitOfWork()
+        token = _current_unit_of_work.set(uow)
+        try:
+            yield
+        except BaseException:
+            uow.failed = True
+            raise
+        finally:
+            _current_unit_of_work.reset(token)
+            self._finish_unit_of_work(uow)
+
+    def on_commit(self, callback: Callable[[], None]):
+        """
+        Выполнить callback после успешного COMMIT текущей транзакции
+        (сразу, если транзакции нет). При откате callback не вызывается.
+        """
+        uow = _current_unit_of_work.get()
+        if uow is None:
+            callback()
+        else:
+            uow.after_commit.append(callback)
+
+    def _run_after_commit(self, uow: _UnitOfWork):
+        for callback in uow.after_commit:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Ошибка обработчика после COMMIT: {e}")
+
+    def _finish_unit_of_work(self, uow: _UnitOfWork):
+        """Зафиксировать или откатить транзакцию и вернуть подключение в пул"""
+        if uow.entry is None:
+            if not uow.failed:
+                self._run_after_commit(uow)
+            return
+        conn = uow.entry.conn
+        discard = uow.broken
+        try:
+            if not discard:
+                if uow.failed:
+                    conn.rollback()
+                else:
+                    conn.commit()
+        except Exception as e:
+            discard = True
+            logger.error(f"Ошибка завершения транзакции: {e}")
+            if not uow.failed:
+                raise
+        finally:
+            self.pool.release(uow.entry, discard=discard)
+        if not uow.failed:
+            self._run_after_commit(uow)
+
+    def rollback_current(self):
+        """Пометить активную транзакцию для отката при выходе из блока"""
+        uow = _current_unit_of_work.get()
+        if uow is not None:
+            uow.failed = True
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Статистика пула подключений"""
+        return self.pool.stats()
     
-    def execute_query(self, query: str, params: Optional[tuple] = None, fetch_one: bool = False, fetch_all: bool = True):
+    def _execute(self, conn, cursor, query: Union[str, Statement], params: tuple):
+        """Выполнить запрос, используя подготовленный запрос подключения, если это возможно"""
+        if not isinstance(query, Statement):
+            cursor.execute(query, params)
+            return
+
+        cache = getattr(conn, 'prepared_statements', None)
+        if not self.use_prepared_statements or cache is None:
+            cursor.execute(query.sql, params)
+            return
+
+        # PREPARE и EXECUTE уходят на сервер одним сообщением
+        parts = []
+        if conn.prepared_dirty:
+            parts.append("DEALLOCATE ALL")
+        if conn.prepared_dirty or query.name not in cache:
+            parts.append(query.prepare_sql)
+        parts.append(query.execute_sql)
+
+        try:
+            cursor.execute('; '.join(parts), params)
+        except Exception:
+            conn.prepared_dirty = True
+            raise
+
+        if conn.prepared_dirty:
+            cache.clear()
+            conn.prepared_dirty = False
+        cache.add(query.name)
+    
+    def execute_query(self, query: Union[str, Statement], params: Optional[tuple] = None,
+                      fetch_one: bool = False, fetch_all: bool = True,
+                      kind: Optional[StatementKind] = None):
         """Выполнить SQL запрос"""
+        if isinstance(query, Statement):
+            kind = query.kind
+        elif kind is None:
+            kind = detect_statement_kind(query)
+
         with self.get_connection() as conn:
             cursor = conn.cursor(cursor_factory=RealDictCursor)
             try:
-                cursor.execute(query, params or ())
+                self._execute(conn, cursor, query, params or ())
                 
-                if query.strip().upper().startswith(('SELECT',)):
+                if kind is StatementKind.SELECT:
                     if fetch_one:
                         return cursor.fetchone()
                     elif fetch_all:
                         return cursor.fetchall()
                 else:
-                    conn.commit()
+                    if not self.in_transaction:
+                        conn.commit()
                     if cursor.description is None:
                         return None
                     return cursor.fetchone() if fetch_one else cursor.fetchall()
                     
             except Exception as e:
-                conn.rollback()
+                if not self.in_transaction:
+                    conn.rollback()
                 logger.error(f"Ошибка выполнения запроса: {e}")
                 raise
             finally:
                 cursor.close()
 
+    def fetch_rows(self, query: Union[str, Statement],
+                   params: Optional[tuple] = None) -> Tuple[Tuple[str, ...], List[tuple]]:
+        """Выполнить SELECT обычным курсором: (имена колонок, строки-кортежи)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                self._execute(conn, cursor, query, params or ())
+                columns = tuple(column.name for column in cursor.description)
+                return columns, cursor.fetchall()
+            except Exception as e:
+                if not self.in_transaction:
+                    conn.rollback()
+                logger.error(f"Ошибка выполнения запроса: {e}")
+                raise
+            finally:
+                cursor.close()
+
+    def execute_values(self, query: str, rows: List[tuple], template: Optional[str] = None,
+                       fetch: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Вставить пачку строк одним многострочным VALUES (плейсхолдер %s в запросе)"""
+        if not rows:
+            return [] if fetch else None
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            try:
+                result = execute_values(cursor, query, rows, template=template,
+                                        page_size=len(rows), fetch=fetch)
+                if not self.in_transaction:
+                    conn.commit()
+                return result if fetch else None
+            except Exception as e:
+                if not self.in_transaction:
+                    conn.rollback()
+                logger.error(f"Ошибка пакетной вставки: {e}")
+                raise
+            finally:
+                cursor.close()
+
 # Глобальный экземпляр менеджера БД
 db_manager = DatabaseManager()
 
 def init_database():
-    """Инициализация структуры базы данных"""
+    """Инициализация структуры базы данных (применяет все версионные миграции)"""
+    from .migrations import migrate
+
     try:
-        logger.info("🔧 Создание таблиц базы данных...")
-        
-        # Таблица контактных сообщений
-        db_manager.execute_query("""
-            CREATE TABLE IF NOT EXISTS contact_messages (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                email TEXT NOT NULL,
-                message TEXT NOT NULL,
-                phone TEXT,
-                company TEXT,
-                service_type TEXT,
-                language TEXT DEFAULT 'ru',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
-            )
-        """)
-        
-        # Таблица пользователей
-        db_manager.execute_query("""
-            CREATE TABLE IF NOT EXISTS users (
-                id SERIAL PRIMARY KEY,
-                username TEXT NOT NULL UNIQUE,
-                email TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL,
-                full_name TEXT,
-                role TEXT DEFAULT 'user',
-                language TEXT DEFAULT 'ru',
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
-            )
-        """)
-        
-        # Таблица вакансий
-        db_manager.execute_query("""
-            CREATE TABLE IF NOT EXISTS jobs (
-                id SERIAL PRIMARY KEY,
-                title TEXT NOT NULL,
-                description TEXT NOT NULL,
-                requirements TEXT,
-                salary_min INTEGER,
-                salary_max INTEGER,
-                location TEXT,
-                employment_type TEXT,
-                experience_level TEXT,
-                industry TEXT,
-                company_name TEXT NOT NULL,
-                contact_email TEXT NOT NULL,
-                contact_phone TEXT,
-                is_active BOOLEAN DEFAULT TRUE,
-                featured BOOLEAN DEFAULT FALSE,
-                language TEXT DEFAULT 'ru',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
-            )
-        """)
-        
-        # Таблица кандидатов
-        db_manager.execute_query("""
-            CREATE TABLE IF NOT EXISTS candidates (
-                id SERIAL PRIMARY KEY,
-                full_name TEXT NOT NULL,
-                email TEXT NOT NULL,
-                phone TEXT,
-                resume_url TEXT,
-                skills TEXT[],
-                experience_years INTEGER,
-                current_position TEXT,
-                desired_position TEXT,
-                desired_salary INTEGER,
-                location TEXT,
-                language TEXT DEFAULT 'ru',
-                is_available BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
-            )
-        """)
-        
-        # Таблица приложений к вакансиям
-        db_manager.execute_query("""
-            CREATE TABLE IF NOT EXISTS job_applications (
-                id SERIAL PRIMARY KEY,
-                job_id INTEGER REFERENCES jobs(id) ON DELETE CASCADE,
-                candidate_id INTEGER REFERENCES candidates(id) ON DELETE CASCADE,
-                status TEXT DEFAULT 'pending',
-                cover_letter TEXT,
-                application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                UNIQUE(job_id, candidate_id)
-            )
-        """)
-        
-        # Создание индексов для оптимизации
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_jobs_active ON jobs(is_active)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_jobs_industry ON jobs(industry)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_candidates_available ON candidates(is_available)")
-        db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_contact_messages_created ON contact_messages(created_at DESC)")
-        
+        logger.info("🔧 Применение миграций базы данных...")
+        migrate()
         logger.info("✅ База данных инициализирована успешно")
         
     except Exception as e:
         logger.error(f"❌ Ошибка инициализации БД: {e}")
         raise
 
-def get_db_stats() -> Dict[str, Any]:
+_EXACT_STATS_QUERY = Statement("""
+    SELECT
+        (SELECT COUNT(*) FROM contact_messages) AS contact_messages_count,
+        (SELECT COUNT(*) FROM users) AS users_count,
+        (SELECT COUNT(*) FROM jobs) AS jobs_count,
+        (SELECT COUNT(*) FROM candidates) AS candidates_count,
+        (SELECT COUNT(*) FROM job_applications) AS job_applications_count,
+        (SELECT COUNT(*) FROM jobs WHERE is_active = TRUE) AS active_jobs_count,
+        (SELECT COUNT(*) FROM candidates WHERE is_available = TRUE) AS available_candidates_count
+""", StatementKind.SELECT)
+
+# Оценки планировщика: reltuples таблиц, а для активных вакансий и доступных
+# кандидатов — reltuples частичных индексов с тем же условием (миграция 0003).
+# -1 означает, что объект еще ни разу не анализировался.
+_ESTIMATED_STATS_QUERY = Statement("""
+    SELECT
+        (SELECT reltuples FROM pg_class WHERE oid = to_regclass('contact_messages')) AS contact_messages_count,
+        (SELECT reltuples FROM pg_class WHERE oid = to_regclass('users')) AS users_count,
+        (SELECT reltuples FROM pg_class WHERE oid = to_regclass('jobs')) AS jobs_count,
+        (SELECT reltuples FROM pg_class WHERE oid = to_regclass('candidates')) AS candidates_count,
+        (SELECT reltuples FROM pg_class WHERE oid = to_regclass('job_applications')) AS job_applications_count,
+        (SELECT reltuples FROM pg_class WHERE oid = to_regclass('idx_jobs_active_listing')) AS active_jobs_count,
+        (SELECT reltuples FROM pg_class WHERE oid = to_regclass('idx_candidates_available_listing')) AS available_candidates_count
+""", StatementKind.SELECT)
+
+def collect_db_stats(mode: str = 'estimate') -> Dict[str, Any]:
+    """
+    Статистика базы одним запросом. mode='estimate' читает оценки из pg_class
+    без сканирования таблиц; если оценок еще нет, выполняется точный подсчет.
+    Ошибки не перехватываются.
+    """
+    if mode == 'estimate':
+        result = db_manager.execute_query(_ESTIMATED_STATS_QUERY, fetch_one=True)
+        values = dict(result) if result else {}
+        if values and all(value is not None and value >= 0 for value in values.values()):
+            return {key: int(value) for key, value in values.items()}
+
+    result = db_manager.execute_query(_EXACT_STATS_QUERY, fetch_one=True)
+    return dict(result) if result else {}
+
+def get_db_stats(mode: str = 'exact') -> Dict[str, Any]:
     """Получить статистику базы данных"""
     try:
-        stats = {}
-        
-        # Количество записей в каждой таблице
-        tables = ['contact_messages', 'users', 'jobs', 'candidates', 'job_applications']
-        
-        for table in tables:
-            result = db_manager.execute_query(f"SELECT COUNT(*) as count FROM {table}", fetch_one=True)
-            stats[f"{table}_count"] = result['count'] if result else 0
-        
-        # Активные вакансии
-        result = db_manager.execute_query("SELECT COUNT(*) as count FROM jobs WHERE is_active = TRUE", fetch_one=True)
-        stats['active_jobs_count'] = result['count'] if result else 0
-        
-        # Доступные кандидаты
-        result = db_manager.execute_query("SELECT COUNT(*) as count FROM candidates WHERE is_available = TRUE", fetch_one=True)
-        stats['available_candidates_count'] = result['count'] if result else 0
-        
-        return stats
+        return collect_db_stats(mode)
         
     except Exception as e:
         logger.error(f"Ошибка получения статистики БД: {e}")
-        return {}
\ No newline at end of file
+        return {}
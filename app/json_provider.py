@@ -0,0 +1,83 @@
+"""
+JSON-провайдер Flask на orjson
+
+Даты и время сериализуются в ISO 8601 (как datetime.isoformat()), поэтому
+to_dict() моделей отдает их без предварительного форматирования. Сортировка
+ключей и отступы в режиме отладки — как у стандартного провайдера Flask.
+Без orjson используется стандартный json с тем же форматом дат.
+"""
+
+import uuid
+import decimal
+import dataclasses
+from datetime import date, time
+from typing import Any, Dict
+
+from flask import Response, current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен: без него работает стандартный json
+    orjson = None
+
+def _default(value: Any) -> Any:
+    """Типы, которые json не сериализует сам"""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Провайдер JSON с сериализацией через orjson"""
+
+    default = staticmethod(_default)
+
+    def _options(self) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Особые параметры (separators, cls и т.п.) поддерживает только стандартный json
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode('utf-8')
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def raw_json_response(payload: Dict[str, Any], raw: Dict[str, str]) -> Response:
+    """
+    JSON-ответ, в котором значения raw — готовый JSON (например, собранный Postgres)
+    и вставляются без разбора. Порядок ключей и формат — как у jsonify(); при
+    отступах (режим отладки) готовый JSON разбирается и сериализуется заново.
+    """
+    provider = current_app.json
+    if provider.compact is False or (provider.compact is None and current_app.debug):
+        return provider.response({**payload, **{key: provider.loads(value) for key, value in raw.items()}})
+
+    keys = list(payload) + list(raw)
+    if provider.sort_keys:
+        keys.sort()
+    members = ','.join(
+        f"{provider.dumps(key)}:{raw[key] if key in raw else provider.dumps(payload[key])}" for key in keys
+    )
+    return current_app.response_class(f"{{{members}}}\n", mimetype=provider.mimetype)
@@ -0,0 +1,383 @@
+"""
+Подбор кандидатов под вакансию и вакансий под кандидата
+
+Скоринг идет пакетно по массивам NumPy: навыки всех кандидатов хранятся
+в разреженной матрице (CSR), опыт, зарплата и город — в плоских массивах.
+Пул кандидатов и вакансий загружается из базы целиком и периодически
+перестраивается в фоне (MATCHING_REFRESH_SECONDS), запросы читают готовый снимок.
+"""
+
+import re
+import time
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+import numpy as np
+
+from .config import config
+from .database import db_manager
+from .candidate_import import normalize_skills
+
+logger = logging.getLogger(__name__)
+
+# Веса составляющих итоговой оценки (в сумме 1)
+WEIGHTS = {
+    'skills': 0.5,
+    'experience': 0.2,
+    'salary': 0.15,
+    'location': 0.15,
+}
+
+# Оценка составляющей, когда у кандидата или вакансии нет данных
+UNKNOWN_SCORE = 0.5
+
+# Требуемый опыт (лет) по уровню вакансии; ищется как подстрока experience_level
+EXPERIENCE_LEVELS = (
+    ('intern', 0), ('entry', 0), ('без опыта', 0), ('junior', 1), ('младш', 1),
+    ('middle', 3), ('mid', 3), ('средн', 3), ('senior', 5), ('старш', 5),
+    ('lead', 7), ('ведущ', 7),
+)
+
+REMOTE_MARKERS = ('remote', 'удален', 'удалён', 'kaugtöö')
+
+_MAX_SKILL_WORDS = 3
+_TOKEN_RE = re.compile(r'[\w+#]+(?:[.\-][\w+#]+)*')
+_YEARS_RE = re.compile(r'\d+')
+
+_SELECT_CANDIDATE_POOL = """
+    SELECT id, skills, experience_years, desired_salary, location
+    FROM candidates
+    WHERE is_available = TRUE
+"""
+
+_SELECT_JOB_POOL = """
+    SELECT id, title, requirements, salary_min, salary_max, location, experience_level
+    FROM jobs
+    WHERE is_active = TRUE
+"""
+
+def required_years(experience_level: Optional[str]) -> Optional[float]:
+    """Требуемый опыт по уровню вакансии: число из строки или уровень по ключевому слову"""
+    if not experience_level:
+        return None
+    level = experience_level.lower()
+    match = _YEARS_RE.search(level)
+    if match:
+        return float(match.group())
+    for marker, years in EXPERIENCE_LEVELS:
+        if marker in level:
+            return float(years)
+    return None
+
+def normalize_location(location: Optional[str]) -> Optional[str]:
+    """Город без уточнений после запятой, в нижнем регистре"""
+    if not location:
+        return None
+    city = ' '.join(location.split(',')[0].split()).lower()
+    return city or None
+
+def is_remote(location: Optional[str]) -> bool:
+    """Вакансия допускает удаленную работу"""
+    return bool(location) and any(marker in location.lower() for marker in REMOTE_MARKERS)
+
+class SkillVocabulary:
+    """Словарь навыков: навык -> номер"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.max_words = 1
+
+    def add(self, skill: str) -> int:
+        skill_id = self.ids.get(skill)
+        if skill_id is None:
+            skill_id = self.ids[skill] = len(self.ids)
+            self.max_words = min(max(self.max_words, skill.count(' ') + 1), _MAX_SKILL_WORDS)
+        return skill_id
+
+    def lookup(self, skills: Iterable[str]) -> np.ndarray:
+        """Номера известных навыков из списка"""
+        ids = {self.ids[skill] for skill in normalize_skills(list(skills)) if skill in self.ids}
+        return np.fromiter(sorted(ids), dtype=np.int32, count=len(ids))
+
+    def extract(self, text: Optional[str]) -> np.ndarray:
+        """Найти в свободном тексте навыки из словаря (фразы до трех слов)"""
+        if not text:
+            return np.empty(0, dtype=np.int32)
+        tokens = _TOKEN_RE.findall(text.lower())
+        ids = set()
+        for start in range(len(tokens)):
+            for length in range(1, self.max_words + 1):
+                if start + length > len(tokens):
+                    break
+                skill_id = self.ids.get(' '.join(tokens[start:start + length]))
+                if skill_id is not None:
+                    ids.add(skill_id)
+        return np.fromiter(sorted(ids), dtype=np.int32, count=len(ids))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+class SkillMatrix:
+    """Разреженная матрица строка x навык в формате CSR"""
+
+    def __init__(self, skill_lists: List[np.ndarray]):
+        lengths = np.fromiter((len(skills) for skills in skill_lists), dtype=np.int64, count=len(skill_lists))
+        self.lengths = lengths.astype(np.float32)
+        self.indices = np.concatenate(skill_lists).astype(np.int32) if skill_lists else np.empty(0, dtype=np.int32)
+        self.rows = np.repeat(np.arange(len(skill_lists), dtype=np.int32), lengths)
+
+    def overlap(self, skill_ids: np.ndarray, vocabulary_size: int) -> np.ndarray:
+        """Число общих навыков каждой строки с заданным набором"""
+        lookup = np.zeros(vocabulary_size + 1, dtype=bool)
+        lookup[skill_ids] = True
+        return np.bincount(self.rows[lookup[self.indices]], minlength=len(self.lengths)).astype(np.float32)
+
+class _LocationCodes:
+    """Коды городов: 0 — не указан, -1 — город, которого нет в пуле"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def add(self, location: Optional[str]) -> int:
+        city = normalize_location(location)
+        if city is None:
+            return 0
+        return self.codes.setdefault(city, len(self.codes) + 1)
+
+    def get(self, location: Optional[str]) -> int:
+        city = normalize_location(location)
+        if city is None:
+            return 0
+        return self.codes.get(city, -1)
+
+def _float_array(values: List[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float32)
+
+def _experience_score(years: np.ndarray, required: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.clip(years / required, 0.0, 1.0)
+    score = np.where(required <= 0, 1.0, score)
+    return np.where(np.isnan(years) | np.isnan(required), UNKNOWN_SCORE, score)
+
+def _salary_score(desired: np.ndarray, budget: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.clip(1.0 - (desired - budget) / budget, 0.0, 1.0)
+    return np.where(np.isnan(desired) | np.isnan(budget) | (budget <= 0), UNKNOWN_SCORE, score)
+
+def _location_score(codes: np.ndarray, target: np.ndarray, remote: np.ndarray) -> np.ndarray:
+    score = (codes == target).astype(np.float32)
+    score = np.where((codes == 0) | (target == 0), UNKNOWN_SCORE, score)
+    return np.where(remote, 1.0, score)
+
+def _top_k(scores: np.ndarray, ids: np.ndarray, limit: int) -> np.ndarray:
+    """Позиции limit лучших оценок по убыванию (при равенстве — более новые id)"""
+    if limit < len(scores):
+        threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)
+        tied = tied[np.argsort(-ids[tied], kind='stable')[:limit - len(above)]]
+        candidates = np.concatenate([above, tied])
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((-ids[candidates], -scores[candidates]))
+    return candidates[order]
+
+class CandidatePool:
+    """Доступные кандидаты в виде массивов"""
+
+    def __init__(self, rows: Iterable[Tuple], vocabulary: SkillVocabulary, locations: _LocationCodes):
+        ids, skills, years, salaries, codes = [], [], [], [], []
+        for candidate_id, candidate_skills, experience_years, desired_salary, location in rows:
+            ids.append(candidate_id)
+            skill_ids = {vocabulary.add(skill) for skill in normalize_skills(candidate_skills or [])}
+            skills.append(np.fromiter(skill_ids, dtype=np.int32, count=len(skill_ids)))
+            years.append(experience_years)
+            salaries.append(desired_salary)
+            codes.append(locations.add(location))
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.skills = SkillMatrix(skills)
+        self.years = _float_array(years)
+        self.salaries = _float_array(salaries)
+        self.locations = np.array(codes, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+class JobPool:
+    """Активные вакансии в виде массивов; навыки извлекаются из названия и требований"""
+
+    def __init__(self, rows: Iterable[Tuple], vocabulary: SkillVocabulary, locations: _LocationCodes):
+        ids, skills, required, budgets, codes, remote = [], [], [], [], [], []
+        for job_id, title, requirements, salary_min, salary_max, location, experience_level in rows:
+            ids.append(job_id)
+            skills.append(vocabulary.extract(f"{title or ''}\n{requirements or ''}"))
+            required.append(required_years(experience_level))
+            budgets.append(salary_max or salary_min)
+            codes.append(locations.add(location))
+            remote.append(is_remote(location))
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.skills = SkillMatrix(skills)
+        self.required = _float_array(required)
+        self.budgets = _float_array(budgets)
+        self.locations = np.array(codes, dtype=np.int32)
+        self.remote = np.array(remote, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+class MatchingIndex:
+    """Снимок пулов кандидатов и вакансий с общим словарем навыков и городов"""
+
+    def __init__(self, candidate_rows: Iterable[Tuple], job_rows: Iterable[Tuple]):
+        self.vocabulary = SkillVocabulary()
+        self.locations = _LocationCodes()
+        self.candidates = CandidatePool(candidate_rows, self.vocabulary, self.locations)
+        self.jobs = JobPool(job_rows, self.vocabulary, self.locations)
+        self.built_at = time.monotonic()
+
+    def score_candidates(self, job) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Оценки всех кандидатов пула для вакансии: (итог, составляющие)"""
+        pool = self.candidates
+        job_skills = self.vocabulary.extract(f"{job.title or ''}\n{job.requirements or ''}")
+        if len(job_skills):
+            skills = pool.skills.overlap(job_skills, len(self.vocabulary)) / len(job_skills)
+        else:
+            skills = np.full(len(pool), UNKNOWN_SCORE, dtype=np.float32)
+
+        required = required_years(job.experience_level)
+        budget = job.salary_max or job.salary_min
+        parts = {
+            'skills': skills,
+            'experience': _experience_score(pool.years, np.float32(np.nan if required is None else required)),
+            'salary': _salary_score(pool.salaries, np.float32(np.nan if budget is None else budget)),
+            'location': _location_score(pool.locations, np.int32(self.locations.get(job.location)),
+                                        np.bool_(is_remote(job.location))),
+        }
+        return self._total(parts), parts
+
+    def score_jobs(self, candidate) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Оценки всех активных вакансий для кандидата: (итог, составляющие)"""
+        pool = self.jobs
+        candidate_skills = self.vocabulary.lookup(candidate.skills or [])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skills = pool.skills.overlap(candidate_skills, len(self.vocabulary)) / pool.skills.lengths
+        skills = np.where(pool.skills.lengths == 0, UNKNOWN_SCORE, skills)
+
+        years = np.float32(np.nan if candidate.experience_years is None else candidate.experience_years)
+        desired = np.float32(np.nan if candidate.desired_salary is None else candidate.desired_salary)
+        parts = {
+            'skills': skills,
+            'experience': _experience_score(years, pool.required),
+            'salary': _salary_score(desired, pool.budgets),
+            'location': _location_score(np.int32(self.locations.get(candidate.location)), pool.locations,
+                                        pool.remote),
+        }
+        return self._total(parts), parts
+
+    @staticmethod
+    def _total(parts: Dict[str, np.ndarray]) -> np.ndarray:
+        total = np.zeros(len(parts['skills']), dtype=np.float32)
+        for name, weight in WEIGHTS.items():
+            total += np.float32(weight) * parts[name]
+        return total
+
+    def top_candidates(self, job, limit: int) -> List[Dict[str, Any]]:
+        """limit лучших кандидатов для вакансии: id, оценка и составляющие"""
+        scores, parts = self.score_candidates(job)
+        return self._ranked(self.candidates.ids, scores, parts, limit)
+
+    def top_jobs(self, candidate, limit: int) -> List[Dict[str, Any]]:
+        """limit лучших вакансий для кандидата: id, оценка и составляющие"""
+        scores, parts = self.score_jobs(candidate)
+        return self._ranked(self.jobs.ids, scores, parts, limit)
+
+    @staticmethod
+    def _ranked(ids: np.ndarray, scores: np.ndarray, parts: Dict[str, np.ndarray],
+                limit: int) -> List[Dict[str, Any]]:
+        if not len(ids):
+            return []
+        return [
+            {
+                'id': int(ids[position]),
+                'score': round(float(scores[position]), 4),
+                'breakdown': {name: round(float(values[position]), 4) for name, values in parts.items()}
+            }
+            for position in _top_k(scores, ids, limit)
+        ]
+
+def _fetch_rows(conn, query: str, name: str) -> List[Tuple]:
+    cursor = conn.cursor(name=name)
+    cursor.itersize = 10000
+    try:
+        cursor.execute(query)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+def load_index() -> MatchingIndex:
+    """Построить снимок из базы (оба пула читаются в одной транзакции)"""
+    started = time.monotonic()
+    with db_manager.transaction(), db_manager.get_connection() as conn:
+        candidate_rows = _fetch_rows(conn, _SELECT_CANDIDATE_POOL, 'matching_candidates')
+        job_rows = _fetch_rows(conn, _SELECT_JOB_POOL, 'matching_jobs')
+    index = MatchingIndex(candidate_rows, job_rows)
+    logger.info(
+        f"🎯 Индекс подбора построен: {len(index.candidates)} кандидатов, {len(index.jobs)} вакансий, "
+        f"{len(index.vocabulary)} навыков за {time.monotonic() - started:.2f} с"
+    )
+    return index
+
+class MatchingService:
+    """Хранит текущий снимок и перестраивает его в фоне, когда он устаревает"""
+
+    def __init__(self, refresh_seconds: float = 300.0):
+        self.refresh_seconds = refresh_seconds
+        self._index: Optional[MatchingIndex] = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def get_index(self) -> MatchingIndex:
+        """Текущий снимок; первый вызов строит его синхронно"""
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = load_index()
+                return self._index
+
+        if time.monotonic() - index.built_at > self.refresh_seconds:
+            self._schedule_rebuild()
+        return index
+
+    def refresh(self):
+        """Построить снимок синхронно, если его нет или он устарел"""
+        index = self._index
+        if index is None or time.monotonic() - index.built_at > self.refresh_seconds:
+            self._index = load_index()
+
+    def _schedule_rebuild(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name='matching-rebuild', daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            self._index = load_index()
+        except Exception as e:
+            logger.error(f"Ошибка перестроения индекса подбора: {e}")
+        finally:
+            self._rebuilding = False
+
+    def match_candidates(self, job, limit: int) -> List[Dict[str, Any]]:
+        return self.get_index().top_candidates(job, limit)
+
+    def recommend_jobs(self, candidate, limit: int) -> List[Dict[str, Any]]:
+        return self.get_index().top_jobs(candidate, limit)
+
+# Глобальный сервис подбора
+matching_service = MatchingService(refresh_seconds=config.MATCHING_REFRESH_SECONDS)
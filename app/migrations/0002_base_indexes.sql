@@ -0,0 +1,7 @@
+-- migrate: no-transaction
+-- Исходные индексы; CONCURRENTLY не блокирует запись в большие таблицы
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_active ON jobs(is_active);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_industry ON jobs(industry);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_candidates_available ON candidates(is_available);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_contact_messages_created ON contact_messages(created_at DESC);
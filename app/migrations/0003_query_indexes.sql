@@ -0,0 +1,27 @@
+-- migrate: no-transaction
+-- Индексы под реальные запросы моделей.
+-- Замеры: python benchmarks/bench_indexes.py
+
+-- Job.get_all: is_active = TRUE ORDER BY featured DESC, created_at DESC, id DESC (+ курсор)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_active_listing
+    ON jobs (featured DESC, created_at DESC, id DESC) WHERE is_active = TRUE;
+
+-- Job.get_all с фильтром по отрасли
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_active_industry_listing
+    ON jobs (industry, featured DESC, created_at DESC, id DESC) WHERE is_active = TRUE;
+
+-- Candidate.get_all: is_available = TRUE ORDER BY created_at DESC, id DESC (+ курсор)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_candidates_available_listing
+    ON candidates (created_at DESC, id DESC) WHERE is_available = TRUE;
+
+-- Candidate.get_all: skills && %s
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_candidates_skills
+    ON candidates USING gin (skills);
+
+-- Заявки кандидата (job_id покрыт UNIQUE(job_id, candidate_id))
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_applications_candidate
+    ON job_applications (candidate_id);
+
+-- Индексы по одному булеву столбцу заменены частичными индексами выше
+DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_active;
+DROP INDEX CONCURRENTLY IF EXISTS idx_candidates_available;
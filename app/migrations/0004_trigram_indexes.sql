@@ -0,0 +1,15 @@
+-- migrate: no-transaction
+-- migrate: requires-extension pg_trgm
+-- Trigram-индексы для поиска подстроки (ILIKE '%...%') по местоположению и должности.
+-- Замеры: python benchmarks/bench_indexes.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_candidates_location_trgm
+    ON candidates USING gin (location gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_candidates_desired_position_trgm
+    ON candidates USING gin (desired_position gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_location_trgm
+    ON jobs USING gin (location gin_trgm_ops);
@@ -0,0 +1,11 @@
+-- migrate: no-transaction
+-- Поиск кандидатов: (location IS NULL OR location ILIKE %s) и то же для desired_position.
+-- Частичные индексы по незаполненным полям дают планировщику вторую ветку BitmapOr
+-- к trigram-индексу из 0004, иначе условие с OR по индексу не ищется.
+-- Замеры: python benchmarks/bench_indexes.py
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_candidates_location_null
+    ON candidates (created_at DESC, id DESC) WHERE location IS NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_candidates_desired_position_null
+    ON candidates (created_at DESC, id DESC) WHERE desired_position IS NULL;
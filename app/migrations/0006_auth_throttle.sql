@@ -0,0 +1,13 @@
+-- Корзины ограничения частоты входа и регистрации (AUTH_THROTTLE_BACKEND=postgres).
+-- UNLOGGED: состояние временное, журнал WAL ему не нужен; после сбоя сервера
+-- таблица очищается, и все корзины просто начинаются заново полными.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS auth_throttle (
+    key TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    rate DOUBLE PRECISION NOT NULL,
+    allowed BOOLEAN NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_auth_throttle_updated_at ON auth_throttle (updated_at);
@@ -0,0 +1,25 @@
+-- migrate: no-transaction
+-- Уникальный email кандидата без учета регистра: на нем держится
+-- INSERT ... ON CONFLICT ((lower(email))) в Candidate.create, массовой загрузке
+-- и импорте, по нему же ищет Candidate.get_by_email. Дубликаты проверяются
+-- заранее: иначе CREATE UNIQUE INDEX CONCURRENTLY упадет на середине и
+-- оставит невалидный индекс.
+
+DO $$
+DECLARE
+    duplicates TEXT;
+BEGIN
+    SELECT string_agg(email, ', ') INTO duplicates
+    FROM (
+        SELECT lower(email) AS email FROM candidates GROUP BY lower(email) HAVING COUNT(*) > 1
+        ORDER BY lower(email) LIMIT 10
+    ) d;
+    IF duplicates IS NOT NULL THEN
+        RAISE EXCEPTION 'В candidates повторяются email без учета регистра: %', duplicates
+            USING HINT = 'Объедините или удалите дубликаты кандидатов и повторите миграцию';
+    END IF;
+END
+$$;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_candidates_email_lower_unique
+    ON candidates (lower(email));
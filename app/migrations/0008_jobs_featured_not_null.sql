@@ -0,0 +1,8 @@
+-- jobs.featured участвует в порядке выдачи (featured DESC, created_at DESC, id DESC)
+-- и в курсоре страниц. Строки с NULL шли первыми при DESC и не попадали под
+-- сравнение (featured, created_at, id) < (...), то есть пропадали из страниц.
+
+UPDATE jobs SET featured = FALSE WHERE featured IS NULL;
+
+ALTER TABLE jobs ALTER COLUMN featured SET DEFAULT FALSE;
+ALTER TABLE jobs ALTER COLUMN featured SET NOT NULL;
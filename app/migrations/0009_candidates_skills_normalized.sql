@@ -0,0 +1,18 @@
+-- Навыки кандидатов хранятся так же, как их приводит normalize_skills:
+-- нижний регистр, одиночные пробелы, без пустых значений и повторов (порядок
+-- первого вхождения сохраняется). Раньше так нормализовал только импорт, а
+-- POST /api/candidates и массовая загрузка сохраняли навыки как есть, и
+-- поиск по навыкам (skills && ..., индекс навыков) зависел от регистра.
+
+UPDATE candidates c
+SET skills = n.skills
+FROM (
+    SELECT id, COALESCE(array_agg(skill ORDER BY first_ord) FILTER (WHERE skill <> ''), '{}') AS skills
+    FROM (
+        SELECT c2.id, lower(btrim(regexp_replace(u.item, '\s+', ' ', 'g'))) AS skill, min(u.ord) AS first_ord
+        FROM candidates c2, unnest(c2.skills) WITH ORDINALITY AS u(item, ord)
+        GROUP BY c2.id, 2
+    ) t
+    GROUP BY id
+) n
+WHERE c.id = n.id AND c.skills IS DISTINCT FROM n.skills;
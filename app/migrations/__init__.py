@@ -0,0 +1,272 @@
+"""
+Версионные миграции схемы базы данных
+
+Миграции — это SQL-файлы вида NNNN_описание.sql в этом каталоге, применяются
+по возрастанию номера. Примененные версии хранятся в таблице schema_version.
+Директивы в начале файла:
+    -- migrate: no-transaction            выполнить вне транзакции по одному запросу
+                                          (нужно для CREATE INDEX CONCURRENTLY)
+    -- migrate: requires-extension NAME   пропустить, если расширение недоступно
+                                          на сервере; повторить: upgrade --retry-skipped
+"""
+
+import re
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import psycopg2
+
+from ..config import config
+from ..database import db_manager
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent
+_FILENAME_RE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+_DIRECTIVE_PREFIX = '-- migrate:'
+
+# Ключ advisory lock, чтобы миграции не запускались параллельно из нескольких процессов
+_MIGRATION_LOCK_ID = 7710420501
+
+_CREATE_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        skipped BOOLEAN DEFAULT FALSE NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+    );
+    ALTER TABLE schema_version ADD COLUMN IF NOT EXISTS skipped BOOLEAN DEFAULT FALSE NOT NULL
+"""
+
+_INSERT_VERSION = """
+    INSERT INTO schema_version (version, name, checksum, skipped) VALUES (%s, %s, %s, %s)
+"""
+
+class MigrationError(Exception):
+    """Ошибка применения миграций"""
+
+class Migration:
+    """Один файл миграции"""
+
+    def __init__(self, version: int, name: str, path: Path):
+        self.version = version
+        self.name = name
+        self.path = path
+        self.sql = path.read_text(encoding='utf-8')
+        self.checksum = hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+
+        directives = []
+        for line in self.sql.lstrip().splitlines():
+            if not line.startswith(_DIRECTIVE_PREFIX):
+                break
+            directives.append(line[len(_DIRECTIVE_PREFIX):].split())
+        self.transactional = ['no-transaction'] not in directives
+        self.required_extensions = [
+            name for directive in directives if directive[:1] == ['requires-extension'] for name in directive[1:]
+        ]
+
+    def statements(self) -> List[str]:
+        """Запросы файла по отдельности (для миграций вне транзакции)"""
+        lines = [line for line in self.sql.splitlines() if not line.strip().startswith('--')]
+        statements = []
+        current: List[str] = []
+        in_dollar_quote = False
+        for line in lines:
+            current.append(line)
+            # Внутри $$ ... $$ (тело DO/функции) ';' не завершает запрос
+            if line.count('$$') % 2:
+                in_dollar_quote = not in_dollar_quote
+            if not in_dollar_quote and line.rstrip().endswith(';'):
+                statement = '\n'.join(current).strip().rstrip(';').strip()
+                if statement:
+                    statements.append(statement)
+                current = []
+        tail = '\n'.join(current).strip()
+        if tail:
+            statements.append(tail)
+        return statements
+
+    def __repr__(self) -> str:
+        return f"<Migration {self.version:04d}_{self.name}>"
+
+def discover_migrations() -> List[Migration]:
+    """Найти все файлы миграций, отсортированные по версии"""
+    migrations = []
+    for path in MIGRATIONS_DIR.glob('*.sql'):
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            logger.warning(f"Пропущен файл миграции с некорректным именем: {path.name}")
+            continue
+        migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError("Найдены миграции с одинаковым номером версии")
+    return migrations
+
+def _query_schema_version(query: str) -> Optional[List[tuple]]:
+    """Прочитать schema_version; None, если таблицы еще нет"""
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query)
+            return cursor.fetchall()
+        except psycopg2.errors.UndefinedTable:
+            # Отсутствие таблицы — нормальная ситуация для новой базы, не ошибка подключения
+            if not conn.autocommit:
+                conn.rollback()
+            return None
+        finally:
+            cursor.close()
+
+def get_current_version() -> int:
+    """Текущая версия схемы (0, если миграции еще не применялись)"""
+    rows = _query_schema_version("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return rows[0][0] if rows else 0
+
+def get_applied_migrations() -> List[Dict[str, Any]]:
+    """Список примененных миграций из schema_version"""
+    rows = _query_schema_version(
+        "SELECT version, name, checksum, skipped, applied_at FROM schema_version ORDER BY version"
+    )
+    return [
+        {'version': version, 'name': name, 'checksum': checksum, 'skipped': skipped, 'applied_at': applied_at}
+        for version, name, checksum, skipped, applied_at in rows or []
+    ]
+
+def pending_migrations(current_version: Optional[int] = None) -> List[Migration]:
+    """Миграции, которые еще не применены"""
+    if current_version is None:
+        current_version = get_current_version()
+    return [migration for migration in discover_migrations() if migration.version > current_version]
+
+def _apply(conn, migration: Migration):
+    """Применить одну миграцию на подключении с захваченной блокировкой"""
+    cursor = conn.cursor()
+    try:
+        if migration.required_extensions:
+            cursor.execute(
+                "SELECT name FROM pg_available_extensions WHERE name = ANY(%s)",
+                (migration.required_extensions,)
+            )
+            available = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in migration.required_extensions if name not in available]
+            if missing:
+                logger.warning(
+                    f"⚠️  Миграция {migration.version:04d}_{migration.name} пропущена: "
+                    f"на сервере нет расширений {', '.join(missing)}"
+                )
+                cursor.execute(_INSERT_VERSION, (migration.version, migration.name, migration.checksum, True))
+                return
+
+        if migration.transactional:
+            conn.autocommit = False
+            try:
+                cursor.execute(migration.sql)
+                cursor.execute(_INSERT_VERSION, (migration.version, migration.name, migration.checksum, False))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.autocommit = True
+        else:
+            for statement in migration.statements():
+                cursor.execute(statement)
+            cursor.execute(_INSERT_VERSION, (migration.version, migration.name, migration.checksum, False))
+    except Exception as e:
+        if not migration.transactional:
+            # Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс,
+            # который IF NOT EXISTS при повторном запуске пропустит
+            cursor.execute(
+                "SELECT indexrelid::regclass::text FROM pg_index WHERE NOT indisvalid"
+            )
+            invalid = [row[0] for row in cursor.fetchall()]
+            if invalid:
+                logger.error(f"Невалидные индексы после ошибки, удалите их перед повтором: {', '.join(invalid)}")
+        raise MigrationError(f"Ошибка применения миграции {migration.version:04d}_{migration.name}: {e}") from e
+    finally:
+        cursor.close()
+
+def migrate(target: Optional[int] = None, retry_skipped: bool = False) -> int:
+    """
+    Применить все (или до target) неприменённые миграции; вернуть итоговую версию.
+    retry_skipped — повторить миграции, пропущенные из-за отсутствующих расширений.
+    """
+    migrations = discover_migrations()
+
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (_MIGRATION_LOCK_ID,))
+            try:
+                cursor.execute(_CREATE_VERSION_TABLE)
+
+                if retry_skipped:
+                    cursor.execute("DELETE FROM schema_version WHERE skipped RETURNING version")
+                    retry = {row[0] for row in cursor.fetchall()}
+                    for migration in migrations:
+                        if migration.version in retry:
+                            logger.info(f"🔧 Повтор миграции {migration.version:04d}_{migration.name}...")
+                            _apply(conn, migration)
+
+                cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+                current = cursor.fetchone()[0]
+
+                for migration in migrations:
+                    if migration.version <= current or (target is not None and migration.version > target):
+                        continue
+                    logger.info(f"🔧 Применение миграции {migration.version:04d}_{migration.name}...")
+                    _apply(conn, migration)
+                    current = migration.version
+
+                logger.info(f"✅ Схема базы данных в версии {current}")
+                return current
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (_MIGRATION_LOCK_ID,))
+        finally:
+            cursor.close()
+
+def ensure_schema(auto_migrate: Optional[bool] = None) -> int:
+    """
+    Проверка схемы при старте: одним запросом сравнить версию с последней миграцией.
+    Если схема отстает, применить миграции (MIGRATE_ON_BOOT) или завершиться с ошибкой.
+    """
+    if auto_migrate is None:
+        auto_migrate = config.MIGRATE_ON_BOOT
+
+    current = get_current_version()
+    migrations = discover_migrations()
+    latest = migrations[-1].version if migrations else 0
+
+    if current >= latest:
+        logger.info(f"✅ Схема базы данных актуальна (версия {current})")
+        return current
+
+    if not auto_migrate:
+        raise MigrationError(
+            f"Схема базы данных устарела: версия {current}, требуется {latest}. "
+            f"Выполните python -m app.migrations upgrade"
+        )
+
+    return migrate()
+
+def status() -> List[Dict[str, Any]]:
+    """Состояние всех миграций: применена ли и совпадает ли контрольная сумма"""
+    applied = {row['version']: row for row in get_applied_migrations()}
+    result = []
+    for migration in discover_migrations():
+        row = applied.get(migration.version)
+        result.append({
+            'version': migration.version,
+            'name': migration.name,
+            'applied': row is not None,
+            'skipped': bool(row) and row['skipped'],
+            'applied_at': row['applied_at'].isoformat() if row else None,
+            'checksum_mismatch': bool(row) and row['checksum'] != migration.checksum
+        })
+    return result
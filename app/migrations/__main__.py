@@ -0,0 +1,41 @@
+"""
+CLI миграций: python -m app.migrations [status|upgrade [--target N] [--retry-skipped]]
+"""
+
+import sys
+import logging
+import argparse
+
+from . import migrate, status, MigrationError
+
+def main() -> int:
+    """Точка входа CLI"""
+    parser = argparse.ArgumentParser(description='Миграции схемы базы данных HireHand')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('status', help='Показать состояние миграций')
+    upgrade = subparsers.add_parser('upgrade', help='Применить неприменённые миграции')
+    upgrade.add_argument('--target', type=int, default=None, help='Остановиться на этой версии')
+    upgrade.add_argument('--retry-skipped', action='store_true',
+                         help='Повторить миграции, пропущенные из-за отсутствующих расширений')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        if args.command == 'upgrade':
+            migrate(target=args.target, retry_skipped=args.retry_skipped)
+        else:
+            for item in status():
+                mark = '⏭️ ' if item['skipped'] else ('✅' if item['applied'] else '⏳')
+                warning = ' ⚠️  файл изменен после применения' if item['checksum_mismatch'] else ''
+                print(f"{mark} {item['version']:04d}_{item['name']} {item['applied_at'] or ''}{warning}")
+    except MigrationError as e:
+        logging.getLogger(__name__).error(f"❌ {e}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Базовый класс моделей: компактные строки со __slots__
+
+Строки списков читаются обычным курсором (кортежи, без словаря на строку).
+Для каждого набора колонок запроса один раз генерируется функция, которая
+раскладывает кортеж по слотам модели, а для каждой модели — сериализатор
+to_dict(). Колонки, которых нет среди полей модели, пропускаются; поля,
+которых нет среди колонок, получают значения по умолчанию из __init__.
+"""
+
+import inspect
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Callable, Sequence, TypeVar, Type, Union
+
+from ..database import db_manager, Statement
+
+M = TypeVar('M', bound='Model')
+
+# TIMESTAMP в тексте ровно как datetime.isoformat(): микросекунды только если они есть
+_ISO_TIMESTAMP = (
+    "CASE WHEN date_part('microseconds', {0})::bigint %% 1000000 = 0 "
+    "THEN to_char({0}, 'YYYY-MM-DD\"T\"HH24:MI:SS') "
+    "ELSE to_char({0}, 'YYYY-MM-DD\"T\"HH24:MI:SS.US') END"
+)
+
+class ConflictError(Exception):
+    """Запись не создана: она конфликтует с данными в базе (reason — код причины)"""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+class RenderedPage:
+    """Страница списка, собранная в JSON на стороне Postgres"""
+
+    __slots__ = ('items', 'count', 'has_more', 'last_key', 'last_modified')
+
+    def __init__(self, items: str, count: int, has_more: bool, last_key: Tuple,
+                 last_modified: Optional[datetime]):
+        self.items = items
+        self.count = count
+        self.has_more = has_more
+        self.last_key = last_key
+        self.last_modified = last_modified
+
+def _compile(name: str, source: str, namespace: Dict[str, Any]) -> Callable:
+    """Скомпилировать сгенерированную функцию"""
+    exec(compile(source, f"<{name}>", 'exec'), namespace)
+    return namespace[name.rsplit('.', 1)[-1]]
+
+class Model:
+    """Базовый класс моделей"""
+
+    __slots__ = ()
+
+    # Поля модели (они же слоты и аргументы __init__) в порядке ключей to_dict()
+    FIELDS: Tuple[str, ...] = ()
+    # Поля, в которых NULL из базы заменяется пустым списком
+    LIST_FIELDS: Tuple[str, ...] = ()
+    # Поля TIMESTAMP (для JSON на стороне Postgres)
+    TIMESTAMP_FIELDS: Tuple[str, ...] = ('created_at', 'updated_at')
+
+    # Сообщения для кодов конфликта insert_or_conflict()
+    CONFLICT_MESSAGES: Dict[str, str] = {}
+
+    # Таблица, порядок списка и поля ключа курсора (для render_listing)
+    TABLE = ''
+    LISTING_ORDER = ''
+    CURSOR_FIELDS: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._row_builders = {}
+        if 'to_dict' not in cls.__dict__:
+            cls.to_dict = cls._make_serializer()
+
+    @classmethod
+    def _make_serializer(cls) -> Callable[[Any], Dict[str, Any]]:
+        """Сгенерировать to_dict() по FIELDS"""
+        items = ''.join(f"        {field!r}: self.{field},\n" for field in cls.FIELDS)
+        source = (
+            "def to_dict(self):\n"
+            "    \"\"\"Преобразовать в словарь\"\"\"\n"
+            f"    return {{\n{items}    }}\n"
+        )
+        serializer = _compile(f"{cls.__name__}.to_dict", source, {})
+        serializer.__qualname__ = f"{cls.__name__}.to_dict"
+        return serializer
+
+    @classmethod
+    def row_builder(cls: Type[M], columns: Tuple[str, ...]) -> Callable[[tuple], M]:
+        """Функция кортеж -> экземпляр для данного набора колонок (кэшируется)"""
+        build = cls._row_builders.get(columns)
+        if build is None:
+            build = cls._make_row_builder(columns)
+            cls._row_builders[columns] = build
+        return build
+
+    @classmethod
+    def _make_row_builder(cls, columns: Tuple[str, ...]) -> Callable[[tuple], Any]:
+        fields = set(cls.FIELDS)
+        targets = [f"obj.{column}" if column in fields else '_' for column in columns]
+        parameters = inspect.signature(cls.__init__).parameters
+        namespace: Dict[str, Any] = {'_new': object.__new__, '_cls': cls}
+
+        lines = ["def build(row):", "    obj = _new(_cls)"]
+        if targets:
+            lines.append(f"    {', '.join(targets)}, = row")
+        for field in cls.FIELDS:
+            if field in columns:
+                continue
+            if field in cls.LIST_FIELDS:
+                lines.append(f"    obj.{field} = []")
+            else:
+                namespace[f"_default_{field}"] = parameters[field].default
+                lines.append(f"    obj.{field} = _default_{field}")
+        for field in cls.LIST_FIELDS:
+            if field in columns:
+                lines.append(f"    if obj.{field} is None: obj.{field} = []")
+        lines.append("    return obj")
+
+        return _compile(f"{cls.__name__}.build", '\n'.join(lines) + '\n', namespace)
+
+    @classmethod
+    def from_row(cls: Type[M], columns: Sequence[str], row: tuple) -> M:
+        """Создать экземпляр из строки-кортежа"""
+        return cls.row_builder(tuple(columns))(row)
+
+    @classmethod
+    def from_dict(cls: Type[M], data: Dict[str, Any]) -> M:
+        """Создать экземпляр из словаря"""
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+    @classmethod
+    def insert_or_conflict(cls: Type[M], statement: Statement, params: tuple) -> M:
+        """
+        Выполнить INSERT, который одним запросом возвращает строку с колонкой
+        conflict: NULL и поля созданной записи либо код причины отказа.
+        Код переводится в ConflictError с сообщением из CONFLICT_MESSAGES.
+        """
+        row = db_manager.execute_query(statement, params, fetch_one=True)
+        if row is None:
+            raise Exception(f"Запрос создания {cls.__name__} не вернул строку")
+        if row['conflict'] is not None:
+            raise ConflictError(row['conflict'], cls.CONFLICT_MESSAGES[row['conflict']])
+        return cls.from_dict(row)
+
+    @classmethod
+    def select(cls: Type[M], query: Union[str, Statement], params: Optional[tuple] = None) -> List[M]:
+        """Выполнить SELECT и собрать экземпляры из строк-кортежей"""
+        columns, rows = db_manager.fetch_rows(query, params)
+        build = cls.row_builder(columns)
+        return [build(row) for row in rows]
+
+    @classmethod
+    def select_one(cls: Type[M], query: Union[str, Statement], params: Optional[tuple] = None) -> Optional[M]:
+        """Выполнить SELECT и собрать экземпляр из первой строки"""
+        results = cls.select(query, params)
+        return results[0] if results else None
+
+    @classmethod
+    def _json_expression(cls, field: str) -> str:
+        """Выражение поля, которое row_to_json выводит так же, как to_dict() + JSON-провайдер"""
+        if field in cls.TIMESTAMP_FIELDS:
+            return _ISO_TIMESTAMP.format(field)
+        if field in cls.LIST_FIELDS:
+            return f"coalesce({field}, '{{}}')"
+        return field
+
+    @classmethod
+    def render_listing(cls, where_clause: str, params: Sequence[Any], limit: int, offset: int = 0,
+                       sort_keys: bool = True) -> RenderedPage:
+        """
+        Выбрать limit + 1 строк списка и собрать первые limit из них в JSON-массив
+        на стороне Postgres. Результат — одна строка независимо от размера страницы:
+        сам массив, число элементов, признак продолжения, ключ курсора последнего
+        элемента и самое позднее updated_at. Элементы совпадают с to_dict()
+        в сериализации JSON-провайдера (sort_keys — порядок ключей провайдера).
+        """
+        fields = sorted(cls.FIELDS) if sort_keys else cls.FIELDS
+        document = ', '.join(f"{cls._json_expression(field)} AS {field}" for field in fields)
+        keys = ', '.join(f"(array_agg({field}) FILTER (WHERE _rn = %s))[1]" for field in cls.CURSOR_FIELDS)
+        query = f"""
+            WITH page AS (
+                SELECT {', '.join(cls.FIELDS)}
+                FROM {cls.TABLE}
+                {where_clause}
+                ORDER BY {cls.LISTING_ORDER}
+                LIMIT %s OFFSET %s
+            ), ranked AS (
+                SELECT updated_at, {', '.join(cls.CURSOR_FIELDS)},
+                       row_number() OVER (ORDER BY {cls.LISTING_ORDER}) AS _rn,
+                       (SELECT row_to_json(d) FROM (SELECT {document}) AS d)::text AS _document
+                FROM page
+            )
+            SELECT '[' || coalesce(string_agg(_document, ',' ORDER BY _rn) FILTER (WHERE _rn <= %s), '') || ']',
+                   count(*) FILTER (WHERE _rn <= %s),
+                   count(*) > %s,
+                   max(updated_at) FILTER (WHERE _rn <= %s),
+                   {keys}
+            FROM ranked
+        """
+        query_params = (*params, limit + 1, offset, limit, limit, limit, limit) + (limit,) * len(cls.CURSOR_FIELDS)
+        _, rows = db_manager.fetch_rows(query, query_params)
+        items, count, has_more, last_modified, *last_key = rows[0]
+        return RenderedPage(items, count, has_more, tuple(last_key), last_modified)
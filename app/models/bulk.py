@@ -0,0 +1,90 @@
+"""
+Общие помощники для массового создания записей
+"""
+
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Tuple, Callable, Sequence
+from itertools import islice
+import logging
+
+logger = logging.getLogger(__name__)
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[Tuple[int, List[Any]]]:
+    """Разбить поток строк на пачки; возвращает (индекс первой строки, пачка)"""
+    iterator = iter(rows)
+    offset = 0
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield offset, chunk
+        offset += len(chunk)
+
+def validate_row(data: Any, required: Sequence[str] = (), int_fields: Sequence[str] = (),
+                 bool_fields: Sequence[str] = (), list_fields: Sequence[str] = ()) -> Optional[str]:
+    """Проверить одну входную строку; вернуть текст ошибки или None"""
+    if not isinstance(data, dict):
+        return 'Строка должна быть JSON-объектом'
+
+    missing = [field for field in required if not data.get(field)]
+    if missing:
+        return f"Не заполнены обязательные поля: {', '.join(missing)}"
+
+    for field in int_fields:
+        value = data.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+            return f"Поле {field} должно быть целым числом"
+
+    for field in bool_fields:
+        value = data.get(field)
+        if value is not None and not isinstance(value, bool):
+            return f"Поле {field} должно быть логическим значением"
+
+    for field in list_fields:
+        value = data.get(field)
+        if value is not None and (not isinstance(value, list) or not all(isinstance(item, str) for item in value)):
+            return f"Поле {field} должно быть списком строк"
+
+    return None
+
+def bulk_insert(rows: Iterable[Any], chunk_size: int,
+                validate: Callable[[Any], Optional[str]],
+                insert_chunk: Callable[[List[Tuple[int, Dict[str, Any]]]], Dict[int, Any]]) -> List[Dict[str, Any]]:
+    """
+    Проверить и вставить строки пачками.
+
+    insert_chunk получает список (индекс, данные) прошедших проверку строк и
+    возвращает словарь индекс -> id созданной записи либо текст ошибки.
+    Результат содержит по одной записи на каждую входную строку в исходном порядке.
+    """
+    results = []
+
+    for offset, chunk in chunked(rows, chunk_size):
+        chunk_results: List[Optional[Dict[str, Any]]] = [None] * len(chunk)
+        valid = []
+
+        for position, data in enumerate(chunk):
+            error = validate(data)
+            if error:
+                chunk_results[position] = {'index': offset + position, 'success': False, 'error': error}
+            else:
+                valid.append((offset + position, data))
+
+        outcome: Dict[int, Any] = {}
+        if valid:
+            try:
+                outcome = insert_chunk(valid)
+            except Exception as e:
+                logger.error(f"Ошибка записи пачки строк {offset}-{offset + len(chunk) - 1}: {e}")
+                outcome = {index: 'Ошибка записи в базу данных' for index, _ in valid}
+
+        for index, _ in valid:
+            value = outcome.get(index, 'Строка не была записана')
+            if isinstance(value, str):
+                result = {'index': index, 'success': False, 'error': value}
+            else:
+                result = {'index': index, 'success': True, 'id': value}
+            chunk_results[index - offset] = result
+
+        results.extend(chunk_results)
+
+    return results
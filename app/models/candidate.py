@@ -2,16 +2,95 @@
 Модель кандидата
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable, Tuple
 from datetime import datetime
 import logging
 
-from ..database import db_manager
+from ..config import config
+from ..candidate_import import normalize_skills
+from ..database import db_manager, Statement, StatementKind
+from .base import Model, RenderedPage, ConflictError
+from .bulk import bulk_insert, validate_row
 
 logger = logging.getLogger(__name__)
 
-class Candidate:
+def _contains_pattern(value: str) -> str:
+    """Шаблон ILIKE для поиска подстроки: %, _ и \\ в значении экранируются"""
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+# Вставка с проверкой уникальности email в одном запросе
+# (без учета регистра, индекс idx_candidates_email_lower_unique)
+_INSERT_CANDIDATE = Statement("""
+    WITH inserted AS (
+        INSERT INTO candidates (full_name, email, phone, resume_url, skills, 
+                             experience_years, current_position, desired_position, 
+                             desired_salary, location, language)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT ((lower(email))) DO NOTHING
+        RETURNING id, full_name, email, phone, resume_url, skills, 
+                 experience_years, current_position, desired_position, 
+                 desired_salary, location, language, is_available, 
+                 created_at, updated_at
+    )
+    SELECT CASE WHEN inserted.id IS NULL THEN 'email' END AS conflict, inserted.*
+    FROM (SELECT 1) AS one
+    LEFT JOIN inserted ON TRUE
+""", StatementKind.WRITE)
+
+_SELECT_CANDIDATE_BY_ID = Statement("""
+    SELECT id, full_name, email, phone, resume_url, skills, 
+           experience_years, current_position, desired_position, 
+           desired_salary, location, language, is_available, 
+           created_at, updated_at
+    FROM candidates
+    WHERE id = %s
+""", StatementKind.SELECT)
+
+_SELECT_CANDIDATE_BY_EMAIL = Statement("""
+    SELECT id, full_name, email, phone, resume_url, skills, 
+           experience_years, current_position, desired_position, 
+           desired_salary, location, language, is_available, 
+           created_at, updated_at
+    FROM candidates
+    WHERE lower(email) = lower(%s)
+""", StatementKind.SELECT)
+
+_SELECT_CANDIDATES_BY_IDS = Statement("""
+    SELECT id, full_name, email, phone, resume_url, skills, 
+           experience_years, current_position, desired_position, 
+           desired_salary, location, language, is_available, 
+           created_at, updated_at
+    FROM candidates
+    WHERE id = ANY(%s)
+""", StatementKind.SELECT)
+
+_BULK_INSERT_CANDIDATES = """
+    INSERT INTO candidates (full_name, email, phone, resume_url, skills, 
+                         experience_years, current_position, desired_position, 
+                         desired_salary, location, language)
+    VALUES %s
+    ON CONFLICT ((lower(email))) DO NOTHING
+    RETURNING id, email, skills, is_available, created_at
+"""
+
+class Candidate(Model):
     """Модель кандидата"""
+
+    FIELDS = ('id', 'full_name', 'email', 'phone', 'resume_url', 'skills',
+              'experience_years', 'current_position', 'desired_position',
+              'desired_salary', 'location', 'language', 'is_available',
+              'created_at', 'updated_at')
+    LIST_FIELDS = ('skills',)
+    __slots__ = FIELDS
+
+    CONFLICT_MESSAGES = {'email': 'Кандидат с таким email уже существует'}
+
+    TABLE = 'candidates'
+    LISTING_ORDER = 'created_at DESC, id DESC'
+    CURSOR_FIELDS = ('created_at', 'id')
+
+    REQUIRED_FIELDS = ('full_name', 'email')
     
     def __init__(self, id: Optional[int] = None, full_name: str = "", email: str = "",
                  phone: Optional[str] = None, resume_url: Optional[str] = None,
@@ -38,65 +117,177 @@ class Candidate:
     
     @classmethod
     def create(cls, data: Dict[str, Any]) -> 'Candidate':
-        """Создать нового кандидата"""
+        """Создать нового кандидата одним запросом; занятый email — ConflictError"""
         try:
-            query = """
-                INSERT INTO candidates (full_name, email, phone, resume_url, skills, 
-                                     experience_years, current_position, desired_position, 
-                                     desired_salary, location, language)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id, full_name, email, phone, resume_url, skills, 
-                         experience_years, current_position, desired_position, 
-                         desired_salary, location, language, is_available, 
-                         created_at, updated_at
-            """
-            
-            params = (
-                data.get('full_name'),
-                data.get('email'),
-                data.get('phone'),
-                data.get('resume_url'),
-                data.get('skills', []),
-                data.get('experience_years'),
-                data.get('current_position'),
-                data.get('desired_position'),
-                data.get('desired_salary'),
-                data.get('location'),
-                data.get('language', 'ru')
-            )
-            
-            result = db_manager.execute_query(query, params, fetch_one=True)
+            params = cls._insert_params(data)
+            candidate = cls.insert_or_conflict(_INSERT_CANDIDATE, params)
             
-            if result:
-                logger.info(f"Создан новый кандидат: {result['full_name']}")
-                return cls.from_dict(result)
-            
-            raise Exception("Не удалось создать кандидата")
+            logger.info(f"Создан новый кандидат: {candidate.full_name}")
+            # Индекс навыков (и numpy) импортируется при первом обращении, а не при старте
+            from ..skill_index import skill_index
+            db_manager.on_commit(lambda: skill_index.add(
+                candidate.id, candidate.skills, candidate.is_available, candidate.created_at
+            ))
+            return candidate
             
+        except ConflictError:
+            raise
         except Exception as e:
             logger.error(f"Ошибка создания кандидата: {e}")
             raise
+
+    @staticmethod
+    def _insert_params(data: Dict[str, Any]) -> tuple:
+        """Параметры INSERT в порядке колонок"""
+        return (
+            data.get('full_name'),
+            data.get('email'),
+            data.get('phone'),
+            data.get('resume_url'),
+            normalize_skills(data.get('skills')),
+            data.get('experience_years'),
+            data.get('current_position'),
+            data.get('desired_position'),
+            data.get('desired_salary'),
+            data.get('location'),
+            data.get('language', 'ru')
+        )
+
+    @classmethod
+    def validate_bulk_row(cls, data: Any) -> Optional[str]:
+        """Проверить строку массовой загрузки"""
+        return validate_row(data, required=cls.REQUIRED_FIELDS,
+                            int_fields=('experience_years', 'desired_salary'),
+                            list_fields=('skills',))
+
+    @classmethod
+    def bulk_create(cls, rows: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Массовое создание кандидатов многострочными INSERT; результат по каждой строке.
+        Строки с email, который уже есть в базе или встречался выше во входных данных, отклоняются.
+        """
+        from ..skill_index import skill_index
+
+        def insert_chunk(valid: List[Tuple[int, Dict[str, Any]]]) -> Dict[int, Any]:
+            # Повторы внутри пачки отсекаются здесь, email из базы — ON CONFLICT;
+            # email сравниваются без учета регистра, как в уникальном индексе
+            first_index: Dict[str, int] = {}
+            for index, data in valid:
+                first_index.setdefault(str(data['email']).lower(), index)
+            to_insert = [data for index, data in valid if first_index[str(data['email']).lower()] == index]
+
+            created = db_manager.execute_values(
+                _BULK_INSERT_CANDIDATES, [cls._insert_params(data) for data in to_insert], fetch=True
+            )
+            created_by_email = {row['email'].lower(): row for row in created}
+
+            outcome: Dict[int, Any] = {}
+            for index, data in valid:
+                email = str(data['email']).lower()
+                row = created_by_email.get(email)
+                if row is None or first_index[email] != index:
+                    outcome[index] = 'Кандидат с таким email уже существует'
+                    continue
+                outcome[index] = row['id']
+                db_manager.on_commit(lambda row=row: skill_index.add(
+                    row['id'], row['skills'], row['is_available'], row['created_at']
+                ))
+            return outcome
+
+        results = bulk_insert(rows, chunk_size or config.BULK_CHUNK_SIZE, cls.validate_bulk_row, insert_chunk)
+        logger.info(f"Массовая загрузка кандидатов: создано {sum(1 for r in results if r['success'])} из {len(results)}")
+        return results
+    
+    @classmethod
+    def _listing_filters(cls, available_only: bool, skills: Optional[List[str]],
+                         skills_all: Optional[List[str]], skills_not: Optional[List[str]],
+                         experience_min: Optional[int], location: Optional[str],
+                         desired_position: Optional[str], salary_max: Optional[int],
+                         cursor: Optional[Tuple], limit: int, offset: int) -> Tuple[str, List[Any], int]:
+        """
+        WHERE списка кандидатов, его параметры и смещение. Запросы только по
+        навыкам (и доступности) отвечаются индексом навыков в памяти: тогда
+        WHERE выбирает уже найденную страницу id и перепроверяет условия по
+        навыкам и доступности, так что результат определяет SQL. Навыки в
+        запросе нормализуются так же, как при записи (normalize_skills);
+        кандидат с NULL в skills считается кандидатом без навыков.
+        """
+        skills, skills_all, skills_not = (normalize_skills(value) if value else None
+                                          for value in (skills, skills_all, skills_not))
+        
+        conditions = []
+        params = []
+        
+        if available_only:
+            conditions.append("is_available = TRUE")
+        
+        if skills:
+            conditions.append("skills && %s")
+            params.append(skills)
+        
+        if skills_all:
+            conditions.append("skills @> %s")
+            params.append(skills_all)
+        
+        if skills_not:
+            conditions.append("NOT (COALESCE(skills, '{}') && %s)")
+            params.append(skills_not)
+        
+        if (skills or skills_all or skills_not) and experience_min is None \
+                and not (location or desired_position or salary_max):
+            from ..skill_index import skill_index
+            ids = skill_index.query(any_of=skills or (), all_of=skills_all or (), none_of=skills_not or (),
+                                    available_only=available_only, limit=limit, offset=offset,
+                                    cursor=cursor)
+            if ids is not None:
+                return "WHERE " + " AND ".join(["id = ANY(%s)"] + conditions), [ids] + params, 0
+        
+        if experience_min is not None:
+            conditions.append("experience_years >= %s")
+            params.append(experience_min)
+        
+        if location:
+            conditions.append("(location IS NULL OR location ILIKE %s)")
+            params.append(_contains_pattern(location))
+        
+        if desired_position:
+            conditions.append("(desired_position IS NULL OR desired_position ILIKE %s)")
+            params.append(_contains_pattern(desired_position))
+        
+        if salary_max:
+            conditions.append("(desired_salary IS NULL OR desired_salary <= %s)")
+            params.append(salary_max)
+        
+        if cursor is not None:
+            conditions.append("(created_at, id) < (%s, %s)")
+            params.extend(cursor)
+            offset = 0
+        
+        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return where_clause, params, offset
     
     @classmethod
     def get_all(cls, available_only: bool = True, skills: Optional[List[str]] = None,
-                experience_min: Optional[int] = None, limit: int = 50, offset: int = 0) -> List['Candidate']:
-        """Получить всех кандидатов с фильтрами"""
+                experience_min: Optional[int] = None, limit: int = 50, offset: int = 0,
+                cursor: Optional[Tuple] = None, location: Optional[str] = None,
+                desired_position: Optional[str] = None,
+                salary_max: Optional[int] = None, skills_all: Optional[List[str]] = None,
+                skills_not: Optional[List[str]] = None) -> List['Candidate']:
+        """
+        Получить всех кандидатов с фильтрами.
+        skills — хотя бы один из навыков, skills_all — все навыки, skills_not — ни одного.
+        Запросы только по навыкам (и доступности) отвечаются индексом навыков в памяти.
+        location и desired_position — поиск подстроки без учета регистра,
+        salary_max — верхняя граница желаемой зарплаты; кандидаты с незаполненным
+        полем под эти фильтры проходят.
+        cursor — ключ (created_at, id) последней строки предыдущей страницы;
+        с ним offset не используется.
+        """
         try:
-            conditions = []
-            params = []
-            
-            if available_only:
-                conditions.append("is_available = TRUE")
-            
-            if skills:
-                conditions.append("skills && %s")
-                params.append(skills)
-            
-            if experience_min is not None:
-                conditions.append("experience_years >= %s")
-                params.append(experience_min)
-            
-            where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+            where_clause, params, offset = cls._listing_filters(
+                available_only, skills, skills_all, skills_not, experience_min,
+                location, desired_position, salary_max, cursor, limit, offset
+            )
             
             query = f"""
                 SELECT id, full_name, email, phone, resume_url, skills, 
@@ -105,95 +296,71 @@ class Candidate:
                        created_at, updated_at
                 FROM candidates
                 {where_clause}
-                ORDER BY created_at DESC
+                ORDER BY {cls.LISTING_ORDER}
                 LIMIT %s OFFSET %s
             """
             
             params.extend([limit, offset])
-            results = db_manager.execute_query(query, tuple(params))
-            return [cls.from_dict(row) for row in results]
+            return cls.select(query, tuple(params))
             
         except Exception as e:
             logger.error(f"Ошибка получения кандидатов: {e}")
             return []
     
+    @classmethod
+    def render_page(cls, available_only: bool = True, skills: Optional[List[str]] = None,
+                    experience_min: Optional[int] = None, limit: int = 50, offset: int = 0,
+                    cursor: Optional[Tuple] = None, location: Optional[str] = None,
+                    desired_position: Optional[str] = None,
+                    salary_max: Optional[int] = None, skills_all: Optional[List[str]] = None,
+                    skills_not: Optional[List[str]] = None, sort_keys: bool = True) -> RenderedPage:
+        """
+        Страница кандидатов в JSON, собранном Postgres (фильтры как у get_all).
+        limit — размер страницы; продолжение определяется по лишней строке.
+        """
+        try:
+            where_clause, params, offset = cls._listing_filters(
+                available_only, skills, skills_all, skills_not, experience_min,
+                location, desired_position, salary_max, cursor, limit + 1, offset
+            )
+            return cls.render_listing(where_clause, params, limit, offset, sort_keys=sort_keys)
+            
+        except Exception as e:
+            logger.error(f"Ошибка получения кандидатов: {e}")
+            raise
+    
     @classmethod
     def get_by_id(cls, candidate_id: int) -> Optional['Candidate']:
         """Получить кандидата по ID"""
         try:
-            query = """
-                SELECT id, full_name, email, phone, resume_url, skills, 
-                       experience_years, current_position, desired_position, 
-                       desired_salary, location, language, is_available, 
-                       created_at, updated_at
-                FROM candidates
-                WHERE id = %s
-            """
-            
-            result = db_manager.execute_query(query, (candidate_id,), fetch_one=True)
-            return cls.from_dict(result) if result else None
+            return cls.select_one(_SELECT_CANDIDATE_BY_ID, (candidate_id,))
             
         except Exception as e:
             logger.error(f"Ошибка получения кандидата {candidate_id}: {e}")
             return None
     
+    @classmethod
+    def get_by_ids(cls, candidate_ids: List[int]) -> List['Candidate']:
+        """Получить кандидатов по списку ID в том же порядке (ненайденные пропускаются)"""
+        try:
+            by_id = {candidate.id: candidate
+                     for candidate in cls.select(_SELECT_CANDIDATES_BY_IDS, (list(candidate_ids),))}
+            return [by_id[candidate_id] for candidate_id in candidate_ids if candidate_id in by_id]
+            
+        except Exception as e:
+            logger.error(f"Ошибка получения кандидатов по списку ID: {e}")
+            return []
+    
     @classmethod
     def get_by_email(cls, email: str) -> Optional['Candidate']:
         """Получить кандидата по email"""
         try:
-            query = """
-                SELECT id, full_name, email, phone, resume_url, skills, 
-                       experience_years, current_position, desired_position, 
-                       desired_salary, location, language, is_available, 
-                       created_at, updated_at
-                FROM candidates
-                WHERE email = %s
-            """
-            
-            result = db_manager.execute_query(query, (email,), fetch_one=True)
-            return cls.from_dict(result) if result else None
+            return cls.select_one(_SELECT_CANDIDATE_BY_EMAIL, (email,))
             
         except Exception as e:
             logger.error(f"Ошибка получения кандидата по email {email}: {e}")
             return None
     
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Candidate':
-        """Создать экземпляр из словаря"""
-        return cls(
-            id=data.get('id'),
-            full_name=data.get('full_name', ''),
-            email=data.get('email', ''),
-            phone=data.get('phone'),
-            resume_url=data.get('resume_url'),
-            skills=data.get('skills', []),
-            experience_years=data.get('experience_years'),
-            current_position=data.get('current_position'),
-            desired_position=data.get('desired_position'),
-            desired_salary=data.get('desired_salary'),
-            location=data.get('location'),
-            language=data.get('language', 'ru'),
-            is_available=data.get('is_available', True),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Преобразовать в словарь"""
-        return {
-            'id': self.id,
-            'full_name': self.full_name,
-            'email': self.email,
-            'phone': self.phone,
-            'resume_url': self.resume_url,
-            'skills': self.skills,
-            'experience_years': self.experience_years,
-            'current_position': self.current_position,
-            'desired_position': self.desired_position,
-            'desired_salary': self.desired_salary,
-            'location': self.location,
-            'language': self.language,
-            'is_available': self.is_available,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+    def cursor_key(self) -> Tuple:
+        """Ключ сортировки списка кандидатов для курсора"""
+        return (self.created_at, self.id)
@@ -2,16 +2,67 @@
 Модель контактных сообщений
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 import logging
 
-from ..database import db_manager
+from ..database import db_manager, Statement, StatementKind
+from .base import Model, RenderedPage
 
 logger = logging.getLogger(__name__)
 
-class ContactMessage:
+_INSERT_MESSAGE = Statement("""
+    INSERT INTO contact_messages (name, email, message, phone, company, service_type, language)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    RETURNING id, name, email, message, phone, company, service_type, language, created_at, updated_at
+""", StatementKind.WRITE)
+
+# Блок id из последовательности таблицы (для сообщений очереди)
+_RESERVE_IDS = Statement("""
+    SELECT nextval(pg_get_serial_sequence('contact_messages', 'id')) AS id
+    FROM generate_series(1, %s)
+""", StatementKind.SELECT)
+
+# Повторная запись уже записанного сообщения (воспроизведение очереди) пропускается;
+# created_at и updated_at — время записи (DEFAULT)
+_BULK_INSERT_QUEUED = """
+    INSERT INTO contact_messages (id, name, email, message, phone, company, service_type, language)
+    VALUES %s
+    ON CONFLICT (id) DO NOTHING
+    RETURNING id
+"""
+
+_SELECT_MESSAGES = Statement("""
+    SELECT id, name, email, message, phone, company, service_type, language, created_at, updated_at
+    FROM contact_messages
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s OFFSET %s
+""", StatementKind.SELECT)
+
+_SELECT_MESSAGES_AFTER = Statement("""
+    SELECT id, name, email, message, phone, company, service_type, language, created_at, updated_at
+    FROM contact_messages
+    WHERE (created_at, id) < (%s, %s)
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+""", StatementKind.SELECT)
+
+_SELECT_MESSAGE_BY_ID = Statement("""
+    SELECT id, name, email, message, phone, company, service_type, language, created_at, updated_at
+    FROM contact_messages
+    WHERE id = %s
+""", StatementKind.SELECT)
+
+class ContactMessage(Model):
     """Модель контактного сообщения"""
+
+    FIELDS = ('id', 'name', 'email', 'message', 'phone', 'company', 'service_type',
+              'language', 'created_at', 'updated_at')
+    __slots__ = FIELDS
+
+    TABLE = 'contact_messages'
+    LISTING_ORDER = 'created_at DESC, id DESC'
+    CURSOR_FIELDS = ('created_at', 'id')
     
     def __init__(self, id: Optional[int] = None, name: str = "", email: str = "", 
                  message: str = "", phone: Optional[str] = None, 
@@ -33,12 +84,6 @@ class ContactMessage:
     def create(cls, data: Dict[str, Any]) -> 'ContactMessage':
         """Создать новое контактное сообщение"""
         try:
-            query = """
-                INSERT INTO contact_messages (name, email, message, phone, company, service_type, language)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING id, name, email, message, phone, company, service_type, language, created_at, updated_at
-            """
-            
             params = (
                 data.get('name'),
                 data.get('email'),
@@ -49,7 +94,7 @@ class ContactMessage:
                 data.get('language', 'ru')
             )
             
-            result = db_manager.execute_query(query, params, fetch_one=True)
+            result = db_manager.execute_query(_INSERT_MESSAGE, params, fetch_one=True)
             
             if result:
                 logger.info(f"Создано новое сообщение от {result['name']} ({result['email']})")
@@ -62,67 +107,70 @@ class ContactMessage:
             raise
     
     @classmethod
-    def get_all(cls, limit: int = 100, offset: int = 0) -> List['ContactMessage']:
-        """Получить все контактные сообщения"""
+    def reserve_ids(cls, count: int) -> List[int]:
+        """Зарезервировать count id сообщений"""
+        rows = db_manager.execute_query(_RESERVE_IDS, (count,))
+        return [row['id'] for row in rows]
+    
+    @classmethod
+    def insert_queued(cls, records: List[Dict[str, Any]]) -> int:
+        """
+        Записать сообщения из очереди с заранее выданными id одним многострочным
+        INSERT; created_at — время записи, чтобы страницы по (created_at, id),
+        прочитанные до нее, не пропускали сообщение. Возвращает число записанных
+        (не повторных) строк.
+        """
+        rows = [
+            (record['id'], record.get('name'), record.get('email'), record.get('message'),
+             record.get('phone'), record.get('company'), record.get('service_type'),
+             record.get('language', 'ru'))
+            for record in records
+        ]
+        created = db_manager.execute_values(_BULK_INSERT_QUEUED, rows, fetch=True)
+        return len(created)
+    
+    @classmethod
+    def get_all(cls, limit: int = 100, offset: int = 0, cursor: Optional[Tuple] = None) -> List['ContactMessage']:
+        """
+        Получить все контактные сообщения.
+        cursor — ключ (created_at, id) последней строки предыдущей страницы;
+        с ним offset не используется.
+        """
         try:
-            query = """
-                SELECT id, name, email, message, phone, company, service_type, language, created_at, updated_at
-                FROM contact_messages
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
-            """
-            
-            results = db_manager.execute_query(query, (limit, offset))
-            return [cls.from_dict(row) for row in results]
+            if cursor is not None:
+                return cls.select(_SELECT_MESSAGES_AFTER, (*cursor, limit))
+            return cls.select(_SELECT_MESSAGES, (limit, offset))
             
         except Exception as e:
             logger.error(f"Ошибка получения контактных сообщений: {e}")
             return []
     
+    @classmethod
+    def render_page(cls, limit: int = 100, offset: int = 0, cursor: Optional[Tuple] = None,
+                    sort_keys: bool = True) -> RenderedPage:
+        """
+        Страница сообщений в JSON, собранном Postgres.
+        limit — размер страницы; продолжение определяется по лишней строке.
+        """
+        try:
+            if cursor is not None:
+                return cls.render_listing("WHERE (created_at, id) < (%s, %s)", cursor, limit, sort_keys=sort_keys)
+            return cls.render_listing("", (), limit, offset, sort_keys=sort_keys)
+            
+        except Exception as e:
+            logger.error(f"Ошибка получения контактных сообщений: {e}")
+            raise
+    
     @classmethod
     def get_by_id(cls, message_id: int) -> Optional['ContactMessage']:
         """Получить сообщение по ID"""
         try:
-            query = """
-                SELECT id, name, email, message, phone, company, service_type, language, created_at, updated_at
-                FROM contact_messages
-                WHERE id = %s
-            """
-            
-            result = db_manager.execute_query(query, (message_id,), fetch_one=True)
-            return cls.from_dict(result) if result else None
+            return cls.select_one(_SELECT_MESSAGE_BY_ID, (message_id,))
             
         except Exception as e:
             logger.error(f"Ошибка получения сообщения {message_id}: {e}")
             return None
     
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'ContactMessage':
-        """Создать экземпляр из словаря"""
-        return cls(
-            id=data.get('id'),
-            name=data.get('name', ''),
-            email=data.get('email', ''),
-            message=data.get('message', ''),
-            phone=data.get('phone'),
-            company=data.get('company'),
-            service_type=data.get('service_type'),
-            language=data.get('language', 'ru'),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Преобразовать в словарь"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'message': self.message,
-            'phone': self.phone,
-            'company': self.company,
-            'service_type': self.service_type,
-            'language': self.language,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+    def cursor_key(self) -> Tuple:
+        """Ключ сортировки списка сообщений для курсора"""
+        return (self.created_at, self.id)
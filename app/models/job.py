@@ -2,16 +2,125 @@
 Модели вакансий и заявок
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable, Tuple
 from datetime import datetime
 import logging
 
-from ..database import db_manager
+import psycopg2
+
+from ..config import config
+from ..database import db_manager, Statement, StatementKind
+from .base import Model, RenderedPage, ConflictError
+from .bulk import bulk_insert, validate_row
+from ..cache import job_listing_cache
 
 logger = logging.getLogger(__name__)
 
-class Job:
+_INSERT_JOB = Statement("""
+    INSERT INTO jobs (title, description, requirements, salary_min, salary_max, 
+                    location, employment_type, experience_level, industry, 
+                    company_name, contact_email, contact_phone, featured, language)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING id, title, description, requirements, salary_min, salary_max, 
+             location, employment_type, experience_level, industry, 
+             company_name, contact_email, contact_phone, is_active, 
+             featured, language, created_at, updated_at
+""", StatementKind.WRITE)
+
+_SELECT_JOB_BY_ID = Statement("""
+    SELECT id, title, description, requirements, salary_min, salary_max, 
+           location, employment_type, experience_level, industry, 
+           company_name, contact_email, contact_phone, is_active, 
+           featured, language, created_at, updated_at
+    FROM jobs
+    WHERE id = %s
+""", StatementKind.SELECT)
+
+_SELECT_JOBS_BY_IDS = Statement("""
+    SELECT id, title, description, requirements, salary_min, salary_max, 
+           location, employment_type, experience_level, industry, 
+           company_name, contact_email, contact_phone, is_active, 
+           featured, language, created_at, updated_at
+    FROM jobs
+    WHERE id = ANY(%s)
+""", StatementKind.SELECT)
+
+# Заявка одним запросом: вставка только на активную вакансию от существующего
+# кандидата; conflict — NULL или причина, по которой заявка не создана
+_INSERT_APPLICATION = Statement("""
+    WITH job AS (
+        SELECT id, is_active FROM jobs WHERE id = %s
+    ), candidate AS (
+        SELECT id FROM candidates WHERE id = %s
+    ), inserted AS (
+        INSERT INTO job_applications (job_id, candidate_id, status, cover_letter)
+        SELECT job.id, candidate.id, %s, %s
+        FROM job, candidate
+        WHERE job.is_active
+        ON CONFLICT (job_id, candidate_id) DO NOTHING
+        RETURNING id, job_id, candidate_id, status, cover_letter, application_date, updated_at
+    )
+    SELECT CASE
+               WHEN inserted.id IS NOT NULL THEN NULL
+               WHEN NOT EXISTS (SELECT 1 FROM job) THEN 'job_not_found'
+               WHEN (SELECT is_active FROM job) IS NOT TRUE THEN 'job_inactive'
+               WHEN NOT EXISTS (SELECT 1 FROM candidate) THEN 'candidate_not_found'
+               ELSE 'duplicate'
+           END AS conflict,
+           inserted.*
+    FROM (SELECT 1) AS one
+    LEFT JOIN inserted ON TRUE
+""", StatementKind.WRITE)
+
+# RETURNING не гарантирует порядок строк VALUES: id выдаются заранее вместе с
+# порядковым номером строки пачки (ord) и возвращаются в паре с ним
+_BULK_INSERT_JOBS = """
+    WITH input AS (
+        SELECT nextval(pg_get_serial_sequence('jobs', 'id')) AS id, v.*
+        FROM (VALUES %s) AS v (ord, title, description, requirements, salary_min, salary_max,
+                              location, employment_type, experience_level, industry,
+                              company_name, contact_email, contact_phone, featured, language)
+    ), inserted AS (
+        INSERT INTO jobs (id, title, description, requirements, salary_min, salary_max,
+                          location, employment_type, experience_level, industry,
+                          company_name, contact_email, contact_phone, featured, language)
+        SELECT id, title, description, requirements, salary_min, salary_max,
+               location, employment_type, experience_level, industry,
+               company_name, contact_email, contact_phone, featured, language
+        FROM input
+        RETURNING id
+    )
+    SELECT input.ord, inserted.id FROM inserted JOIN input USING (id)
+"""
+_BULK_INSERT_JOBS_TEMPLATE = (
+    '(%s::integer, %s::text, %s::text, %s::text, %s::integer, %s::integer, %s::text, %s::text, '
+    '%s::text, %s::text, %s::text, %s::text, %s::text, %s::boolean, %s::text)'
+)
+
+_BULK_INSERT_APPLICATIONS = """
+    INSERT INTO job_applications (job_id, candidate_id, status, cover_letter)
+    SELECT v.job_id, v.candidate_id, v.status, v.cover_letter
+    FROM (VALUES %s) AS v (job_id, candidate_id, status, cover_letter)
+    JOIN jobs j ON j.id = v.job_id AND j.is_active = TRUE
+    JOIN candidates c ON c.id = v.candidate_id
+    ON CONFLICT (job_id, candidate_id) DO NOTHING
+    RETURNING id, job_id, candidate_id
+"""
+
+class Job(Model):
     """Модель вакансии"""
+
+    FIELDS = ('id', 'title', 'description', 'requirements', 'salary_min', 'salary_max',
+              'location', 'employment_type', 'experience_level', 'industry',
+              'company_name', 'contact_email', 'contact_phone', 'is_active',
+              'featured', 'language', 'created_at', 'updated_at')
+    __slots__ = FIELDS
+
+    TABLE = 'jobs'
+    LISTING_ORDER = 'featured DESC, created_at DESC, id DESC'
+    CURSOR_FIELDS = ('featured', 'created_at', 'id')
+
+    REQUIRED_FIELDS = ('title', 'description', 'company_name', 'contact_email')
     
     def __init__(self, id: Optional[int] = None, title: str = "", description: str = "",
                  requirements: Optional[str] = None, salary_min: Optional[int] = None,
@@ -45,38 +154,12 @@ class Job:
     def create(cls, data: Dict[str, Any]) -> 'Job':
         """Создать новую вакансию"""
         try:
-            query = """
-                INSERT INTO jobs (title, description, requirements, salary_min, salary_max, 
-                                location, employment_type, experience_level, industry, 
-                                company_name, contact_email, contact_phone, featured, language)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id, title, description, requirements, salary_min, salary_max, 
-                         location, employment_type, experience_level, industry, 
-                         company_name, contact_email, contact_phone, is_active, 
-                         featured, language, created_at, updated_at
-            """
-            
-            params = (
-                data.get('title'),
-                data.get('description'),
-                data.get('requirements'),
-                data.get('salary_min'),
-                data.get('salary_max'),
-                data.get('location'),
-                data.get('employment_type'),
-                data.get('experience_level'),
-                data.get('industry'),
-                data.get('company_name'),
-                data.get('contact_email'),
-                data.get('contact_phone'),
-                data.get('featured', False),
-                data.get('language', 'ru')
-            )
-            
-            result = db_manager.execute_query(query, params, fetch_one=True)
+            params = cls._insert_params(data)
+            result = db_manager.execute_query(_INSERT_JOB, params, fetch_one=True)
             
             if result:
                 logger.info(f"Создана новая вакансия: {result['title']}")
+                cls._listings_changed()
                 return cls.from_dict(result)
             
             raise Exception("Не удалось создать вакансию")
@@ -84,26 +167,97 @@ class Job:
         except Exception as e:
             logger.error(f"Ошибка создания вакансии: {e}")
             raise
+
+    @staticmethod
+    def _insert_params(data: Dict[str, Any]) -> tuple:
+        """Параметры INSERT в порядке колонок"""
+        return (
+            data.get('title'),
+            data.get('description'),
+            data.get('requirements'),
+            data.get('salary_min'),
+            data.get('salary_max'),
+            data.get('location'),
+            data.get('employment_type'),
+            data.get('experience_level'),
+            data.get('industry'),
+            data.get('company_name'),
+            data.get('contact_email'),
+            data.get('contact_phone'),
+            # featured входит в порядок выдачи и курсор: NULL недопустим
+            bool(data.get('featured')),
+            data.get('language', 'ru')
+        )
+
+    @classmethod
+    def validate_bulk_row(cls, data: Any) -> Optional[str]:
+        """Проверить строку массовой загрузки"""
+        return validate_row(data, required=cls.REQUIRED_FIELDS,
+                            int_fields=('salary_min', 'salary_max'),
+                            bool_fields=('featured',))
+
+    @classmethod
+    def bulk_create(cls, rows: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Массовое создание вакансий многострочными INSERT; результат по каждой строке"""
+        def insert_chunk(valid: List[Tuple[int, Dict[str, Any]]]) -> Dict[int, Any]:
+            params = [(position, *cls._insert_params(data)) for position, (_, data) in enumerate(valid)]
+            created = db_manager.execute_values(_BULK_INSERT_JOBS, params,
+                                                template=_BULK_INSERT_JOBS_TEMPLATE, fetch=True)
+            # Строки результата сопоставляются с входными по ord, а не по позиции
+            return {valid[row['ord']][0]: row['id'] for row in created}
+
+        results = bulk_insert(rows, chunk_size or config.BULK_CHUNK_SIZE, cls.validate_bulk_row, insert_chunk)
+        created = sum(1 for r in results if r['success'])
+        if created:
+            cls._listings_changed()
+        logger.info(f"Массовая загрузка вакансий: создано {created} из {len(results)}")
+        return results
+
+    @staticmethod
+    def _listings_changed():
+        """
+        Сбросить кэш списков вакансий после COMMIT текущей транзакции.
+        Вызывается из каждого метода, который создает или изменяет вакансии.
+        """
+        db_manager.on_commit(job_listing_cache.invalidate)
+    
+    @classmethod
+    def _listing_filters(cls, active_only: bool, featured_only: bool, industry: Optional[str],
+                         cursor: Optional[Tuple]) -> Tuple[str, List[Any]]:
+        """WHERE списка вакансий и его параметры"""
+        conditions = []
+        params = []
+        
+        if active_only:
+            conditions.append("is_active = TRUE")
+        
+        if featured_only:
+            conditions.append("featured = TRUE")
+        
+        if industry:
+            conditions.append("industry = %s")
+            params.append(industry)
+        
+        if cursor is not None:
+            conditions.append("(featured, created_at, id) < (%s, %s, %s)")
+            params.extend(cursor)
+        
+        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return where_clause, params
     
     @classmethod
     def get_all(cls, active_only: bool = True, featured_only: bool = False, 
-                industry: Optional[str] = None, limit: int = 50, offset: int = 0) -> List['Job']:
-        """Получить все вакансии с фильтрами"""
+                industry: Optional[str] = None, limit: int = 50, offset: int = 0,
+                cursor: Optional[Tuple] = None) -> List['Job']:
+        """
+        Получить все вакансии с фильтрами.
+        cursor — ключ (featured, created_at, id) последней строки предыдущей страницы;
+        с ним offset не используется.
+        """
         try:
-            conditions = []
-            params = []
-            
-            if active_only:
-                conditions.append("is_active = TRUE")
-            
-            if featured_only:
-                conditions.append("featured = TRUE")
-            
-            if industry:
-                conditions.append("industry = %s")
-                params.append(industry)
-            
-            where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+            where_clause, params = cls._listing_filters(active_only, featured_only, industry, cursor)
+            if cursor is not None:
+                offset = 0
             
             query = f"""
                 SELECT id, title, description, requirements, salary_min, salary_max, 
@@ -112,87 +266,75 @@ class Job:
                        featured, language, created_at, updated_at
                 FROM jobs
                 {where_clause}
-                ORDER BY featured DESC, created_at DESC
+                ORDER BY {cls.LISTING_ORDER}
                 LIMIT %s OFFSET %s
             """
             
             params.extend([limit, offset])
-            results = db_manager.execute_query(query, tuple(params))
-            return [cls.from_dict(row) for row in results]
+            return cls.select(query, tuple(params))
             
         except Exception as e:
             logger.error(f"Ошибка получения вакансий: {e}")
             return []
     
+    @classmethod
+    def render_page(cls, active_only: bool = True, featured_only: bool = False,
+                    industry: Optional[str] = None, limit: int = 50, offset: int = 0,
+                    cursor: Optional[Tuple] = None, sort_keys: bool = True) -> RenderedPage:
+        """
+        Страница вакансий в JSON, собранном Postgres (фильтры как у get_all).
+        limit — размер страницы; продолжение определяется по лишней строке.
+        """
+        try:
+            where_clause, params = cls._listing_filters(active_only, featured_only, industry, cursor)
+            return cls.render_listing(where_clause, params, limit, 0 if cursor is not None else offset,
+                                      sort_keys=sort_keys)
+            
+        except Exception as e:
+            logger.error(f"Ошибка получения вакансий: {e}")
+            raise
+    
     @classmethod
     def get_by_id(cls, job_id: int) -> Optional['Job']:
         """Получить вакансию по ID"""
         try:
-            query = """
-                SELECT id, title, description, requirements, salary_min, salary_max, 
-                       location, employment_type, experience_level, industry, 
-                       company_name, contact_email, contact_phone, is_active, 
-                       featured, language, created_at, updated_at
-                FROM jobs
-                WHERE id = %s
-            """
-            
-            result = db_manager.execute_query(query, (job_id,), fetch_one=True)
-            return cls.from_dict(result) if result else None
+            return cls.select_one(_SELECT_JOB_BY_ID, (job_id,))
             
         except Exception as e:
             logger.error(f"Ошибка получения вакансии {job_id}: {e}")
             return None
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Job':
-        """Создать экземпляр из словаря"""
-        return cls(
-            id=data.get('id'),
-            title=data.get('title', ''),
-            description=data.get('description', ''),
-            requirements=data.get('requirements'),
-            salary_min=data.get('salary_min'),
-            salary_max=data.get('salary_max'),
-            location=data.get('location'),
-            employment_type=data.get('employment_type'),
-            experience_level=data.get('experience_level'),
-            industry=data.get('industry'),
-            company_name=data.get('company_name', ''),
-            contact_email=data.get('contact_email', ''),
-            contact_phone=data.get('contact_phone'),
-            is_active=data.get('is_active', True),
-            featured=data.get('featured', False),
-            language=data.get('language', 'ru'),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
+    def get_by_ids(cls, job_ids: List[int]) -> List['Job']:
+        """Получить вакансии по списку ID в том же порядке (ненайденные пропускаются)"""
+        try:
+            by_id = {job.id: job for job in cls.select(_SELECT_JOBS_BY_IDS, (list(job_ids),))}
+            return [by_id[job_id] for job_id in job_ids if job_id in by_id]
+            
+        except Exception as e:
+            logger.error(f"Ошибка получения вакансий по списку ID: {e}")
+            return []
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Преобразовать в словарь"""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'requirements': self.requirements,
-            'salary_min': self.salary_min,
-            'salary_max': self.salary_max,
-            'location': self.location,
-            'employment_type': self.employment_type,
-            'experience_level': self.experience_level,
-            'industry': self.industry,
-            'company_name': self.company_name,
-            'contact_email': self.contact_email,
-            'contact_phone': self.contact_phone,
-            'is_active': self.is_active,
-            'featured': self.featured,
-            'language': self.language,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    def cursor_key(self) -> Tuple:
+        """Ключ сортировки списка вакансий для курсора"""
+        return (self.featured, self.created_at, self.id)
 
-class JobApplication:
+class JobApplication(Model):
     """Модель заявки на вакансию"""
+
+    FIELDS = ('id', 'job_id', 'candidate_id', 'status', 'cover_letter', 'application_date', 'updated_at')
+    __slots__ = FIELDS
+
+    TIMESTAMP_FIELDS = ('application_date', 'updated_at')
+
+    REQUIRED_FIELDS = ('job_id', 'candidate_id')
+
+    CONFLICT_MESSAGES = {
+        'job_not_found': 'Вакансия не найдена',
+        'job_inactive': 'Вакансия неактивна',
+        'candidate_not_found': 'Кандидат не найден',
+        'duplicate': 'Кандидат уже подал заявку на эту вакансию',
+    }
     
     def __init__(self, id: Optional[int] = None, job_id: int = 0, candidate_id: int = 0,
                  status: str = "pending", cover_letter: Optional[str] = None,
@@ -207,14 +349,11 @@ class JobApplication:
     
     @classmethod
     def create(cls, data: Dict[str, Any]) -> 'JobApplication':
-        """Создать новую заявку"""
+        """
+        Создать новую заявку одним запросом. Отказ — ConflictError с причиной
+        'job_not_found', 'job_inactive', 'candidate_not_found' или 'duplicate'.
+        """
         try:
-            query = """
-                INSERT INTO job_applications (job_id, candidate_id, status, cover_letter)
-                VALUES (%s, %s, %s, %s)
-                RETURNING id, job_id, candidate_id, status, cover_letter, application_date, updated_at
-            """
-            
             params = (
                 data.get('job_id'),
                 data.get('candidate_id'),
@@ -222,39 +361,50 @@ class JobApplication:
                 data.get('cover_letter')
             )
             
-            result = db_manager.execute_query(query, params, fetch_one=True)
+            try:
+                application = cls.insert_or_conflict(_INSERT_APPLICATION, params)
+            except psycopg2.errors.ForeignKeyViolation:
+                # Кандидата удалили между проверкой и вставкой
+                raise ConflictError('candidate_not_found', cls.CONFLICT_MESSAGES['candidate_not_found'])
             
-            if result:
-                logger.info(f"Создана заявка на вакансию {result['job_id']} от кандидата {result['candidate_id']}")
-                return cls.from_dict(result)
-            
-            raise Exception("Не удалось создать заявку")
+            logger.info(f"Создана заявка на вакансию {application.job_id} от кандидата {application.candidate_id}")
+            return application
             
+        except ConflictError:
+            raise
         except Exception as e:
             logger.error(f"Ошибка создания заявки: {e}")
             raise
-    
+
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'JobApplication':
-        """Создать экземпляр из словаря"""
-        return cls(
-            id=data.get('id'),
-            job_id=data.get('job_id', 0),
-            candidate_id=data.get('candidate_id', 0),
-            status=data.get('status', 'pending'),
-            cover_letter=data.get('cover_letter'),
-            application_date=data.get('application_date'),
-            updated_at=data.get('updated_at')
-        )
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Преобразовать в словарь"""
-        return {
-            'id': self.id,
-            'job_id': self.job_id,
-            'candidate_id': self.candidate_id,
-            'status': self.status,
-            'cover_letter': self.cover_letter,
-            'application_date': self.application_date.isoformat() if self.application_date else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+    def validate_bulk_row(cls, data: Any) -> Optional[str]:
+        """Проверить строку массовой загрузки"""
+        return validate_row(data, required=cls.REQUIRED_FIELDS, int_fields=('job_id', 'candidate_id'))
+
+    @classmethod
+    def bulk_create(cls, rows: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Массовое создание заявок. Заявки на неактивные или несуществующие вакансии,
+        несуществующих кандидатов и повторные заявки пропускаются с ошибкой.
+        """
+        def insert_chunk(valid: List[Tuple[int, Dict[str, Any]]]) -> Dict[int, Any]:
+            params = [
+                (data['job_id'], data['candidate_id'], data.get('status', 'pending'), data.get('cover_letter'))
+                for _, data in valid
+            ]
+            created = db_manager.execute_values(
+                _BULK_INSERT_APPLICATIONS, params,
+                template='(%s::integer, %s::integer, %s::text, %s::text)', fetch=True
+            )
+            created_by_pair = {(row['job_id'], row['candidate_id']): row['id'] for row in created}
+
+            outcome = {}
+            for index, data in valid:
+                application_id = created_by_pair.pop((data['job_id'], data['candidate_id']), None)
+                outcome[index] = application_id if application_id is not None else \
+                    'Вакансия неактивна, кандидат не найден или заявка уже существует'
+            return outcome
+
+        results = bulk_insert(rows, chunk_size or config.BULK_CHUNK_SIZE, cls.validate_bulk_row, insert_chunk)
+        logger.info(f"Массовая загрузка заявок: создано {sum(1 for r in results if r['success'])} из {len(results)}")
+        return results
@@ -5,15 +5,67 @@
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import logging
-import hashlib
-import secrets
 
-from ..database import db_manager
+from ..database import db_manager, Statement, StatementKind
+from .base import Model, ConflictError
+from ..password_hashing import password_hasher
+from ..user_cache import user_cache
 
 logger = logging.getLogger(__name__)
 
-class User:
+# Вставка с проверкой уникальности в одном запросе: conflict — NULL
+# или поле, по которому пользователь уже существует
+_INSERT_USER = Statement("""
+    WITH inserted AS (
+        INSERT INTO users (username, email, password_hash, full_name, role, language)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT DO NOTHING
+        RETURNING id, username, email, password_hash, full_name, role, language, is_active, created_at, updated_at
+    )
+    SELECT CASE
+               WHEN inserted.id IS NOT NULL THEN NULL
+               WHEN EXISTS (SELECT 1 FROM users WHERE username = %s) THEN 'username'
+               WHEN EXISTS (SELECT 1 FROM users WHERE email = %s) THEN 'email'
+               ELSE 'duplicate'
+           END AS conflict,
+           inserted.*
+    FROM (SELECT 1) AS one
+    LEFT JOIN inserted ON TRUE
+""", StatementKind.WRITE)
+
+# Дешевая проверка занятости до хеширования пароля: повторная регистрация
+# не должна тратить PBKDF2 в пуле хеширования. Гонку закрывает ON CONFLICT выше
+_SELECT_USER_CONFLICT = Statement("""
+    SELECT CASE
+               WHEN EXISTS (SELECT 1 FROM users WHERE username = %s) THEN 'username'
+               WHEN EXISTS (SELECT 1 FROM users WHERE email = %s) THEN 'email'
+           END AS conflict
+""", StatementKind.SELECT)
+
+_SELECT_USER_BY_USERNAME = Statement("""
+    SELECT id, username, email, password_hash, full_name, role, language, is_active, created_at, updated_at
+    FROM users
+    WHERE username = %s AND is_active = TRUE
+""", StatementKind.SELECT)
+
+_SELECT_USER_BY_EMAIL = Statement("""
+    SELECT id, username, email, password_hash, full_name, role, language, is_active, created_at, updated_at
+    FROM users
+    WHERE email = %s AND is_active = TRUE
+""", StatementKind.SELECT)
+
+class User(Model):
     """Модель пользователя"""
+
+    FIELDS = ('id', 'username', 'email', 'password_hash', 'full_name', 'role',
+              'language', 'is_active', 'created_at', 'updated_at')
+    __slots__ = FIELDS
+
+    CONFLICT_MESSAGES = {
+        'username': 'Пользователь с таким username уже существует',
+        'email': 'Пользователь с таким email уже существует',
+        'duplicate': 'Пользователь с таким username или email уже существует',
+    }
     
     def __init__(self, id: Optional[int] = None, username: str = "", email: str = "",
                  password_hash: str = "", full_name: Optional[str] = None,
@@ -32,49 +84,47 @@ class User:
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Хеширование пароля"""
-        salt = secrets.token_hex(16)
-        pwdhash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), 100000)
-        return salt + pwdhash.hex()
+        """Хеширование пароля (в пуле процессов)"""
+        return password_hasher.hash(password)
     
     @staticmethod
     def verify_password(stored_password: str, provided_password: str) -> bool:
-        """Проверка пароля"""
-        salt = stored_password[:32]
-        stored_pwdhash = stored_password[32:]
-        pwdhash = hashlib.pbkdf2_hmac('sha256', provided_password.encode('utf-8'), salt.encode('utf-8'), 100000)
-        return pwdhash.hex() == stored_pwdhash
+        """Проверка пароля (в пуле процессов)"""
+        return password_hasher.verify(stored_password, provided_password)
     
     @classmethod
     def create(cls, data: Dict[str, Any]) -> 'User':
-        """Создать нового пользователя"""
+        """
+        Создать нового пользователя одним запросом.
+        Занятые username или email — ConflictError с причиной 'username'/'email'.
+        """
         try:
+            row = db_manager.execute_query(_SELECT_USER_CONFLICT, (data.get('username'), data.get('email')),
+                                           fetch_one=True)
+            if row and row['conflict'] is not None:
+                raise ConflictError(row['conflict'], cls.CONFLICT_MESSAGES[row['conflict']])
+            
             # Хеширование пароля
             password_hash = cls.hash_password(data['password'])
             
-            query = """
-                INSERT INTO users (username, email, password_hash, full_name, role, language)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING id, username, email, password_hash, full_name, role, language, is_active, created_at, updated_at
-            """
-            
             params = (
                 data.get('username'),
                 data.get('email'),
                 password_hash,
                 data.get('full_name'),
                 data.get('role', 'user'),
-                data.get('language', 'ru')
+                data.get('language', 'ru'),
+                data.get('username'),
+                data.get('email')
             )
             
-            result = db_manager.execute_query(query, params, fetch_one=True)
-            
-            if result:
-                logger.info(f"Создан новый пользователь: {result['username']}")
-                return cls.from_dict(result)
-            
-            raise Exception("Не удалось создать пользователя")
+            user = cls.insert_or_conflict(_INSERT_USER, params)
+            logger.info(f"Создан новый пользователь: {user.username}")
+            cls._user_changed(user.username)
+            return user
             
+        except ConflictError:
+            raise
         except Exception as e:
             logger.error(f"Ошибка создания пользователя: {e}")
             raise
@@ -83,52 +133,38 @@ class User:
     def get_by_username(cls, username: str) -> Optional['User']:
         """Получить пользователя по username"""
         try:
-            query = """
-                SELECT id, username, email, password_hash, full_name, role, language, is_active, created_at, updated_at
-                FROM users
-                WHERE username = %s AND is_active = TRUE
-            """
-            
-            result = db_manager.execute_query(query, (username,), fetch_one=True)
-            return cls.from_dict(result) if result else None
+            return cls.select_one(_SELECT_USER_BY_USERNAME, (username,))
             
         except Exception as e:
             logger.error(f"Ошибка получения пользователя {username}: {e}")
             return None
     
+    @classmethod
+    def get_cached(cls, username: str) -> Optional['User']:
+        """
+        Пользователь по username через кэш процесса (USER_CACHE_TTL).
+        В отличие от get_by_username, ошибка базы не скрывается.
+        """
+        return user_cache.get(username, lambda name: cls.select_one(_SELECT_USER_BY_USERNAME, (name,)))
+    
+    @staticmethod
+    def _user_changed(username: str):
+        """
+        Сбросить кэш и снимки профиля пользователя после COMMIT текущей транзакции.
+        Вызывается из каждого метода, который создает или изменяет пользователей.
+        """
+        db_manager.on_commit(lambda: user_cache.invalidate(username))
+    
     @classmethod
     def get_by_email(cls, email: str) -> Optional['User']:
         """Получить пользователя по email"""
         try:
-            query = """
-                SELECT id, username, email, password_hash, full_name, role, language, is_active, created_at, updated_at
-                FROM users
-                WHERE email = %s AND is_active = TRUE
-            """
-            
-            result = db_manager.execute_query(query, (email,), fetch_one=True)
-            return cls.from_dict(result) if result else None
+            return cls.select_one(_SELECT_USER_BY_EMAIL, (email,))
             
         except Exception as e:
             logger.error(f"Ошибка получения пользователя по email {email}: {e}")
             return None
     
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'User':
-        """Создать экземпляр из словаря"""
-        return cls(
-            id=data.get('id'),
-            username=data.get('username', ''),
-            email=data.get('email', ''),
-            password_hash=data.get('password_hash', ''),
-            full_name=data.get('full_name'),
-            role=data.get('role', 'user'),
-            language=data.get('language', 'ru'),
-            is_active=data.get('is_active', True),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
-    
     def to_dict(self, include_password: bool = False) -> Dict[str, Any]:
         """Преобразовать в словарь"""
         result = {
@@ -139,8 +175,8 @@ class User:
             'role': self.role,
             'language': self.language,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
         
         if include_password:
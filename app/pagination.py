@@ -0,0 +1,102 @@
+"""
+Keyset (cursor) пагинация для списковых эндпоинтов
+"""
+
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Any, List, Tuple, Sequence, Callable
+
+from .config import config
+
+class InvalidCursor(ValueError):
+    """Курсор поврежден или относится к другому списку"""
+
+class InvalidPageSize(ValueError):
+    """Некорректный размер страницы"""
+
+# Типы полей ключа сортировки для каждого списка
+CURSOR_SCHEMAS = {
+    'jobs': ('bool', 'datetime', 'int'),
+    'candidates': ('datetime', 'int'),
+    'contact_messages': ('datetime', 'int'),
+}
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _decode_value(value: Any, value_type: str) -> Any:
+    if value_type == 'datetime' and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if value_type == 'int' and isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if value_type == 'bool' and isinstance(value, bool):
+        return value
+    raise InvalidCursor("Некорректное значение в курсоре")
+
+def encode_cursor(kind: str, values: Sequence[Any]) -> str:
+    """Закодировать ключ последней строки страницы в непрозрачный токен"""
+    payload = json.dumps([kind, [_encode_value(value) for value in values]], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(kind: str, token: Optional[str]) -> Optional[Tuple]:
+    """Раскодировать токен курсора; None, если курсор не передан"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor_kind, values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise InvalidCursor("Некорректный курсор")
+
+    schema = CURSOR_SCHEMAS[kind]
+    if cursor_kind != kind or not isinstance(values, list) or len(values) != len(schema):
+        raise InvalidCursor("Курсор относится к другому списку")
+    try:
+        return tuple(_decode_value(value, value_type) for value, value_type in zip(values, schema))
+    except ValueError:
+        raise InvalidCursor("Некорректное значение в курсоре")
+
+def parse_limit(value: Any, default: Optional[int] = None, maximum: Optional[int] = None) -> int:
+    """Размер страницы из параметров запроса, ограниченный MAX_PAGE_SIZE"""
+    default = default or config.DEFAULT_PAGE_SIZE
+    maximum = maximum or config.MAX_PAGE_SIZE
+    if value is None or value == '':
+        return min(default, maximum)
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise InvalidPageSize("Параметр limit должен быть целым числом")
+    if limit < 1:
+        raise InvalidPageSize("Параметр limit должен быть больше нуля")
+    return min(limit, maximum)
+
+def parse_offset(value: Any) -> int:
+    """Смещение для обратной совместимости со старыми клиентами"""
+    if value is None or value == '':
+        return 0
+    try:
+        offset = int(value)
+    except (TypeError, ValueError):
+        raise InvalidPageSize("Параметр offset должен быть целым числом")
+    if offset < 0:
+        raise InvalidPageSize("Параметр offset не может быть отрицательным")
+    return offset
+
+def split_page(kind: str, rows: List[Any], limit: int,
+               key: Callable[[Any], Sequence[Any]]) -> Tuple[List[Any], Optional[str]]:
+    """
+    Отрезать страницу из limit + 1 выбранных строк и построить курсор следующей.
+    Лишняя строка нужна только чтобы узнать, есть ли продолжение.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(kind, key(page[-1]))
+
+def rendered_page_cursor(kind: str, page: Any) -> Optional[str]:
+    """Курсор следующей страницы для страницы, собранной Postgres (RenderedPage)"""
+    return encode_cursor(kind, page.last_key) if page.has_more else None
@@ -0,0 +1,184 @@
+"""
+Хеширование паролей (PBKDF2) в отдельном пуле процессов
+
+PBKDF2 на 100 тысяч итераций занимает процессор на десятки миллисекунд и при
+выполнении в потоке запроса держит GIL. Вычисление уходит в пул процессов;
+число одновременно принятых задач ограничено PASSWORD_HASH_QUEUE_SIZE, при
+переполнении запрос сразу получает отказ (PasswordHasherBusy), а не ждет.
+Формат хеша прежний: 32 символа соли (hex) + PBKDF2-SHA256 в hex.
+"""
+
+import os
+import hmac
+import time
+import hashlib
+import logging
+import secrets
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+PBKDF2_ITERATIONS = 100000
+
+class PasswordHasherUnavailable(Exception):
+    """Хеширование не выполнено: таймаут или пул процессов недоступен"""
+
+class PasswordHasherBusy(PasswordHasherUnavailable):
+    """Очередь хеширования заполнена"""
+
+def _pbkdf2_hex(password: str, salt: str, iterations: int) -> str:
+    """PBKDF2-SHA256 (выполняется в процессе пула)"""
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), iterations).hex()
+
+class PasswordHasher:
+    """Пул процессов для PBKDF2 с ограниченной очередью и метриками"""
+
+    def __init__(self, workers: int = 2, queue_size: int = 16, timeout: float = 5.0,
+                 iterations: int = PBKDF2_ITERATIONS):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.iterations = iterations
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._reset_state()
+
+    def _reset_state(self):
+        self._pid = os.getpid()
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._latencies = deque(maxlen=512)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def _check_pid(self):
+        # После fork пул и счетчики родителя недействительны
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._executor = None
+                    self._reset_state()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: процесс приложения многопоточный, fork из него небезопасен
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.info(f"🔐 Пул хеширования паролей: {self.workers} процессов")
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finished(self, started: float, record: bool = True):
+        with self._lock:
+            self.in_flight -= 1
+            if record:
+                self.completed += 1
+                self._latencies.append(time.monotonic() - started)
+        self._slots.release()
+
+    def warm(self):
+        """Запустить процессы пула заранее, чтобы первый вход не ждал их старта"""
+        if self.workers > 0:
+            self._pbkdf2(secrets.token_hex(16), secrets.token_hex(16))
+
+    def _pbkdf2(self, password: str, salt: str) -> str:
+        self._check_pid()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Очередь хеширования паролей заполнена")
+
+        started = time.monotonic()
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        if self.workers <= 0:
+            try:
+                return _pbkdf2_hex(password, salt, self.iterations)
+            finally:
+                self._finished(started)
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_pbkdf2_hex, password, salt, self.iterations)
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._discard_executor(executor)
+            self._finished(started, record=False)
+            with self._lock:
+                self.errors += 1
+            raise PasswordHasherUnavailable(f"Пул хеширования паролей недоступен: {e}")
+
+        # Место в очереди освобождается, когда задача действительно завершилась
+        future.add_done_callback(
+            lambda done: self._finished(started, record=not done.cancelled() and done.exception() is None)
+        )
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeout:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise PasswordHasherUnavailable("Хеширование пароля не уложилось в таймаут")
+        except BrokenProcessPool as e:
+            self._discard_executor(executor)
+            with self._lock:
+                self.errors += 1
+            raise PasswordHasherUnavailable(f"Пул хеширования паролей недоступен: {e}")
+
+    def hash(self, password: str) -> str:
+        """Хеш пароля со случайной солью"""
+        salt = secrets.token_hex(16)
+        return salt + self._pbkdf2(password, salt)
+
+    def verify(self, stored_password: str, provided_password: str) -> bool:
+        """Проверка пароля по сохраненному хешу"""
+        salt = stored_password[:32]
+        return hmac.compare_digest(self._pbkdf2(provided_password, salt), stored_password[32:])
+
+    def stats(self) -> Dict[str, Any]:
+        """Метрики: глубина очереди, задержки (мс), отказы и таймауты"""
+        self._check_pid()
+        with self._lock:
+            latencies = sorted(self._latencies)
+            def percentile(share: float) -> Optional[float]:
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(len(latencies) * share))] * 1000, 1)
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'latency_p50_ms': percentile(0.5),
+                'latency_p95_ms': percentile(0.95),
+                'latency_max_ms': round(latencies[-1] * 1000, 1) if latencies else None
+            }
+
+# Глобальный пул хеширования паролей
+password_hasher = PasswordHasher(
+    workers=config.PASSWORD_HASH_WORKERS,
+    queue_size=config.PASSWORD_HASH_QUEUE_SIZE,
+    timeout=config.PASSWORD_HASH_TIMEOUT
+)
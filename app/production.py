@@ -0,0 +1,171 @@
+"""
+Production-запуск: gunicorn с предварительной загрузкой приложения
+
+Мастер один раз создает приложение (preload), закрывает свои подключения к
+базе и замораживает объекты в сборщике мусора (gc.freeze), чтобы страницы
+памяти с кодом и модулями оставались общими с воркерами после fork.
+Индекс навыков и снимок подбора мастер тоже строит до fork: воркеры получают
+их готовыми (страницы общие до первой записи) и только догружают изменения.
+Перед каждым fork, в том числе при перезапуске воркера, мастер обновляет их,
+если они устарели, так что новый воркер не строит их с нуля.
+Фоновые потоки (индекс навыков, статистика, очередь сообщений) запускаются
+в каждом воркере после fork. Воркеры перезапускаются после WEB_MAX_REQUESTS
+запросов (со случайным разбросом, чтобы не уходить на перезапуск разом).
+
+Пул подключений каждого воркера не больше DB_POOL_MAX_SIZE и доли
+DB_MAX_CONNECTIONS на воркер (одно подключение оставлено мастеру). При HUP
+новые воркеры стартуют раньше, чем завершаются старые, и подключений на время
+перезапуска может быть до двух раз больше.
+
+WEB_TIMEOUT для воркеров gthread ограничивает не длительность запроса, а
+молчание воркера. Но при перезапуске воркера (WEB_MAX_REQUESTS, HUP) начатые
+запросы получают не больше WEB_GRACEFUL_TIMEOUT секунд, поэтому большие
+файлы в production импортируются из командной строки:
+    python -m app.candidate_import candidates.csv --rejects rejects.csv
+
+Управление сигналами мастера gunicorn:
+    HUP   — плавный перезапуск воркеров (текущие запросы дорабатывают
+            WEB_GRACEFUL_TIMEOUT секунд); код приложения при preload
+            не перечитывается
+    USR2  — запустить новый мастер с новым кодом, затем WINCH и QUIT старому
+    TERM  — плавная остановка
+"""
+
+import gc
+import os
+import logging
+from typing import Dict, Any
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+def available_cores() -> int:
+    """Число ядер, доступных процессу (с учетом cgroup/affinity)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def worker_count() -> int:
+    """WEB_WORKERS или 2 × ядра + 1"""
+    if config.WEB_WORKERS > 0:
+        return config.WEB_WORKERS
+    return available_cores() * 2 + 1
+
+def worker_pool_size(workers: int) -> int:
+    """Размер пула воркера: DB_POOL_MAX_SIZE, но все воркеры вместе не больше DB_MAX_CONNECTIONS"""
+    if config.DB_MAX_CONNECTIONS <= 0:
+        return config.DB_POOL_MAX_SIZE
+    share = (config.DB_MAX_CONNECTIONS - 1) // workers
+    if share < 1:
+        raise RuntimeError(
+            f"DB_MAX_CONNECTIONS={config.DB_MAX_CONNECTIONS} не хватает на {workers} воркеров: "
+            f"уменьшите WEB_WORKERS или увеличьте DB_MAX_CONNECTIONS"
+        )
+    return min(config.DB_POOL_MAX_SIZE, share)
+
+def refresh_shared_indexes():
+    """Мастер: построить или обновить индекс навыков и снимок подбора, которые унаследуют воркеры"""
+    from .skill_index import skill_index
+    from .matching import matching_service
+
+    steps = [('подбор', matching_service.refresh)]
+    if skill_index.enabled:
+        steps.insert(0, ('индекс навыков', skill_index.refresh))
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            # Не критично: воркер построит недостающее сам
+            logger.warning(f"⚠️ Ошибка построения в мастере ({name}): {e}")
+
+def pre_fork(server, worker):
+    """Мастер перед fork: обновить общие индексы; подключения к базе не должны достаться воркерам"""
+    from .database import db_manager
+
+    refresh_shared_indexes()
+    db_manager.pool.close()
+    # Объекты, созданные при загрузке приложения, больше не сканируются
+    # сборщиком мусора, и их страницы не копируются при записи счетчиков
+    gc.freeze()
+
+def post_fork(server, worker):
+    """Воркер после fork: запуск фоновых потоков этого процесса"""
+    from .server import start_background_tasks
+
+    gc.enable()
+    start_background_tasks()
+
+def worker_exit(server, worker):
+    """Воркер завершается: дописать очередь контактных сообщений"""
+    if config.CONTACT_WRITE_BEHIND:
+        from .contact_queue import contact_queue
+
+        contact_queue.flush()
+
+def gunicorn_options() -> Dict[str, Any]:
+    """Настройки gunicorn из конфигурации приложения"""
+    return {
+        'bind': f"0.0.0.0:{config.PORT}",
+        'workers': worker_count(),
+        'worker_class': 'gthread',
+        'threads': config.WEB_THREADS,
+        'preload_app': True,
+        'max_requests': config.WEB_MAX_REQUESTS,
+        'max_requests_jitter': config.WEB_MAX_REQUESTS_JITTER,
+        'timeout': config.WEB_TIMEOUT,
+        'graceful_timeout': config.WEB_GRACEFUL_TIMEOUT,
+        'keepalive': config.WEB_KEEPALIVE,
+        'accesslog': None,
+        'pre_fork': pre_fork,
+        'post_fork': post_fork,
+        'worker_exit': worker_exit,
+    }
+
+def run_production():
+    """Запустить приложение под gunicorn (блокирует до остановки мастера)"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise RuntimeError("Для SERVER_MODE=production нужен gunicorn: pip install gunicorn")
+
+    class ProductionApplication(BaseApplication):
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from .server import create_app
+
+            app = create_app(start_background=False)
+            refresh_shared_indexes()
+            return app
+
+    if config.DEBUG:
+        logger.warning("⚠️ DEBUG=true не используется в production-режиме")
+        config.DEBUG = False
+    # gc.freeze эффективнее, если до него сборщик не перемешивал объекты загрузки
+    gc.disable()
+
+    options = gunicorn_options()
+    from .database import db_manager
+
+    pool_size = worker_pool_size(options['workers'])
+    if pool_size < options['threads']:
+        logger.warning(
+            f"⚠️ Пул воркера ({pool_size}) меньше числа потоков ({options['threads']}): "
+            f"при нагрузке запросы будут ждать подключения до DB_POOL_TIMEOUT"
+        )
+    # Пул создан при импорте; воркеры унаследуют ограничение через fork
+    db_manager.pool.max_size = pool_size
+    db_manager.pool.min_size = min(db_manager.pool.min_size, pool_size)
+    logger.info(
+        f"🏭 Production-режим: {options['workers']} воркеров × {options['threads']} потоков "
+        f"(ядер: {available_cores()}), до {options['workers'] * pool_size} подключений к БД"
+    )
+    ProductionApplication(options).run()
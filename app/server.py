@@ -4,21 +4,53 @@
 
 import os
 import logging
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
 from werkzeug.exceptions import HTTPException
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from .config import config
 from .api import register_api_routes
-from .database import get_db_stats
+from .database import db_manager
+from .stats_monitor import stats_monitor
+from .cache import caches_stats
+from .compression import init_compression, send_static
+from .json_provider import FastJSONProvider
+from .password_hashing import password_hasher
+from .throttling import auth_throttle
+from .user_cache import user_cache
+from .contact_queue import contact_queue
+from .boot import boot_timer, warm_up
 
 logger = logging.getLogger(__name__)
 
-def create_app():
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+def start_background_tasks():
+    """
+    Фоновые потоки процесса. При запуске под gunicorn вызывается в каждом
+    воркере после fork (потоки мастера в воркеры не переходят).
+    """
+    # Индекс навыков (вместе с numpy) импортируется здесь, а не при создании
+    # приложения; строится из базы в фоне, до готовности запросы идут в SQL
+    from .skill_index import skill_index
+
+    skill_index.start()
+    stats_monitor.start()
+    
+    # Очередь контактных сообщений: сразу дописывает сегменты, оставшиеся после сбоя
+    if config.CONTACT_WRITE_BEHIND:
+        contact_queue.start()
+
+def create_app(start_background: bool = True):
     """Создание и конфигурация Flask приложения"""
+    # Встроенный static-маршрут Flask отключен: статику отдает serve_static
+    # (с предварительно сжатыми .br/.gz)
     app = Flask(__name__, 
                 template_folder='templates',
-                static_folder='static')
+                static_folder=None)
+    # JSON-ответы через orjson; даты сериализуются в ISO 8601
+    app.json = FastJSONProvider(app)
     
     # Конфигурация
     app.config.update({
@@ -31,9 +63,24 @@ def create_app():
     # CORS настройки
     CORS(app, origins=config.CORS_ORIGINS)
     
+    # Адрес и схема клиента из X-Forwarded-* от доверенных прокси
+    # (по адресу клиента работает ограничение частоты входа)
+    if config.TRUSTED_PROXIES > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=config.TRUSTED_PROXIES,
+                                x_proto=config.TRUSTED_PROXIES)
+    
+    # Сжатие ответов gzip/brotli
+    init_compression(app)
+    
+    # Замер времени до первого ответа
+    boot_timer.init_app(app)
+    
     # Регистрация API роутов
     register_api_routes(app)
     
+    if start_background:
+        start_background_tasks()
+    
     # Главная страница
     @app.route('/')
     def index():
@@ -41,26 +88,39 @@ def create_app():
         return render_template('index.html')
     
     # Статические файлы
-    @app.route('/static/<path:filename>')
+    @app.route('/static/<path:filename>', endpoint='static')
     def serve_static(filename):
         """Обслуживание статических файлов"""
-        return send_from_directory(app.static_folder, filename)
+        return send_static(STATIC_FOLDER, filename)
     
     # Health check
     @app.route('/health')
     def health_check():
-        """Проверка состояния сервера"""
+        """Проверка состояния сервера (статистика из фонового снимка, без запросов к БД)"""
+        from .skill_index import skill_index
+
         try:
-            stats = get_db_stats()
+            snapshot = stats_monitor.snapshot()
             return jsonify({
-                'status': 'healthy',
+                'status': 'healthy' if stats_monitor.is_ready() else 'degraded',
                 'service': 'HireHand Platform',
                 'version': '1.0.0',
                 'language': 'Python 3.11',
                 'framework': 'Flask',
                 'database': 'PostgreSQL',
                 'port': config.PORT,
-                'stats': stats
+                'stats': snapshot['stats'],
+                'stats_refreshed_at': snapshot['refreshed_at'],
+                'stats_age_seconds': snapshot['age_seconds'],
+                'stats_stale': snapshot['stale'],
+                'pool': db_manager.get_pool_stats(),
+                'skill_index': skill_index.stats(),
+                'response_cache': caches_stats(),
+                'password_hasher': password_hasher.stats(),
+                'auth_throttle': auth_throttle.stats(),
+                'user_cache': user_cache.stats(),
+                'contact_queue': contact_queue.stats() if config.CONTACT_WRITE_BEHIND else None,
+                'boot': boot_timer.stats()
             })
         except Exception as e:
             logger.error(f"Health check failed: {e}")
@@ -68,6 +128,24 @@ def create_app():
                 'status': 'unhealthy',
                 'error': str(e)
             }), 500
+
+    @app.route('/health/live')
+    def health_live():
+        """Liveness: процесс отвечает, база не проверяется"""
+        return jsonify({'status': 'alive'})
+
+    @app.route('/health/ready')
+    def health_ready():
+        """Readiness: прогрев завершен, последнее обновление статистики прошло успешно и не устарело"""
+        snapshot = stats_monitor.snapshot()
+        ready = warm_up.ready and stats_monitor.is_ready()
+        return jsonify({
+            'status': 'ready' if ready else 'not_ready',
+            'warm_up': warm_up.state,
+            'refreshed_at': snapshot['refreshed_at'],
+            'age_seconds': snapshot['age_seconds'],
+            'error': snapshot['last_error']
+        }), 200 if ready else 503
     
     # Обработка ошибок
     @app.errorhandler(404)
@@ -0,0 +1,580 @@
+"""
+Инвертированный индекс навыков кандидатов в памяти процесса
+
+Для каждого навыка хранится множество id кандидатов в одном из двух видов
+(как контейнеры Roaring): редкие навыки — отсортированный массив uint32,
+частые — битовая карта из слов uint64. Вид выбирается по размеру: массив
+переводится в карту, когда она становится компактнее. Запросы AND/OR/NOT
+и фильтр is_available выполняются пересечением этих множеств, сортировка
+по (created_at, id) — по массиву времени создания, индексированному id.
+
+Индекс строится из базы при старте в фоновом потоке, пополняется при
+создании кандидатов в этом процессе и периодически догружает кандидатов
+с id больше последнего прочитанного из базы (созданных другими процессами),
+перечитывая окно последних id, и раз в SKILL_INDEX_REBUILD_SECONDS
+перестраивается целиком.
+Навыки сравниваются точно так же, как в SQL (skills && / @>); в базе и в
+запросах они уже нормализованы (normalize_skills). Страница id из индекса
+перепроверяется в SQL теми же условиями (Candidate._listing_filters).
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from .config import config
+from .database import db_manager
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Результат-карту с меньшим числом совпадений раскрываем в массив и сортируем,
+# с большим — просматриваем порядок выдачи блоками, не раскрывая
+_SCAN_MIN_MATCHES = 16384
+_SCAN_BLOCK = 1024
+_SCAN_BLOCK_MAX = 65536
+# Сколько недавно добавленных копится до слияния с порядком выдачи
+_COMPACT_RECENT = 5000
+
+_SELECT_CANDIDATES_AFTER = """
+    SELECT id, skills, is_available, created_at
+    FROM candidates
+    WHERE id > %s
+    ORDER BY id
+"""
+
+def _to_micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return 0
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    return (value - _EPOCH) // _MICROSECOND
+
+def _words_for(bits: int) -> int:
+    return (bits + 63) // 64
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Массив длиной не меньше size (с запасом), новые элементы нулевые"""
+    if len(array) >= size:
+        return array
+    grown = np.zeros(max(size, len(array) * 2, 16), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+def _bitmap_contains(words: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    word_index = ids >> 6
+    in_range = word_index < len(words)
+    values = words[np.where(in_range, word_index, 0)] if len(words) else np.zeros(len(ids), dtype=np.uint64)
+    bits = (values >> (ids & 63).astype(np.uint64)) & np.uint64(1)
+    return (bits == 1) & in_range
+
+def _bitmap_ids(words: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.unpackbits(words.view(np.uint8), bitorder='little')).astype(np.uint32)
+
+def _ids_bitmap(ids: np.ndarray, word_count: int) -> np.ndarray:
+    flags = np.zeros(word_count * 64, dtype=bool)
+    flags[ids] = True
+    return np.packbits(flags, bitorder='little').view(np.uint64)
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+def _sorted_union(arrays: List[np.ndarray]) -> np.ndarray:
+    merged = np.sort(np.concatenate(arrays))
+    if len(merged) < 2:
+        return merged
+    return merged[np.concatenate(([True], merged[1:] != merged[:-1]))]
+
+def _before_cursor(created: np.ndarray, ids: np.ndarray, cursor: Tuple[datetime, int]) -> np.ndarray:
+    """Маска строк, идущих после курсора в порядке created_at DESC, id DESC"""
+    cursor_created, cursor_id = _to_micros(cursor[0]), cursor[1]
+    return (created < cursor_created) | ((created == cursor_created) & (ids < cursor_id))
+
+class Postings:
+    """Множество id кандидатов: отсортированный массив или битовая карта"""
+
+    __slots__ = ('ids', 'words', 'size')
+
+    def __init__(self):
+        self.ids: Optional[np.ndarray] = np.empty(4, dtype=np.uint32)
+        self.words: Optional[np.ndarray] = None
+        self.size = 0
+
+    @classmethod
+    def from_ids(cls, ids: np.ndarray, universe_words: int) -> 'Postings':
+        """Множество из массива уникальных id"""
+        postings = cls()
+        postings.size = len(ids)
+        if len(ids) * 4 > universe_words * 8:
+            postings.ids = None
+            postings.words = _ids_bitmap(ids, universe_words)
+        else:
+            postings.ids = np.sort(ids).astype(np.uint32)
+        return postings
+
+    @property
+    def is_bitmap(self) -> bool:
+        return self.words is not None
+
+    def add(self, candidate_id: int, universe_words: int):
+        """Добавить id; universe_words — размер битовой карты всего индекса в словах"""
+        if self.words is not None:
+            word, bit = candidate_id >> 6, np.uint64(1 << (candidate_id & 63))
+            self.words = _grow(self.words, word + 1)
+            if not self.words[word] & bit:
+                self.words[word] |= bit
+                self.size += 1
+            return
+
+        if self.size and self.ids[self.size - 1] >= candidate_id:
+            # id пришел не по возрастанию: вставка с сохранением порядка
+            current = self.ids[:self.size]
+            position = int(np.searchsorted(current, candidate_id))
+            if position < self.size and current[position] == candidate_id:
+                return
+            self.ids = np.insert(current, position, candidate_id)
+        else:
+            self.ids = _grow(self.ids, self.size + 1)
+            self.ids[self.size] = candidate_id
+        self.size += 1
+
+        # Карта выгоднее массива, когда 4 байта на id больше 8 байт на слово карты
+        if self.size * 4 > universe_words * 8:
+            self.words = _ids_bitmap(self.ids[:self.size], max(universe_words, _words_for(candidate_id + 1)))
+            self.ids = None
+
+    def array(self) -> np.ndarray:
+        """Отсортированные id"""
+        return self.ids[:self.size] if self.words is None else _bitmap_ids(self.words)
+
+    def bitmap(self, word_count: int) -> np.ndarray:
+        """Битовая карта длиной word_count слов"""
+        if self.words is None:
+            return _ids_bitmap(self.ids[:self.size], word_count)
+        if len(self.words) >= word_count:
+            return self.words[:word_count]
+        return _grow(self.words, word_count)[:word_count]
+
+    def contains(self, ids: np.ndarray) -> np.ndarray:
+        """Маска: какие из ids входят в множество"""
+        if self.words is not None:
+            return _bitmap_contains(self.words, ids)
+        current = self.ids[:self.size]
+        positions = np.searchsorted(current, ids)
+        found = positions < self.size
+        found[found] = current[positions[found]] == ids[found]
+        return found
+
+    def nbytes(self) -> int:
+        return self.words.nbytes if self.words is not None else self.ids.nbytes
+
+class SkillIndex:
+    """
+    Навык -> множество id, плюс битовые карты существующих и доступных кандидатов
+    и порядок выдачи (created_at DESC, id DESC) для постраничного чтения.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Postings] = {}
+        self.exists = np.zeros(16, dtype=np.uint64)
+        self.available = np.zeros(16, dtype=np.uint64)
+        self.created = np.zeros(1024, dtype=np.int64)
+        # Порядок выдачи: id и -created_at по возрастанию ключа (для searchsorted)
+        self.order_ids = np.empty(0, dtype=np.uint32)
+        self.order_keys = np.empty(0, dtype=np.int64)
+        # Добавленные после построения, еще не влитые в порядок выдачи
+        self.recent_ids: List[int] = []
+        self.max_id = 0
+        # Наибольший id, прочитанный из базы: двигает только догрузка, не add()
+        # (кандидаты этого процесса могут быть зафиксированы раньше чужих с меньшим id)
+        self.loaded_id = 0
+        self.count = 0
+        self._lock = threading.RLock()
+
+    @property
+    def word_count(self) -> int:
+        return _words_for(self.max_id + 1)
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[int, Optional[List[str]], bool, Optional[datetime]]]) -> 'SkillIndex':
+        """Построить индекс из строк (id, skills, is_available, created_at) с уникальными id"""
+        ids, available, created = [], [], []
+        skill_ids: Dict[str, List[int]] = {}
+        for candidate_id, skills, is_available, created_at in rows:
+            ids.append(candidate_id)
+            available.append(bool(is_available))
+            created.append(_to_micros(created_at))
+            for skill in set(skills or ()):
+                skill_list = skill_ids.get(skill)
+                if skill_list is None:
+                    skill_ids[skill] = [candidate_id]
+                else:
+                    skill_list.append(candidate_id)
+
+        index = cls()
+        if not ids:
+            return index
+        id_array = np.array(ids, dtype=np.uint32)
+        index.max_id = int(id_array.max())
+        index.loaded_id = index.max_id
+        index.count = len(id_array)
+        word_count = index.word_count
+        index.exists = _ids_bitmap(id_array, word_count)
+        index.available = _ids_bitmap(id_array[np.array(available, dtype=bool)], word_count)
+        index.created = np.zeros(index.max_id + 1, dtype=np.int64)
+        index.created[id_array] = np.array(created, dtype=np.int64)
+        index._set_order(id_array)
+        for skill, skill_list in skill_ids.items():
+            index.postings[skill] = Postings.from_ids(np.array(skill_list, dtype=np.uint32), word_count)
+        return index
+
+    def _set_order(self, ids: np.ndarray):
+        keys = -self.created[ids]
+        order = np.lexsort((-ids.astype(np.int64), keys))
+        self.order_ids = ids[order]
+        self.order_keys = keys[order]
+
+    def add(self, candidate_id: int, skills: Optional[Iterable[str]], is_available: bool = True,
+            created_at: Optional[datetime] = None) -> bool:
+        """Добавить кандидата; False, если этот id уже есть в индексе"""
+        with self._lock:
+            word, bit = candidate_id >> 6, np.uint64(1 << (candidate_id & 63))
+            self.exists = _grow(self.exists, word + 1)
+            if self.exists[word] & bit:
+                return False
+            self.exists[word] |= bit
+            self.available = _grow(self.available, word + 1)
+            if is_available:
+                self.available[word] |= bit
+            self.created = _grow(self.created, candidate_id + 1)
+            self.created[candidate_id] = _to_micros(created_at)
+            self.recent_ids.append(candidate_id)
+            self.max_id = max(self.max_id, candidate_id)
+            self.count += 1
+
+            universe_words = self.word_count
+            for skill in set(skills or ()):
+                postings = self.postings.get(skill)
+                if postings is None:
+                    postings = self.postings[skill] = Postings()
+                postings.add(candidate_id, universe_words)
+            return True
+
+    def compact(self, min_recent: int = 0):
+        """Влить недавно добавленных кандидатов в порядок выдачи"""
+        with self._lock:
+            if not self.recent_ids or len(self.recent_ids) < min_recent:
+                return
+            self._set_order(np.concatenate([self.order_ids, np.array(self.recent_ids, dtype=np.uint32)]))
+            self.recent_ids = []
+
+    def _match(self, any_of: Sequence[str], all_of: Sequence[str], none_of: Sequence[str],
+               available_only: bool) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Результат запроса: (отсортированные id, None) или (None, битовая карта)"""
+        word_count = self.word_count
+        required = [self.postings.get(skill) for skill in set(all_of)]
+        optional = [self.postings.get(skill) for skill in set(any_of)]
+        excluded = [postings for postings in (self.postings.get(skill) for skill in set(none_of)) if postings]
+        optional = [postings for postings in optional if postings] if optional else None
+        if any(postings is None for postings in required) or optional == []:
+            return np.empty(0, dtype=np.uint32), None
+
+        # Начинаем с самого маленького множества, остальные применяем как фильтры
+        ids: Optional[np.ndarray] = None
+        words: Optional[np.ndarray] = None
+        required.sort(key=lambda postings: postings.size)
+        if required:
+            driver = required.pop(0)
+            if driver.is_bitmap:
+                words = driver.bitmap(word_count).copy()
+            else:
+                ids = driver.array()
+        elif optional:
+            if all(not postings.is_bitmap for postings in optional):
+                ids = _sorted_union([postings.array() for postings in optional])
+            else:
+                words = np.zeros(word_count, dtype=np.uint64)
+                for postings in optional:
+                    words |= postings.bitmap(word_count)
+            optional = None
+        else:
+            words = (self.available if available_only else self.exists)[:word_count].copy()
+
+        for postings in required:
+            if ids is not None:
+                ids = ids[postings.contains(ids)]
+            elif not postings.is_bitmap:
+                ids = postings.array()
+                ids = ids[_bitmap_contains(words, ids)]
+            else:
+                words &= postings.bitmap(word_count)
+
+        if optional:
+            if ids is not None:
+                mask = np.zeros(len(ids), dtype=bool)
+                for postings in optional:
+                    mask |= postings.contains(ids)
+                ids = ids[mask]
+            else:
+                union = np.zeros(word_count, dtype=np.uint64)
+                for postings in optional:
+                    union |= postings.bitmap(word_count)
+                words &= union
+
+        for postings in excluded:
+            if ids is not None:
+                ids = ids[~postings.contains(ids)]
+            else:
+                words &= ~postings.bitmap(word_count)
+
+        if ids is not None:
+            if available_only:
+                ids = ids[_bitmap_contains(self.available, ids)]
+            return ids, None
+
+        if available_only:
+            words &= self.available[:word_count]
+        return None, words
+
+    def match(self, any_of: Sequence[str] = (), all_of: Sequence[str] = (), none_of: Sequence[str] = (),
+              available_only: bool = True) -> np.ndarray:
+        """
+        Отсортированные id кандидатов, у которых есть все навыки all_of, хотя бы один
+        из any_of и нет ни одного из none_of.
+        """
+        with self._lock:
+            ids, words = self._match(any_of, all_of, none_of, available_only)
+            return ids if ids is not None else _bitmap_ids(words)
+
+    def count_matches(self, any_of: Sequence[str] = (), all_of: Sequence[str] = (), none_of: Sequence[str] = (),
+                      available_only: bool = True) -> int:
+        """Число подходящих кандидатов без раскрытия результата в массив"""
+        with self._lock:
+            ids, words = self._match(any_of, all_of, none_of, available_only)
+            return len(ids) if ids is not None else _popcount(words)
+
+    def query(self, any_of: Sequence[str] = (), all_of: Sequence[str] = (), none_of: Sequence[str] = (),
+              available_only: bool = True, limit: int = 50, offset: int = 0,
+              cursor: Optional[Tuple[datetime, int]] = None) -> List[int]:
+        """
+        Страница id в порядке ORDER BY created_at DESC, id DESC, как в Candidate.get_all.
+        cursor — ключ (created_at, id) последней строки предыдущей страницы; с ним offset не используется.
+        """
+        if cursor is not None:
+            offset = 0
+        with self._lock:
+            ids, words = self._match(any_of, all_of, none_of, available_only)
+            if words is not None and _popcount(words) < _SCAN_MIN_MATCHES:
+                ids = _bitmap_ids(words)
+            if ids is not None:
+                return self._page_ids(ids, limit + offset, cursor)[offset:]
+            return self._page_bitmap(words, limit + offset, cursor)[offset:]
+
+    def _page_ids(self, ids: np.ndarray, wanted: int, cursor: Optional[Tuple[datetime, int]]) -> List[int]:
+        """Первые wanted id небольшого результата: сортировка по created_at"""
+        created = self.created[ids]
+        if cursor is not None:
+            mask = _before_cursor(created, ids, cursor)
+            ids, created = ids[mask], created[mask]
+
+        if wanted < len(ids):
+            # Отбираем wanted самых новых, при равном created_at — всех с пограничным значением
+            threshold = np.partition(created, len(created) - wanted)[len(created) - wanted]
+            keep = created >= threshold
+            ids, created = ids[keep], created[keep]
+        order = np.lexsort((-ids.astype(np.int64), -created))
+        return [int(candidate_id) for candidate_id in ids[order][:wanted]]
+
+    def _page_bitmap(self, words: np.ndarray, wanted: int, cursor: Optional[Tuple[datetime, int]]) -> List[int]:
+        """
+        Первые wanted id большого результата: порядок выдачи просматривается блоками
+        растущего размера, пока не наберется нужное число совпадений.
+        """
+        position = 0
+        if cursor is not None:
+            key, cursor_id = -_to_micros(cursor[0]), cursor[1]
+            low = int(np.searchsorted(self.order_keys, key, 'left'))
+            high = int(np.searchsorted(self.order_keys, key, 'right'))
+            position = low + int(np.searchsorted(-self.order_ids[low:high].astype(np.int64), -cursor_id, 'right'))
+
+        found_ids, found_keys = [], []
+        found = 0
+        block = _SCAN_BLOCK
+        while found < wanted and position < len(self.order_ids):
+            chunk = self.order_ids[position:position + block]
+            mask = _bitmap_contains(words, chunk)
+            found_ids.append(chunk[mask])
+            found_keys.append(self.order_keys[position:position + block][mask])
+            found += len(found_ids[-1])
+            position += block
+            block = min(block * 2, _SCAN_BLOCK_MAX)
+
+        if self.recent_ids:
+            recent = np.array(self.recent_ids, dtype=np.uint32)
+            mask = _bitmap_contains(words, recent)
+            if cursor is not None:
+                mask &= _before_cursor(self.created[recent], recent, cursor)
+            found_ids.append(recent[mask])
+            found_keys.append(-self.created[recent[mask]])
+
+        if not found_ids:
+            return []
+        ids = np.concatenate(found_ids)
+        keys = np.concatenate(found_keys)
+        order = np.lexsort((-ids.astype(np.int64), keys))
+        return [int(candidate_id) for candidate_id in ids[order][:wanted]]
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Размер индекса в байтах по частям"""
+        with self._lock:
+            postings = sum(postings.nbytes() for postings in self.postings.values())
+            bitmaps = sum(1 for postings in self.postings.values() if postings.is_bitmap)
+            return {
+                'candidates': self.count,
+                'skills': len(self.postings),
+                'bitmap_skills': bitmaps,
+                'postings_bytes': postings,
+                'filters_bytes': self.exists.nbytes + self.available.nbytes,
+                'created_at_bytes': self.created.nbytes,
+                'order_bytes': self.order_ids.nbytes + self.order_keys.nbytes,
+                'total_bytes': (postings + self.exists.nbytes + self.available.nbytes + self.created.nbytes
+                                + self.order_ids.nbytes + self.order_keys.nbytes)
+            }
+
+class SkillIndexService:
+    """Текущий индекс: построение при старте, пополнение и догрузка в фоне"""
+
+    def __init__(self, enabled: bool = True, refresh_seconds: float = 5.0, recheck_ids: int = 1000,
+                 rebuild_seconds: float = 600.0):
+        self.enabled = enabled
+        self.refresh_seconds = refresh_seconds
+        # Догрузка перечитывает последние recheck_ids id до отметки: кандидаты,
+        # зафиксированные не по порядку id (другими процессами), не теряются.
+        # Все, что не попало в окно, подберет полное перестроение раз в rebuild_seconds
+        self.recheck_ids = recheck_ids
+        self.rebuild_seconds = rebuild_seconds
+        self._built_at = 0.0
+        self.index: Optional[SkillIndex] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.enabled and self.index is not None
+
+    def start(self):
+        """Запустить фоновый поток построения и догрузки (однократно в каждом процессе)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            # Индекс, унаследованный через fork (построен мастером gunicorn до
+            # fork), не перестраивается: поток сначала догрузит новых кандидатов
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='skill-index', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Ошибка обновления индекса навыков: {e}")
+            time.sleep(self.refresh_seconds)
+
+    def _fetch(self, after_id: int, consume):
+        """Прочитать кандидатов с id больше after_id серверным курсором и передать в consume"""
+        with db_manager.transaction(), db_manager.get_connection() as conn:
+            cursor = conn.cursor(name='skill_index_load')
+            cursor.itersize = 10000
+            try:
+                cursor.execute(_SELECT_CANDIDATES_AFTER, (after_id,))
+                return consume(cursor)
+            finally:
+                cursor.close()
+
+    def _load(self, index: SkillIndex) -> int:
+        """Догрузить в индекс кандидатов после отметки (с окном перепроверки); вернуть число добавленных"""
+        def consume(rows) -> int:
+            loaded, last_id = 0, index.loaded_id
+            for candidate_id, skills, is_available, created_at in rows:
+                if index.add(candidate_id, skills, is_available, created_at):
+                    loaded += 1
+                last_id = max(last_id, candidate_id)
+            with index._lock:
+                index.loaded_id = max(index.loaded_id, last_id)
+            return loaded
+        return self._fetch(max(0, index.loaded_id - self.recheck_ids), consume)
+
+    def rebuild(self):
+        """Построить индекс из базы заново"""
+        started = time.monotonic()
+        self._built_at = started
+        index = self._fetch(0, SkillIndex.build)
+        # Кандидаты, созданные во время построения
+        self._load(index)
+        self.index = index
+        usage = index.memory_usage()
+        logger.info(
+            f"🧠 Индекс навыков построен: {usage['candidates']} кандидатов, {usage['skills']} навыков, "
+            f"{usage['total_bytes'] / 1024 / 1024:.1f} МБ за {time.monotonic() - started:.2f} с"
+        )
+
+    def refresh(self):
+        """Перестроить индекс, если его нет или пора по расписанию, иначе догрузить новых кандидатов"""
+        if self.index is None or (self.rebuild_seconds > 0
+                                  and time.monotonic() - self._built_at >= self.rebuild_seconds):
+            self.rebuild()
+        else:
+            self.catch_up()
+
+    def catch_up(self) -> int:
+        """Догрузить кандидатов, созданных с момента последнего обновления"""
+        index = self.index
+        if index is None:
+            return 0
+        loaded = self._load(index)
+        index.compact(min_recent=_COMPACT_RECENT)
+        return loaded
+
+    def add(self, candidate_id: int, skills: Optional[Iterable[str]], is_available: bool = True,
+            created_at: Optional[datetime] = None):
+        """Учесть созданного в этом процессе кандидата"""
+        index = self.index
+        if index is not None:
+            index.add(candidate_id, skills, is_available, created_at)
+
+    def query(self, any_of: Sequence[str] = (), all_of: Sequence[str] = (), none_of: Sequence[str] = (),
+              available_only: bool = True, limit: int = 50, offset: int = 0,
+              cursor: Optional[Tuple[datetime, int]] = None) -> Optional[List[int]]:
+        """Страница id по навыкам; None, если индекс еще не готов"""
+        index = self.index
+        if not self.enabled or index is None:
+            return None
+        return index.query(any_of=any_of, all_of=all_of, none_of=none_of, available_only=available_only,
+                           limit=limit, offset=offset, cursor=cursor)
+
+    def stats(self) -> Dict[str, Any]:
+        index = self.index
+        if index is None:
+            return {'enabled': self.enabled, 'ready': False}
+        return {'enabled': self.enabled, 'ready': True, **index.memory_usage()}
+
+# Глобальный индекс навыков
+skill_index = SkillIndexService(
+    enabled=config.SKILL_INDEX_ENABLED,
+    refresh_seconds=config.SKILL_INDEX_REFRESH_SECONDS,
+    recheck_ids=config.SKILL_INDEX_RECHECK_IDS,
+    rebuild_seconds=config.SKILL_INDEX_REBUILD_SECONDS
+)
@@ -0,0 +1,99 @@
+"""
+Фоновое обновление статистики базы данных для /health
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+
+from .config import config
+from .database import collect_db_stats
+
+logger = logging.getLogger(__name__)
+
+class StatsMonitor:
+    """Снимок статистики БД, который обновляет фоновый поток"""
+
+    def __init__(self, refresh_seconds: float = 15.0, mode: str = 'estimate', max_age_factor: float = 3.0):
+        self.refresh_seconds = refresh_seconds
+        self.mode = mode
+        self.max_age_factor = max_age_factor
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+        self._stats: Dict[str, Any] = {}
+        self._refreshed_at: Optional[float] = None
+        self._refreshed_wall: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._refresh_duration: Optional[float] = None
+
+    def start(self):
+        """Запустить фоновый поток (однократно в каждом процессе, в том числе после fork)"""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='db-stats-monitor', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self.refresh()
+            self._wakeup.wait(self.refresh_seconds)
+            self._wakeup.clear()
+
+    def refresh(self):
+        """Обновить снимок немедленно"""
+        started = time.monotonic()
+        try:
+            stats = collect_db_stats(self.mode)
+        except Exception as e:
+            logger.error(f"Ошибка обновления статистики БД: {e}")
+            with self._lock:
+                self._last_error = str(e)
+            return
+
+        with self._lock:
+            self._stats = stats
+            self._refreshed_at = time.monotonic()
+            self._refreshed_wall = datetime.now(timezone.utc)
+            self._refresh_duration = self._refreshed_at - started
+            self._last_error = None
+
+    @property
+    def max_age(self) -> float:
+        """Возраст снимка, после которого он считается устаревшим"""
+        return self.refresh_seconds * self.max_age_factor
+
+    def is_ready(self) -> bool:
+        """Последнее обновление прошло успешно и снимок не устарел"""
+        with self._lock:
+            return (self._refreshed_at is not None and self._last_error is None
+                    and time.monotonic() - self._refreshed_at <= self.max_age)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Текущий снимок статистики с отметкой времени и признаком устаревания"""
+        self.start()
+        with self._lock:
+            age = time.monotonic() - self._refreshed_at if self._refreshed_at is not None else None
+            return {
+                'stats': dict(self._stats),
+                'mode': self.mode,
+                'refreshed_at': self._refreshed_wall.isoformat() if self._refreshed_wall else None,
+                'age_seconds': round(age, 3) if age is not None else None,
+                'stale': age is None or age > self.max_age,
+                'refresh_ms': round(self._refresh_duration * 1000, 3) if self._refresh_duration is not None else None,
+                'last_error': self._last_error
+            }
+
+# Глобальный монитор статистики
+stats_monitor = StatsMonitor(
+    refresh_seconds=config.STATS_REFRESH_SECONDS,
+    mode=config.STATS_MODE
+)
@@ -0,0 +1,248 @@
+"""
+Ограничение частоты входа и регистрации (token bucket)
+
+Каждая попытка /api/users/login и /api/users/register расходует по жетону из
+корзины IP-адреса и корзины username; корзина пополняется с постоянной
+скоростью до своего объема. Проверка выполняется до разбора запроса
+обработчиком — отклоненная попытка не доходит ни до PBKDF2, ни до базы.
+
+Состояние хранится в памяти процесса (AUTH_THROTTLE_BACKEND=memory) или в
+таблице auth_throttle (postgres) — общей для всех воркеров. При ошибке базы
+проверка временно выполняется по памяти процесса.
+
+IP-адрес — request.remote_addr. За балансировщиком это адрес прокси, общий
+для всех клиентов: задайте TRUSTED_PROXIES, и create_app возьмет адрес
+клиента из X-Forwarded-For (ProxyFix).
+"""
+
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Dict, Any, Tuple, List
+
+from flask import request, jsonify
+
+from .config import config
+from .database import db_manager, Statement, StatementKind
+
+logger = logging.getLogger(__name__)
+
+# Списание жетона одним запросом: пополнение за прошедшее время, затем
+# попытка взять жетон. Объем корзины = tokens новой строки + 1.
+_TAKE_TOKEN = Statement("""
+    INSERT INTO auth_throttle AS bucket (key, tokens, rate, allowed, updated_at)
+    VALUES (%s, %s::double precision - 1, %s::double precision, TRUE, clock_timestamp())
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = CASE
+            WHEN LEAST(EXCLUDED.tokens + 1, bucket.tokens + EXCLUDED.rate *
+                       EXTRACT(EPOCH FROM clock_timestamp() - bucket.updated_at)) >= 1
+            THEN LEAST(EXCLUDED.tokens + 1, bucket.tokens + EXCLUDED.rate *
+                       EXTRACT(EPOCH FROM clock_timestamp() - bucket.updated_at)) - 1
+            ELSE LEAST(EXCLUDED.tokens + 1, bucket.tokens + EXCLUDED.rate *
+                       EXTRACT(EPOCH FROM clock_timestamp() - bucket.updated_at))
+        END,
+        allowed = LEAST(EXCLUDED.tokens + 1, bucket.tokens + EXCLUDED.rate *
+                        EXTRACT(EPOCH FROM clock_timestamp() - bucket.updated_at)) >= 1,
+        rate = EXCLUDED.rate,
+        updated_at = clock_timestamp()
+    RETURNING allowed, tokens
+""", StatementKind.WRITE)
+
+# Корзины, которые давно не трогали, уже полны — строки можно удалить
+_PRUNE_BUCKETS = Statement("""
+    DELETE FROM auth_throttle
+    WHERE updated_at < clock_timestamp() - make_interval(secs => %s::double precision)
+    RETURNING 1
+""", StatementKind.WRITE)
+
+class BucketPolicy:
+    """Объем корзины (burst) и скорость пополнения в жетонах в секунду"""
+
+    __slots__ = ('capacity', 'rate')
+
+    def __init__(self, capacity: int, per_minute: float):
+        self.capacity = max(1, capacity)
+        self.rate = max(per_minute, 0.001) / 60.0
+
+    @property
+    def refill_seconds(self) -> float:
+        """Время, за которое пустая корзина заполняется полностью"""
+        return self.capacity / self.rate
+
+    def retry_after(self, tokens: float) -> float:
+        """Секунд до появления жетона"""
+        return max(0.0, (1 - tokens) / self.rate)
+
+class MemoryThrottleStore:
+    """Корзины в памяти процесса; самые давно не использованные вытесняются"""
+
+    name = 'memory'
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def take(self, key: str, policy: BucketPolicy) -> Tuple[bool, float]:
+        """Взять жетон: (разрешено, секунд до следующего жетона)"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(policy.capacity), now]
+                self._buckets[key] = bucket
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(policy.capacity, bucket[0] + (now - bucket[1]) * policy.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0.0
+            return False, policy.retry_after(bucket[0])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'keys': len(self._buckets), 'max_keys': self.max_keys, 'evictions': self.evictions}
+
+class PostgresThrottleStore:
+    """Корзины в таблице auth_throttle, общие для всех процессов"""
+
+    name = 'postgres'
+
+    def __init__(self, prune_seconds: float = 60.0):
+        self.prune_seconds = prune_seconds
+        self._lock = threading.Lock()
+        self._next_prune = time.monotonic() + prune_seconds
+        self.pruned = 0
+
+    def take(self, key: str, policy: BucketPolicy) -> Tuple[bool, float]:
+        """Взять жетон: (разрешено, секунд до следующего жетона)"""
+        row = db_manager.execute_query(_TAKE_TOKEN, (key, policy.capacity, policy.rate), fetch_one=True)
+        if row['allowed']:
+            return True, 0.0
+        return False, policy.retry_after(row['tokens'])
+
+    def prune(self, max_idle_seconds: float):
+        """Удалить строки корзин, которые за время простоя заполнились бы полностью"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_prune:
+                return
+            self._next_prune = now + self.prune_seconds
+        result = db_manager.execute_query(_PRUNE_BUCKETS, (max_idle_seconds,))
+        self.pruned += len(result or [])
+
+    def stats(self) -> Dict[str, Any]:
+        return {'pruned': self.pruned}
+
+class AuthThrottle:
+    """Проверка корзин IP-адреса и username для входа и регистрации"""
+
+    def __init__(self, enabled: bool = True, backend: str = 'memory',
+                 ip_policy: Optional[BucketPolicy] = None,
+                 username_policy: Optional[BucketPolicy] = None,
+                 max_keys: int = 100000):
+        self.enabled = enabled
+        self.ip_policy = ip_policy or BucketPolicy(20, 10)
+        self.username_policy = username_policy or BucketPolicy(5, 2)
+        self.memory = MemoryThrottleStore(max_keys)
+        self.store = PostgresThrottleStore() if backend == 'postgres' else self.memory
+
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = {'ip': 0, 'username': 0}
+        self.backend_errors = 0
+
+    def _take(self, key: str, policy: BucketPolicy) -> Tuple[bool, float]:
+        if self.store is self.memory:
+            return self.memory.take(key, policy)
+        try:
+            result = self.store.take(key, policy)
+        except Exception as e:
+            # База недоступна: ограничиваем хотя бы в пределах процесса
+            logger.warning(f"⚠️ Хранилище ограничений недоступно, проверка по памяти процесса: {e}")
+            with self._lock:
+                self.backend_errors += 1
+            return self.memory.take(key, policy)
+
+        try:
+            self.store.prune(max(self.ip_policy.refill_seconds, self.username_policy.refill_seconds))
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось очистить корзины ограничений: {e}")
+        return result
+
+    def check(self, scope: str, ip: Optional[str], username: Optional[str]) -> Optional[float]:
+        """None, если попытка разрешена, иначе секунд до следующей разрешенной"""
+        if not self.enabled:
+            return None
+
+        buckets = [('ip', f"{scope}:ip:{ip or 'unknown'}", self.ip_policy)]
+        if username:
+            buckets.append(('username', f"{scope}:user:{username.strip().lower()[:255]}", self.username_policy))
+
+        for kind, key, policy in buckets:
+            allowed, retry_after = self._take(key, policy)
+            if not allowed:
+                with self._lock:
+                    self.rejected[kind] += 1
+                return retry_after
+        with self._lock:
+            self.allowed += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Метрики: разрешенные и отклоненные попытки, состояние хранилища"""
+        with self._lock:
+            stats = {
+                'enabled': self.enabled,
+                'backend': self.store.name,
+                'allowed': self.allowed,
+                'rejected_ip': self.rejected['ip'],
+                'rejected_username': self.rejected['username'],
+                'backend_errors': self.backend_errors
+            }
+        stats.update(self.store.stats())
+        return stats
+
+def throttled(scope: str):
+    """
+    Декоратор обработчика входа/регистрации: при исчерпанной корзине
+    отвечает 429 с Retry-After, не вызывая обработчик.
+    Ставится над @transactional, чтобы проверка шла вне транзакции запроса.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            username = data.get('username') if isinstance(data, dict) else None
+            retry_after = auth_throttle.check(scope, request.remote_addr,
+                                              username if isinstance(username, str) else None)
+            if retry_after is not None:
+                logger.warning(f"⚠️ Ограничение частоты {scope}: {request.remote_addr}, username={username!r}")
+                response = jsonify({
+                    'success': False,
+                    'message': 'Слишком много попыток, повторите позже'
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                return response
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Глобальное ограничение частоты входа и регистрации
+auth_throttle = AuthThrottle(
+    enabled=config.AUTH_THROTTLE_ENABLED,
+    backend=config.AUTH_THROTTLE_BACKEND,
+    ip_policy=BucketPolicy(config.AUTH_THROTTLE_IP_BURST, config.AUTH_THROTTLE_IP_PER_MINUTE),
+    username_policy=BucketPolicy(config.AUTH_THROTTLE_USERNAME_BURST, config.AUTH_THROTTLE_USERNAME_PER_MINUTE),
+    max_keys=config.AUTH_THROTTLE_MAX_KEYS
+)
@@ -0,0 +1,163 @@
+"""
+Кэш пользователей процесса и снимок профиля в сессии
+
+UserCache хранит экземпляры User по username с TTL и вытеснением давно не
+использованных (LRU). Изменение пользователя сбрасывает его запись после
+COMMIT (User._user_changed) и запоминает время сброса: снимки профиля,
+выданные раньше, в этом процессе больше не принимаются.
+
+Кэш и сбросы — в памяти процесса. Под gunicorn остальные воркеры о сбросе
+не знают: отключенный или измененный пользователь в них остается в кэше до
+USER_CACHE_TTL, а его снимок профиля принимается до PROFILE_SNAPSHOT_TTL
+(по умолчанию 300 с).
+
+Снимок профиля — поля User.to_dict() в сессии. Сессия Flask хранится в cookie,
+подписанной SECRET_KEY, поэтому подделать снимок клиент не может. Пока снимок
+моложе PROFILE_SNAPSHOT_TTL, /api/users/profile и /api/users/check-auth
+обходятся без базы.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Версия формата снимка: снимки другой версии считаются отсутствующими
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FIELDS = ('id', 'username', 'email', 'full_name', 'role', 'language',
+                   'is_active', 'created_at', 'updated_at')
+_SNAPSHOT_DATETIMES = ('created_at', 'updated_at')
+
+class UserCache:
+    """Пользователи по username с TTL, LRU и учетом сбросов"""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10000, snapshot_ttl: float = 300.0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.snapshot_ttl = snapshot_ttl
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        # username -> время сброса (time.time()): отсекает выданные раньше снимки
+        self._invalidated: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.snapshot_hits = 0
+        self.snapshot_misses = 0
+
+    def get(self, username: str, load: Callable[[str], Any]) -> Any:
+        """Пользователь из кэша или через load(username); None не кэшируется"""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(username)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[username]
+            self.misses += 1
+            generation = self._generation
+
+        user = load(username)
+        if user is not None and self.ttl > 0:
+            with self._lock:
+                # Пока шла загрузка, пользователя могли изменить
+                if generation == self._generation:
+                    self._entries[username] = (time.monotonic() + self.ttl, user)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        return user
+
+    def put(self, user: Any):
+        """Сохранить только что прочитанного из базы пользователя"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user.username] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, username: str):
+        """Сбросить запись пользователя и его ранее выданные снимки"""
+        now = time.time()
+        with self._lock:
+            self._entries.pop(username, None)
+            self._generation += 1
+            self.invalidations += 1
+            self._invalidated[username] = now
+            # Сбросы старше срока жизни снимка больше ничего не отсекают
+            expired = [name for name, at in self._invalidated.items() if at < now - self.snapshot_ttl]
+            for name in expired:
+                del self._invalidated[name]
+
+    def snapshot_valid(self, username: str, issued_at: float) -> bool:
+        """Снимок не устарел и выдан после последнего сброса пользователя"""
+        with self._lock:
+            valid = (time.time() - issued_at <= self.snapshot_ttl
+                     and issued_at > self._invalidated.get(username, 0))
+            if valid:
+                self.snapshot_hits += 1
+            else:
+                self.snapshot_misses += 1
+            return valid
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики кэша и снимков"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'snapshot_ttl_seconds': self.snapshot_ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'snapshot_hits': self.snapshot_hits,
+                'snapshot_misses': self.snapshot_misses
+            }
+
+def make_snapshot(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Компактный снимок профиля для сессии (значения по порядку SNAPSHOT_FIELDS)"""
+    values: List[Any] = []
+    for field in SNAPSHOT_FIELDS:
+        value = profile.get(field)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    return {'v': SNAPSHOT_VERSION, 'at': time.time(), 'u': values}
+
+def read_snapshot(snapshot: Any) -> Optional[Tuple[float, Dict[str, Any]]]:
+    """(время выдачи, профиль) из снимка сессии или None, если формат не тот"""
+    if not isinstance(snapshot, dict) or snapshot.get('v') != SNAPSHOT_VERSION:
+        return None
+    values = snapshot.get('u')
+    if not isinstance(values, list) or len(values) != len(SNAPSHOT_FIELDS):
+        return None
+    profile = dict(zip(SNAPSHOT_FIELDS, values))
+    try:
+        for field in _SNAPSHOT_DATETIMES:
+            if profile[field] is not None:
+                profile[field] = datetime.fromisoformat(profile[field])
+        return float(snapshot['at']), profile
+    except (KeyError, TypeError, ValueError):
+        return None
+
+# Глобальный кэш пользователей
+user_cache = UserCache(
+    ttl=config.USER_CACHE_TTL,
+    max_entries=config.USER_CACHE_MAX_ENTRIES,
+    snapshot_ttl=config.PROFILE_SNAPSHOT_TTL
+)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк холодного старта: время до первого успешного ответа
+
+Для каждого режима (обычный старт и FAST_BOOT=true) --runs раз запускает
+run.py на свободном порту, как это делает autoscale-развертывание при первом
+запросе, и опрашивает --path каждые --poll секунд до первого ответа 200.
+Печатает медиану и максимум времени до первого ответа, а также медианы
+этапов старта из /health ('boot').
+
+    python benchmarks/bench_boot.py --runs 5 --path '/api/jobs?limit=1'
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import statistics
+import subprocess
+import http.client
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = (
+    ('обычный', {'FAST_BOOT': 'false'}),
+    ('FAST_BOOT', {'FAST_BOOT': 'true'}),
+)
+
+def get(port, path, timeout=2):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+def first_response(port, path, poll, timeout=60):
+    """Секунд от запуска процесса до первого ответа 200 на path"""
+    started = time.perf_counter()
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        try:
+            status, _ = get(port, path)
+            if status == 200:
+                return time.perf_counter() - started
+        except OSError:
+            pass
+        time.sleep(poll)
+    raise RuntimeError(f"Сервер на порту {port} не ответил за {timeout} с")
+
+def boot_phases(port):
+    """Этапы старта из /health после прогрева"""
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        status, body = get(port, '/health/ready')
+        if status == 200:
+            break
+        time.sleep(0.2)
+    _, body = get(port, '/health')
+    return json.loads(body).get('boot') or {}
+
+def run_once(env_overrides, port, args):
+    env = dict(os.environ, SERVER_MODE='development', DEBUG='false', PORT=str(port), **env_overrides)
+    server = subprocess.Popen([sys.executable, 'run.py'], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        elapsed = first_response(port, args.path, args.poll)
+        return elapsed, boot_phases(port)
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Запусков на режим')
+    parser.add_argument('--path', default='/api/jobs?limit=1', help='Первый запрос')
+    parser.add_argument('--poll', type=float, default=0.01, help='Интервал опроса, секунд')
+    parser.add_argument('--port', type=int, default=5200, help='Первый порт')
+    args = parser.parse_args()
+
+    print(f"Запусков на режим: {args.runs}, первый запрос: {args.path}")
+    port = args.port
+    for name, overrides in MODES:
+        times, phases = [], {}
+        for _ in range(args.runs):
+            elapsed, boot = run_once(overrides, port, args)
+            # Следующий запуск на новом порту: старый сокет может быть в TIME_WAIT
+            port += 1
+            times.append(elapsed * 1000)
+            for phase, ms in boot.get('phases_ms', {}).items():
+                phases.setdefault(phase, []).append(ms)
+        breakdown = ', '.join(f"{phase} {statistics.median(values):.0f}" for phase, values in phases.items())
+        print(f"  {name:<10} медиана {statistics.median(times):7.0f} мс, максимум {max(times):7.0f} мс")
+        print(f"  {'':<10} этапы (медиана, мс): {breakdown}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк индексов из миграций 0003–0005 на синтетических данных
+
+Создает отдельную схему bench_indexes, заполняет ее через generate_series,
+замеряет запросы моделей (EXPLAIN ANALYZE, медиана нескольких запусков)
+до и после создания индексов и удаляет схему.
+
+    python benchmarks/bench_indexes.py --rows 200000
+"""
+
+import sys
+import json
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import db_manager
+from app.migrations import discover_migrations
+
+SCHEMA = 'bench_indexes'
+
+SEED_SQL = """
+    INSERT INTO jobs (title, description, company_name, contact_email, industry, location,
+                      is_active, featured, created_at)
+    SELECT 'Job ' || g, repeat('Описание вакансии ', 20), 'Company ' || (g % 500), 'hr@example.com',
+           (ARRAY['it', 'logistics', 'construction', 'retail', 'healthcare', 'finance'])[1 + g % 6],
+           (ARRAY['Tallinn', 'Tartu', 'Narva', 'Pärnu', 'Riga', 'Helsinki', 'Vilnius'])[1 + g % 7] || ' ' || (g % 50),
+           g % 10 <> 0, g % 50 = 0,
+           now() - (g || ' seconds')::interval
+    FROM generate_series(1, {rows}) AS g;
+
+    INSERT INTO candidates (full_name, email, skills, experience_years, location, desired_position,
+                            desired_salary, is_available, created_at)
+    SELECT 'Candidate ' || g, 'candidate' || g || '@example.com',
+           ARRAY[(ARRAY['python', 'sql', 'java', 'go', 'docker', 'excel', 'forklift', 'welding',
+                        'driving', 'sales', 'react', 'accounting'])[1 + g % 12],
+                 'skill' || (g % 400), 'skill' || (g % 977)],
+           g % 25,
+           (ARRAY['Tallinn', 'Tartu', 'Narva', 'Pärnu', 'Riga', 'Helsinki', 'Vilnius'])[1 + g % 7] || ' ' || (g % 50),
+           (ARRAY['Developer', 'Driver', 'Welder', 'Accountant', 'Sales manager', 'Warehouse worker'])[1 + g % 6]
+               || ' ' || (g % 100),
+           1000 + (g % 40) * 100,
+           g % 5 <> 0,
+           now() - (g || ' seconds')::interval
+    FROM generate_series(1, {rows}) AS g;
+
+    INSERT INTO job_applications (job_id, candidate_id)
+    SELECT 1 + (g * 7919) % {rows}, g
+    FROM generate_series(1, {rows}) AS g;
+"""
+
+# (название, запрос, параметры, миграция, которая должна его ускорить)
+CASES = [
+    ("Job.get_all активные, стр. 1",
+     "SELECT id FROM jobs WHERE is_active = TRUE ORDER BY featured DESC, created_at DESC, id DESC LIMIT 51",
+     (), 3),
+    ("Job.get_all featured_only",
+     "SELECT id FROM jobs WHERE is_active = TRUE AND featured = TRUE "
+     "ORDER BY featured DESC, created_at DESC, id DESC LIMIT 11",
+     (), 3),
+    ("Job.get_all по отрасли",
+     "SELECT id FROM jobs WHERE is_active = TRUE AND industry = %s "
+     "ORDER BY featured DESC, created_at DESC, id DESC LIMIT 51",
+     ('logistics',), 3),
+    ("Candidate.get_all доступные, стр. 1",
+     "SELECT id FROM candidates WHERE is_available = TRUE ORDER BY created_at DESC, id DESC LIMIT 51",
+     (), 3),
+    ("Candidate.get_all skills && (редкий навык)",
+     "SELECT id FROM candidates WHERE is_available = TRUE AND skills && %s "
+     "ORDER BY created_at DESC, id DESC LIMIT 51",
+     (['skill123'],), 3),
+    ("Candidate.get_by_email",
+     "SELECT id FROM candidates WHERE email = %s",
+     ('candidate4242@example.com',), 3),
+    ("Заявки кандидата",
+     "SELECT id FROM job_applications WHERE candidate_id = %s",
+     (4242,), 3),
+    ("Поиск по location ILIKE",
+     "SELECT id FROM candidates WHERE location ILIKE %s ORDER BY created_at DESC, id DESC LIMIT 51",
+     ('%tartu 17%',), 4),
+    ("Поиск по desired_position ILIKE",
+     "SELECT id FROM candidates WHERE desired_position ILIKE %s ORDER BY created_at DESC, id DESC LIMIT 51",
+     ('%welder 33%',), 4),
+    ("Candidate.get_all поиск по location (NULL проходит)",
+     "SELECT id FROM candidates WHERE is_available = TRUE "
+     "AND (location IS NULL OR location ILIKE %s) AND (desired_salary IS NULL OR desired_salary <= %s) "
+     "ORDER BY created_at DESC, id DESC LIMIT 51",
+     ('%tartu 17%', 3000), 5),
+]
+
+def explain(cursor, query, params, runs):
+    """Медианное время выполнения и использованные индексы"""
+    timings = []
+    plan = None
+    for _ in range(runs):
+        cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query, params)
+        result = cursor.fetchone()[0]
+        result = result if isinstance(result, list) else json.loads(result)
+        timings.append(result[0]['Execution Time'])
+        plan = result[0]['Plan']
+
+    indexes = set()
+    def walk(node):
+        if 'Index Name' in node:
+            indexes.add(node['Index Name'])
+        for child in node.get('Plans', []):
+            walk(child)
+    walk(plan)
+    return statistics.median(timings), ', '.join(sorted(indexes)) or plan['Node Type']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000, help='Строк в jobs и candidates')
+    parser.add_argument('--runs', type=int, default=5, help='Запусков каждого запроса')
+    parser.add_argument('--keep', action='store_true', help='Не удалять схему после замера')
+    args = parser.parse_args()
+
+    migrations = {migration.version: migration for migration in discover_migrations()}
+
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        cursor.execute(f"SET search_path TO {SCHEMA}, public")
+        try:
+            print(f"Заполнение {args.rows} строк...", file=sys.stderr)
+            cursor.execute(migrations[1].sql)
+            for statement in migrations[2].statements():
+                cursor.execute(statement)
+            cursor.execute(SEED_SQL.format(rows=int(args.rows)))
+            cursor.execute("ANALYZE")
+
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            has_trgm = cursor.fetchone() is not None
+
+            before = {}
+            for name, query, params, version in CASES:
+                if version >= 4 and not has_trgm:
+                    continue
+                before[name] = explain(cursor, query, params, args.runs)
+
+            for version in (3, 4, 5):
+                if version == 4 and not has_trgm:
+                    continue
+                for statement in migrations[version].statements():
+                    if not statement.upper().startswith('CREATE EXTENSION'):
+                        cursor.execute(statement)
+            cursor.execute("ANALYZE")
+
+            print(f"\n{'Запрос':<44} {'до, мс':>10} {'после, мс':>10} {'ускорение':>10}  план после")
+            for name, query, params, version in CASES:
+                if name not in before:
+                    print(f"{name:<44} {'—':>10} {'—':>10} {'—':>10}  пропущено: нет расширения pg_trgm")
+                    continue
+                before_ms, _ = before[name]
+                after_ms, plan = explain(cursor, query, params, args.runs)
+                speedup = before_ms / after_ms if after_ms else float('inf')
+                print(f"{name:<44} {before_ms:>10.3f} {after_ms:>10.3f} {speedup:>9.1f}x  {plan}")
+        finally:
+            cursor.execute("SET search_path TO DEFAULT")
+            if not args.keep:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            cursor.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сериализации страницы /api/candidates (без базы данных)
+
+Сравнивает прежний путь (to_dict с isoformat() и стандартный провайдер Flask)
+с FastJSONProvider, который сериализует даты сам. Замеряется сборка тела
+ответа jsonify для страницы из --rows кандидатов (медиана).
+
+    python benchmarks/bench_json.py --rows 500
+"""
+
+import sys
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import FastJSONProvider, orjson
+from app.models.candidate import Candidate
+
+SKILLS = ['python', 'sql', 'java', 'docker', 'excel', 'forklift', 'welding', 'sales', 'react', 'accounting']
+CITIES = ['Tallinn', 'Tartu', 'Narva', 'Pärnu', 'Riga', None]
+
+def make_candidates(count, rng):
+    started = datetime(2025, 1, 1)
+    return [
+        Candidate(
+            id=candidate_id,
+            full_name=f"Кандидат {candidate_id}",
+            email=f"candidate{candidate_id}@example.com",
+            phone=f"+372 5{candidate_id:07d}",
+            skills=rng.sample(SKILLS, rng.randint(0, 6)),
+            experience_years=rng.randint(0, 20),
+            current_position='Оператор',
+            desired_position=rng.choice(['Сварщик', 'Водитель', 'Разработчик', None]),
+            desired_salary=rng.choice([None, *range(800, 6000, 100)]),
+            location=rng.choice(CITIES),
+            created_at=started + timedelta(seconds=rng.randint(0, 10 ** 7), microseconds=rng.randint(0, 999999)),
+            updated_at=started + timedelta(seconds=rng.randint(0, 10 ** 7), microseconds=rng.randint(0, 999999))
+        )
+        for candidate_id in range(1, count + 1)
+    ]
+
+def legacy_to_dict(candidate):
+    """to_dict() до перехода на FastJSONProvider: даты форматируются заранее"""
+    data = candidate.to_dict()
+    data['created_at'] = candidate.created_at.isoformat() if candidate.created_at else None
+    data['updated_at'] = candidate.updated_at.isoformat() if candidate.updated_at else None
+    return data
+
+def measure(func, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500, help='Кандидатов на странице')
+    parser.add_argument('--runs', type=int, default=200, help='Запусков каждого замера')
+    args = parser.parse_args()
+
+    candidates = make_candidates(args.rows, random.Random(42))
+
+    legacy_app = Flask('legacy')
+    legacy_app.json = DefaultJSONProvider(legacy_app)
+    fast_app = Flask('fast')
+    fast_app.json = FastJSONProvider(fast_app)
+
+    def legacy():
+        with legacy_app.app_context():
+            return legacy_app.json.response({
+                'success': True,
+                'candidates': [legacy_to_dict(candidate) for candidate in candidates],
+                'count': len(candidates)
+            }).get_data()
+
+    def fast():
+        with fast_app.app_context():
+            return fast_app.json.response({
+                'success': True,
+                'candidates': [candidate.to_dict() for candidate in candidates],
+                'count': len(candidates)
+            }).get_data()
+
+    assert legacy_app.json.loads(legacy()) == fast_app.json.loads(fast()), 'Представления различаются'
+
+    print(f"Страница из {args.rows} кандидатов, orjson: {'да' if orjson else 'нет'}")
+    for name, func in (('прежний путь', legacy), ('FastJSONProvider', fast)):
+        median, worst = measure(func, args.runs)
+        print(f"  {name:<18} {median:8.3f} мс (макс {worst:.3f} мс), {len(func())} байт")
+
+if __name__ == '__main__':
+    main()
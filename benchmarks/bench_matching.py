@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк скоринга подбора на синтетическом пуле (без базы данных)
+
+Строит MatchingIndex из сгенерированных строк и замеряет оценку всего пула
+кандидатов для одной вакансии и всех вакансий для одного кандидата (медиана).
+
+    python benchmarks/bench_matching.py --candidates 100000 --jobs 20000
+"""
+
+import sys
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.matching import MatchingIndex
+from app.models.job import Job
+from app.models.candidate import Candidate
+
+SKILLS = ['python', 'sql', 'java', 'go', 'docker', 'excel', 'forklift', 'welding', 'driving',
+          'sales', 'react', 'accounting', 'project management', 'customer service'] + \
+         [f'skill{i}' for i in range(2000)]
+CITIES = ['Tallinn', 'Tartu', 'Narva', 'Pärnu', 'Riga', 'Helsinki', 'Vilnius', None]
+LEVELS = ['junior', 'middle', 'senior', 'lead', None]
+
+def candidate_rows(count, rng):
+    for candidate_id in range(1, count + 1):
+        yield (candidate_id, rng.sample(SKILLS, rng.randint(0, 8)), rng.choice([None, *range(20)]),
+               rng.choice([None, *range(800, 6000, 100)]), rng.choice(CITIES))
+
+def job_rows(count, rng):
+    for job_id in range(1, count + 1):
+        skills = rng.sample(SKILLS, rng.randint(1, 6))
+        salary = rng.choice([None, *range(1000, 7000, 250)])
+        yield (job_id, f"{skills[0].title()} specialist", 'Требования: ' + ', '.join(skills),
+               None, salary, rng.choice(CITIES + ['Remote']), rng.choice(LEVELS))
+
+def measure(func, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=100000, help='Кандидатов в пуле')
+    parser.add_argument('--jobs', type=int, default=20000, help='Вакансий в пуле')
+    parser.add_argument('--runs', type=int, default=50, help='Запусков каждого замера')
+    parser.add_argument('--top', type=int, default=20, help='Размер выдачи')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    started = time.perf_counter()
+    index = MatchingIndex(candidate_rows(args.candidates, rng), job_rows(args.jobs, rng))
+    print(f"Построение индекса: {time.perf_counter() - started:.2f} с, "
+          f"{len(index.candidates)} кандидатов, {len(index.jobs)} вакансий, {len(index.vocabulary)} навыков")
+
+    job = Job(title='Python developer', requirements='Python, SQL, Docker, project management; опыт 3+ лет',
+              salary_max=4000, location='Tallinn, Harjumaa', experience_level='middle')
+    candidate = Candidate(skills=['python', 'sql', 'docker'], experience_years=4, desired_salary=3500,
+                          location='Tartu')
+
+    median, worst = measure(lambda: index.top_candidates(job, args.top), args.runs)
+    print(f"Кандидаты для вакансии ({len(index.candidates)}): медиана {median:.2f} мс, максимум {worst:.2f} мс")
+    median, worst = measure(lambda: index.top_jobs(candidate, args.top), args.runs)
+    print(f"Вакансии для кандидата ({len(index.jobs)}): медиана {median:.2f} мс, максимум {worst:.2f} мс")
+
+if __name__ == '__main__':
+    main()
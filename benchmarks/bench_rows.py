@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк чтения строк моделей из базы
+
+Сравнивает прежний путь (RealDictCursor -> from_dict -> to_dict) с
+кортежным курсором и сгенерированными сборщиками строк (Model.select ->
+to_dict) на первых --rows кандидатах и вакансиях. Время — медиана
+запусков (включая запрос к базе), память на строку (tracemalloc) — пик
+во время загрузки и удерживаемые экземпляры со значениями полей.
+
+    python benchmarks/bench_rows.py --rows 10000
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import db_manager
+from app.models.job import Job
+from app.models.candidate import Candidate
+
+QUERIES = {
+    Candidate: """
+        SELECT id, full_name, email, phone, resume_url, skills,
+               experience_years, current_position, desired_position,
+               desired_salary, location, language, is_available,
+               created_at, updated_at
+        FROM candidates
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """,
+    Job: """
+        SELECT id, title, description, requirements, salary_min, salary_max,
+               location, employment_type, experience_level, industry,
+               company_name, contact_email, contact_phone, is_active,
+               featured, language, created_at, updated_at
+        FROM jobs
+        ORDER BY featured DESC, created_at DESC, id DESC
+        LIMIT %s
+    """,
+}
+
+def legacy_load(model, rows):
+    """Прежний путь: словарь курсора и экземпляр через именованные аргументы"""
+    return [model.from_dict(row) for row in db_manager.execute_query(QUERIES[model], (rows,))]
+
+def compact_load(model, rows):
+    return model.select(QUERIES[model], (rows,))
+
+def measure(func, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def memory_per_row(load):
+    """(пик при загрузке, удерживаемая память) на строку и число строк"""
+    tracemalloc.start()
+    instances = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = max(len(instances), 1)
+    return peak / count, retained / count, len(instances)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='Строк в выборке')
+    parser.add_argument('--runs', type=int, default=20, help='Запусков каждого замера')
+    args = parser.parse_args()
+
+    for model in (Candidate, Job):
+        print(f"{model.__name__}:")
+        for name, load in (('RealDictCursor', legacy_load), ('кортежи + __slots__', compact_load)):
+            load(model, 1)
+            peak, retained, count = memory_per_row(lambda: load(model, args.rows))
+            load_ms = measure(lambda: load(model, args.rows), args.runs)
+            total_ms = measure(lambda: [item.to_dict() for item in load(model, args.rows)], args.runs)
+            print(f"  {name:<20} строк {count}: загрузка {load_ms:8.2f} мс, с to_dict {total_ms:8.2f} мс, "
+                  f"байт на строку: пик {peak:6.0f}, удерживается {retained:6.0f}")
+
+if __name__ == '__main__':
+    main()
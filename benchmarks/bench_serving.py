@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк пропускной способности: встроенный сервер Werkzeug против gunicorn
+
+Для каждого режима запускает main.py (SERVER_MODE=development и production)
+на отдельном порту, ждет /health/live и --duration секунд нагружает его из
+--clients процессов с keep-alive подключениями по кругу эндпоинтов. Печатает
+запросы в секунду, задержки p50/p99, ошибки (ответ не 200) и
+переподключения после закрытия keep-alive подключения сервером.
+
+    python benchmarks/bench_serving.py --clients 16 --duration 20
+"""
+
+import os
+import sys
+import time
+import signal
+import argparse
+import statistics
+import subprocess
+import http.client
+import multiprocessing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = (
+    '/health/live',
+    '/api/jobs?limit=20',
+    '/api/candidates?limit=20',
+    '/api/contact/messages?limit=20',
+)
+
+def client(port, duration, results):
+    """Один клиент: запросы по кругу до истечения времени"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies, errors, reconnects = [], 0, 0
+    deadline = time.perf_counter() + duration
+    index = 0
+    while time.perf_counter() < deadline:
+        path = ENDPOINTS[index % len(ENDPOINTS)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path, headers={'Accept-Encoding': 'identity'})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+            if response.getheader('Connection', '').lower() == 'close':
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            # Keep-alive подключение закрыл перезапускаемый воркер (max_requests)
+            reconnects += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    results.put((latencies, errors, reconnects))
+
+def wait_ready(port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/health/live')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Сервер на порту {port} не запустился")
+
+def run_mode(mode, port, args):
+    env = dict(os.environ, SERVER_MODE=mode, PORT=str(port), DEBUG='false')
+    if args.workers:
+        env['WEB_WORKERS'] = str(args.workers)
+    server = subprocess.Popen([sys.executable, 'main.py'], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port)
+        # Прогрев: индекс навыков, подключения пула, подготовленные запросы
+        time.sleep(args.warmup)
+        results = multiprocessing.Queue()
+        clients = [multiprocessing.Process(target=client, args=(port, args.duration, results))
+                   for _ in range(args.clients)]
+        for process in clients:
+            process.start()
+        collected = [results.get() for _ in clients]
+        for process in clients:
+            process.join()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    latencies = sorted(latency for chunk, _, _ in collected for latency in chunk)
+    errors = sum(count for _, count, _ in collected)
+    reconnects = sum(count for _, _, count in collected)
+    total = len(latencies)
+    p99 = latencies[min(total - 1, int(total * 0.99))] * 1000 if total else 0
+    p50 = statistics.median(latencies) * 1000 if total else 0
+    print(f"  {mode:<12} {total / args.duration:8.1f} запр/с, p50 {p50:7.2f} мс, p99 {p99:7.2f} мс, "
+          f"ошибок {errors}, переподключений {reconnects}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=16, help='Параллельных клиентов')
+    parser.add_argument('--duration', type=float, default=20, help='Секунд нагрузки на режим')
+    parser.add_argument('--warmup', type=float, default=5, help='Секунд ожидания после старта сервера')
+    parser.add_argument('--workers', type=int, default=0, help='WEB_WORKERS для production (0 — авто)')
+    parser.add_argument('--port', type=int, default=5100, help='Первый порт')
+    args = parser.parse_args()
+
+    print(f"Ядер: {len(os.sched_getaffinity(0))}, клиентов: {args.clients}, {args.duration:.0f} с на режим")
+    for offset, mode in enumerate(('development', 'production')):
+        run_mode(mode, args.port + offset, args)
+
+if __name__ == '__main__':
+    main()
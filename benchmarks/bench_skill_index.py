@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк индекса навыков на синтетическом пуле (без базы данных)
+
+Строит SkillIndex из сгенерированных кандидатов (навыки по закону Ципфа),
+выводит занимаемую память и медианное время запросов AND/OR/NOT
+с фильтром is_available: подсчет совпадений и первая страница выдачи.
+
+    python benchmarks/bench_skill_index.py --candidates 1000000
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.skill_index import SkillIndex
+
+def generate_rows(count, vocabulary, skills_per_candidate, seed):
+    rng = np.random.default_rng(seed)
+    ranks = np.arange(1, vocabulary + 1)
+    weights = 1.0 / ranks
+    weights /= weights.sum()
+    skill_names = [f'skill{rank}' for rank in ranks]
+    sizes = rng.integers(0, skills_per_candidate * 2 + 1, size=count)
+    draws = rng.choice(vocabulary, size=int(sizes.sum()), p=weights)
+    available = rng.random(count) > 0.2
+    base = datetime(2025, 1, 1)
+
+    position = 0
+    for candidate_id in range(1, count + 1):
+        size = sizes[candidate_id - 1]
+        skills = [skill_names[draw] for draw in draws[position:position + size]]
+        position += size
+        yield candidate_id, skills, bool(available[candidate_id - 1]), base + timedelta(seconds=candidate_id)
+
+def index_created(index, candidate_id):
+    return datetime(1970, 1, 1) + timedelta(microseconds=int(index.created[candidate_id]))
+
+def measure(func, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=1000000, help='Кандидатов в индексе')
+    parser.add_argument('--vocabulary', type=int, default=5000, help='Различных навыков')
+    parser.add_argument('--skills', type=int, default=6, help='Навыков у кандидата в среднем')
+    parser.add_argument('--runs', type=int, default=50, help='Запусков каждого запроса')
+    args = parser.parse_args()
+
+    rows = list(generate_rows(args.candidates, args.vocabulary, args.skills, seed=42))
+    started = time.perf_counter()
+    index = SkillIndex.build(rows)
+    build_seconds = time.perf_counter() - started
+
+    usage = index.memory_usage()
+    print(f"Построение: {build_seconds:.2f} с; кандидатов {usage['candidates']}, навыков {usage['skills']} "
+          f"(из них битовых карт {usage['bitmap_skills']})")
+    print(f"Память: навыки {usage['postings_bytes'] / 2**20:.1f} МБ, фильтры {usage['filters_bytes'] / 2**20:.1f} МБ, "
+          f"created_at {usage['created_at_bytes'] / 2**20:.1f} МБ, порядок выдачи {usage['order_bytes'] / 2**20:.1f} МБ, "
+          f"всего {usage['total_bytes'] / 2**20:.1f} МБ")
+
+    queries = [
+        ("AND редких (skill800 & skill1200)", dict(all_of=['skill800', 'skill1200'])),
+        ("AND частый + редкий (skill1 & skill900)", dict(all_of=['skill1', 'skill900'])),
+        ("AND частых (skill1 & skill2)", dict(all_of=['skill1', 'skill2'])),
+        ("OR редких (skill700 | skill701 | skill702)", dict(any_of=['skill700', 'skill701', 'skill702'])),
+        ("OR частых (skill1 | skill2)", dict(any_of=['skill1', 'skill2'])),
+        ("AND + NOT (skill3 & skill500 & !skill1)", dict(all_of=['skill3', 'skill500'], none_of=['skill1'])),
+        ("OR + NOT (skill1 | skill2) & !skill3", dict(any_of=['skill1', 'skill2'], none_of=['skill3'])),
+    ]
+
+    print(f"\n{'Запрос':<46} {'найдено':>9} {'подсчет, мкс':>13} {'страница 50, мкс':>17} {'след. стр., мкс':>16}")
+    for name, query in queries:
+        found = index.count_matches(**query)
+        count_us = measure(lambda: index.count_matches(**query), args.runs)
+        first = index.query(**query, limit=51)
+        page_us = measure(lambda: index.query(**query, limit=51), args.runs)
+        cursor = (index_created(index, first[-1]), first[-1]) if first else None
+        next_us = measure(lambda: index.query(**query, limit=51, cursor=cursor), args.runs)
+        print(f"{name:<46} {found:>9} {count_us:>13.0f} {page_us:>17.0f} {next_us:>16.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк JSON, собранного Postgres, против объектов моделей
+
+Для страниц разного размера замеряет процессорное время Python (process_time,
+без времени сервера базы) и общее время сборки тела ответа /api/candidates
+и /api/jobs: через объекты и to_dict() и через render_page() (SQL_JSON_ENDPOINTS).
+
+    python benchmarks/bench_sql_json.py --sizes 10,100,1000
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask import Flask, jsonify
+
+from app.json_provider import FastJSONProvider, raw_json_response
+from app.models.job import Job
+from app.models.candidate import Candidate
+
+def objects_body(model, key, limit):
+    rows = model.get_all(limit=limit)
+    return jsonify({'success': True, key: [row.to_dict() for row in rows], 'count': len(rows)}).get_data()
+
+def rendered_body(model, key, limit):
+    page = model.render_page(limit=limit)
+    return raw_json_response({'success': True, 'count': page.count}, {key: page.items}).get_data()
+
+def measure(func, runs):
+    cpu, wall = [], []
+    for _ in range(runs):
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        func()
+        cpu.append((time.process_time() - cpu_started) * 1000)
+        wall.append((time.perf_counter() - wall_started) * 1000)
+    return statistics.median(cpu), statistics.median(wall)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10,100,1000', help='Размеры страниц через запятую')
+    parser.add_argument('--runs', type=int, default=30, help='Запусков каждого замера')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    with app.app_context():
+        for model, key in ((Candidate, 'candidates'), (Job, 'jobs')):
+            print(f"{model.__name__}:")
+            for limit in (int(size) for size in args.sizes.split(',')):
+                assert app.json.loads(objects_body(model, key, limit)) == app.json.loads(rendered_body(model, key, limit))
+                for name, build in (('объекты', objects_body), ('Postgres JSON', rendered_body)):
+                    cpu, wall = measure(lambda: build(model, key, limit), args.runs)
+                    print(f"  {limit:>5} строк, {name:<14} CPU Python {cpu:7.2f} мс, всего {wall:7.2f} мс")
+
+if __name__ == '__main__':
+    main()
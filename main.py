@@ -13,9 +13,8 @@ from pathlib import Path
 current_dir = Path(__file__).parent.absolute()
 sys.path.insert(0, str(current_dir))
 
-from app.server import create_app
-from app.database import init_database
-from app.config import Config
+# Замер старта: этапы ниже считаются от запуска процесса
+from app.boot import boot_timer, warm_up
 
 # Настройка логирования
 logging.basicConfig(
@@ -24,31 +23,77 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def log_banner(config):
+    """Адреса платформы в лог"""
+    logger.info("=" * 60)
+    logger.info("🎉 HIREHAND PLATFORM ЗАПУЩЕНА!")
+    logger.info(f"🌐 Веб-интерфейс: http://localhost:{config.PORT}")
+    logger.info(f"🔗 API: http://localhost:{config.PORT}/api")
+    logger.info(f"❤️  Health Check: http://localhost:{config.PORT}/health")
+    logger.info("💼 Платформа рекрутинга готова к работе")
+    logger.info("=" * 60)
+
+def serve_fast(app, config):
+    """
+    Быстрый холодный старт (FAST_BOOT): порт открывается сразу после создания
+    приложения, схема проверяется и пул прогревается в фоне
+    """
+    from werkzeug.serving import make_server
+
+    if config.DEBUG:
+        logger.warning("⚠️ FAST_BOOT: отладчик и перезагрузчик Werkzeug не используются")
+    warm_up.init_app(app, config.FAST_BOOT_SCHEMA_WAIT)
+
+    with boot_timer.phase('listen'):
+        server = make_server('0.0.0.0', config.PORT, app, threaded=True)
+    boot_timer.listening()
+    log_banner(config)
+
+    # Если схема не готова, прогрев останавливает сервер и процесс завершается с ошибкой
+    warm_up.start(on_failure=server.shutdown)
+    server.serve_forever()
+    if warm_up.state == warm_up.FAILED:
+        sys.exit(1)
+
 def main():
     """Главная функция запуска приложения"""
     try:
         logger.info("🚀 Запуск HireHand Platform...")
         
-        # Проверка конфигурации
-        config = Config()
-        if not config.validate():
+        # Проверка конфигурации (экземпляр создается один раз при импорте app.config)
+        with boot_timer.phase('config'):
+            from app.config import config
+            valid = config.validate()
+        if not valid:
             logger.error("❌ Ошибка конфигурации")
             sys.exit(1)
         
-        # Инициализация базы данных
-        logger.info("📊 Инициализация базы данных...")
-        init_database()
+        with boot_timer.phase('imports'):
+            from app.server import create_app
+        
+        if config.FAST_BOOT and config.SERVER_MODE != 'production':
+            with boot_timer.phase('create_app'):
+                app = create_app(start_background=False)
+            serve_fast(app, config)
+            return
+        
+        # Проверка версии схемы (миграции применяются, только если схема отстает)
+        logger.info("📊 Проверка схемы базы данных...")
+        from app.migrations import ensure_schema
+        with boot_timer.phase('schema'):
+            ensure_schema()
+        
+        if config.SERVER_MODE == 'production':
+            # Приложение создает мастер gunicorn (preload) и передает воркерам
+            from app.production import run_production
+            run_production()
+            return
         
         # Создание и запуск приложения
-        app = create_app()
+        with boot_timer.phase('create_app'):
+            app = create_app()
         
-        logger.info("=" * 60)
-        logger.info("🎉 HIREHAND PLATFORM ЗАПУЩЕНА!")
-        logger.info(f"🌐 Веб-интерфейс: http://localhost:{config.PORT}")
-        logger.info(f"🔗 API: http://localhost:{config.PORT}/api")
-        logger.info(f"❤️  Health Check: http://localhost:{config.PORT}/health")
-        logger.info("💼 Платформа рекрутинга готова к работе")
-        logger.info("=" * 60)
+        log_banner(config)
         
         app.run(
             host='0.0.0.0',
@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
 """
 Wrapper для запуска main.py в production режиме
+
+main() вызывается в этом же процессе: второй интерпретатор не запускается,
+и его старт не добавляется ко времени холодного старта.
 """
-import subprocess
 import sys
 
 if __name__ == "__main__":
+    from main import main
+
     try:
-        subprocess.run([sys.executable, "main.py"], check=True)
+        main()
     except KeyboardInterrupt:
         print("Завершение работы...")
         sys.exit(0)
-    except Exception as e:
-        print(f"Ошибка запуска: {e}")
-        sys.exit(1)
\ No newline at end of file
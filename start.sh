@@ -1,3 +1,4 @@
 #!/bin/bash
 echo "🚀 Запуск HireHand Platform через main.py..."
-python3 main.py
\ No newline at end of file
+python3 -m app.compression build
+python3 main.py
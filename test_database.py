@@ -0,0 +1,103 @@
+"""
+Тесты Statement (PREPARE/EXECUTE) и пула подключений без базы
+"""
+
+import pytest
+
+from app import database
+from app.database import Statement, ConnectionPool, PoolTimeout
+
+class FakeConnection:
+    """Подключение psycopg2 ровно настолько, насколько его использует пул"""
+
+    def __init__(self):
+        self.closed = False
+        self.autocommit = False
+
+    def get_transaction_status(self):
+        return database.extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(database.time, 'monotonic', clock)
+    return clock
+
+def make_pool(**options):
+    options.setdefault('pre_ping', False)
+    return ConnectionPool(FakeConnection, **options)
+
+def test_statement_numbers_placeholders():
+    statement = Statement("SELECT * FROM jobs WHERE id = %s AND title LIKE '10%%' AND salary > %s")
+    assert statement.prepare_sql.endswith("WHERE id = $1 AND title LIKE '10%%' AND salary > $2")
+    assert statement.prepare_sql.startswith(f"PREPARE {statement.name} AS ")
+    assert statement.execute_sql == f"EXECUTE {statement.name} (%s, %s)"
+
+def test_statement_without_parameters():
+    statement = Statement("SELECT 1")
+    assert statement.execute_sql == f"EXECUTE {statement.name}"
+
+def test_statement_names_are_unique():
+    assert Statement("SELECT 1").name != Statement("SELECT 1").name
+
+def test_statement_rejects_named_parameters():
+    with pytest.raises(ValueError):
+        Statement("SELECT * FROM jobs WHERE id = %(id)s")
+
+def test_pool_reuses_released_connection(clock):
+    pool = make_pool(max_size=2)
+    entry = pool.acquire()
+    assert entry.conn.autocommit
+    pool.release(entry)
+    assert pool.acquire() is entry
+    assert pool.stats()['connections_created'] == 1
+
+def test_pool_times_out_when_exhausted(clock):
+    pool = make_pool(max_size=1, timeout=0.01)
+    pool.acquire()
+    clock.now += 1
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert pool.stats()['timeouts'] == 1
+
+def test_pool_recycles_old_connections(clock):
+    pool = make_pool(max_size=1, recycle=60)
+    entry = pool.acquire()
+    pool.release(entry)
+    clock.now += 61
+    fresh = pool.acquire()
+    assert fresh is not entry
+    assert entry.conn.closed
+    assert pool.stats()['size'] == 1
+
+def test_pool_discards_connection_closed_while_in_use(clock):
+    pool = make_pool(max_size=1)
+    entry = pool.acquire()
+    entry.conn.close()
+    pool.release(entry)
+    assert pool.stats()['size'] == 0
+    assert pool.acquire() is not entry
+
+def test_pool_closes_idle_connections_above_min_size(clock):
+    pool = make_pool(min_size=1, max_size=3, max_idle=30)
+    entries = [pool.acquire() for _ in range(3)]
+    for entry in entries:
+        pool.release(entry)
+    clock.now += 31
+    pool.release(pool.acquire())
+    stats = pool.stats()
+    assert stats['size'] == 1
+    assert stats['connections_discarded'] == 2
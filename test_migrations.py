@@ -0,0 +1,63 @@
+"""
+Тесты разбора файлов миграций (директивы и разбиение на запросы)
+"""
+
+from app.migrations import Migration, discover_migrations
+
+def write_migration(tmp_path, sql):
+    path = tmp_path / '0001_test.sql'
+    path.write_text(sql, encoding='utf-8')
+    return Migration(1, 'test', path)
+
+def test_directives(tmp_path):
+    migration = write_migration(tmp_path, (
+        "-- migrate: no-transaction\n"
+        "-- migrate: requires-extension pg_trgm btree_gin\n"
+        "-- migrate: requires-extension vector\n"
+        "CREATE INDEX CONCURRENTLY idx ON jobs (title);\n"
+    ))
+    assert not migration.transactional
+    assert migration.required_extensions == ['pg_trgm', 'btree_gin', 'vector']
+
+def test_directives_only_at_top(tmp_path):
+    migration = write_migration(tmp_path, (
+        "-- обычный комментарий\n"
+        "-- migrate: no-transaction\n"
+        "SELECT 1;\n"
+    ))
+    assert migration.transactional
+    assert migration.required_extensions == []
+
+def test_statements_split_on_semicolons(tmp_path):
+    migration = write_migration(tmp_path, (
+        "-- migrate: no-transaction\n"
+        "CREATE INDEX CONCURRENTLY a ON jobs (title);\n"
+        "\n"
+        "CREATE INDEX CONCURRENTLY b\n"
+        "    ON jobs (location);\n"
+        "-- комментарий между запросами\n"
+        "ANALYZE jobs\n"
+    ))
+    assert migration.statements() == [
+        "CREATE INDEX CONCURRENTLY a ON jobs (title)",
+        "CREATE INDEX CONCURRENTLY b\n    ON jobs (location)",
+        "ANALYZE jobs",
+    ]
+
+def test_statements_keep_dollar_quoted_bodies(tmp_path):
+    migration = write_migration(tmp_path, (
+        "DO $$\n"
+        "BEGIN\n"
+        "    PERFORM 1;\n"
+        "END\n"
+        "$$;\n"
+        "SELECT 2;\n"
+    ))
+    statements = migration.statements()
+    assert len(statements) == 2
+    assert statements[0].startswith("DO $$") and "PERFORM 1;" in statements[0]
+    assert statements[1] == "SELECT 2"
+
+def test_shipped_migrations_are_numbered_in_order():
+    versions = [migration.version for migration in discover_migrations()]
+    assert versions == list(range(1, len(versions) + 1))
@@ -0,0 +1,57 @@
+"""
+Тесты курсоров и параметров страниц (app/pagination.py)
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.pagination import (encode_cursor, decode_cursor, parse_limit, parse_offset, split_page,
+                            InvalidCursor, InvalidPageSize)
+from app.config import config
+
+def test_cursor_round_trip():
+    key = (True, datetime(2026, 1, 2, 3, 4, 5, 678901), 42)
+    token = encode_cursor('jobs', key)
+    assert '=' not in token
+    assert decode_cursor('jobs', token) == key
+
+def test_missing_cursor_is_none():
+    assert decode_cursor('candidates', None) is None
+    assert decode_cursor('candidates', '') is None
+
+def test_cursor_of_another_listing_is_rejected():
+    token = encode_cursor('candidates', (datetime(2026, 1, 1), 1))
+    with pytest.raises(InvalidCursor):
+        decode_cursor('jobs', token)
+
+@pytest.mark.parametrize('token', ['not base64!', 'e30', encode_cursor('candidates', ('yesterday', 1)),
+                                   encode_cursor('candidates', (datetime(2026, 1, 1), '1')),
+                                   encode_cursor('candidates', (datetime(2026, 1, 1), True))])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor('candidates', token)
+
+def test_parse_limit():
+    assert parse_limit(None) == min(config.DEFAULT_PAGE_SIZE, config.MAX_PAGE_SIZE)
+    assert parse_limit('10') == 10
+    assert parse_limit(10 ** 9) == config.MAX_PAGE_SIZE
+    for value in ('abc', '0', -1, [1]):
+        with pytest.raises(InvalidPageSize):
+            parse_limit(value)
+
+def test_parse_offset():
+    assert parse_offset(None) == 0
+    assert parse_offset('5') == 5
+    for value in ('abc', '-1'):
+        with pytest.raises(InvalidPageSize):
+            parse_offset(value)
+
+def test_split_page_uses_extra_row():
+    rows = [(datetime(2026, 1, 1, hour), hour) for hour in (5, 4, 3)]
+    page, cursor = split_page('candidates', rows, 2, lambda row: row)
+    assert page == rows[:2]
+    assert decode_cursor('candidates', cursor) == rows[1]
+
+    page, cursor = split_page('candidates', rows, 3, lambda row: row)
+    assert page == rows and cursor is None